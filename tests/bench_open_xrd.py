@@ -0,0 +1,48 @@
+"""Compare bulk and line by line parsing of xrd files.
+
+Usage: python bench_open_xrd.py [max_power]
+"""
+import builtins
+from os.path import join
+from sys import argv, path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+path.insert(0, "..")
+builtins.__dict__.setdefault("_", str)
+import numpy as np
+from xrcea.core.idata import XrayData, _xrd_header, _xrd_points_tolerant
+
+HEADER = "#sample: powder\n#x_units: 2theta\n#lambda1: 1.540598\n"
+
+
+def old_open_xrd(fname):
+    with open(fname, encoding="utf8") as fobj:
+        text = fobj.read()
+    _xrd_header(text)
+    arr = [tuple(i) for i in _xrd_points_tolerant(text)]
+    arr.sort()
+    return np.array(arr)
+
+
+def bench(npoints, tmp):
+    fname = join(tmp, f"bench{npoints}.xrd")
+    x = np.linspace(5.0, 120.0, npoints)
+    y = np.random.randint(0, 100000, npoints)
+    with open(fname, "w", encoding="utf8") as fobj:
+        fobj.write(HEADER)
+        np.savetxt(fobj, np.transpose((x, y)), fmt=("%.5f", "%d"))
+    start = perf_counter()
+    old_open_xrd(fname)
+    old = perf_counter() - start
+    start = perf_counter()
+    XrayData.open_xrd(fname)
+    new = perf_counter() - start
+    print(npoints, f"{old:.3f}", f"{new:.3f}", f"{old / new:.1f}", sep="\t")
+
+
+if __name__ == "__main__":
+    max_power = int(argv[1]) if len(argv) > 1 else 7
+    print("points", "lines, s", "bulk, s", "speedup", sep="\t")
+    with TemporaryDirectory() as tmp:
+        for power in range(4, max_power + 1):
+            bench(10**power, tmp)
@@ -0,0 +1,57 @@
+"""Measure cold start of console XRCEA and check it against a budget.
+
+Usage: python bench_startup.py [budget_seconds [runs]]
+
+The budget may also be set by XRCEA_STARTUP_BUDGET environment variable,
+the default target for console start is 0.5 s.
+Exit status is 1 if the median startup time exceeds the budget.
+"""
+import json
+import os
+import subprocess
+import sys
+from os.path import abspath, join
+from statistics import median
+from tempfile import TemporaryDirectory
+
+ROOT = abspath("..")
+
+
+def cold_start(tmp, run):
+    report = join(tmp, f"startup{run}.json")
+    env = dict(os.environ, HOME=tmp, PYTHONPATH=ROOT)
+    os.makedirs(join(tmp, ".XRCEA"), exist_ok=True)
+    subprocess.run(
+        [sys.executable, "-m", "xrcea", "-c", "--profile-startup", report],
+        cwd=ROOT,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+    with open(report, encoding="utf-8") as fobj:
+        return json.load(fobj)
+
+
+if __name__ == "__main__":
+    budget = float(
+        sys.argv[1]
+        if len(sys.argv) > 1
+        else os.environ.get("XRCEA_STARTUP_BUDGET", "0.5")
+    )
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with TemporaryDirectory() as tmp:
+        reports = [cold_start(tmp, i) for i in range(runs)]
+    totals = [r["total"] for r in reports]
+    print("phase", "median wall, s", "median import, s", sep="\t")
+    for i, rec in enumerate(reports[0]["phases"]):
+        print(
+            "  " * rec["level"] + rec["phase"],
+            f"{median(r['phases'][i]['wall'] for r in reports):.3f}",
+            f"{median(r['phases'][i]['import'] for r in reports):.3f}",
+            sep="\t",
+        )
+    print("total", f"{median(totals):.3f}", sep="\t")
+    if median(totals) > budget:
+        print(f"startup exceeds budget of {budget:.3f} s", file=sys.stderr)
+        sys.exit(1)
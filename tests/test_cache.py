@@ -0,0 +1,54 @@
+import os
+import unittest
+from os.path import join
+from sys import path
+from tempfile import TemporaryDirectory
+path.insert(0, "..")
+import numpy as np
+from xrcea.core.cache import ParsedCache
+
+
+class TestParsedCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.src = join(self.tmp.name, "src.dat")
+        with open(self.src, "w") as fobj:
+            fobj.write("data")
+        self.cache = ParsedCache(join(self.tmp.name, "cache"), 2**20)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        self.assertIsNone(self.cache.get(self.src))
+        x = np.linspace(0.0, 1.0, 100)
+        self.cache.put(self.src, (x, x * 2, {"name": "n", "psi": 1.0}))
+        rx, ry, dct = self.cache.get(self.src)
+        self.assertIsInstance(rx, np.memmap)
+        self.assertTrue((rx == x).all() and (ry == x * 2).all())
+        self.assertEqual(dct, {"name": "n", "psi": 1.0})
+        self.assertIsNone(self.cache.get(self.src, "other reader"))
+
+    def test_invalidation(self):
+        self.cache.put(self.src, [np.zeros(3)])
+        stat = os.stat(self.src)
+        os.utime(self.src, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertIsNone(self.cache.get(self.src))
+
+    def test_lru_eviction(self):
+        self.cache.limit = 3 * 8000 + 2000
+        srcs = []
+        for i in range(4):
+            src = join(self.tmp.name, f"{i}.dat")
+            with open(src, "w") as fobj:
+                fobj.write(str(i))
+            srcs.append(src)
+        for i, src in enumerate(srcs[:3]):
+            self.cache.put(src, [np.zeros(1000)])
+            os.utime(join(self.cache.directory, self.cache.key(src),
+                          "obj.json"), (i, i))
+        self.cache.get(srcs[0])
+        self.cache.put(srcs[3], [np.zeros(1000)])
+        self.assertIsNotNone(self.cache.get(srcs[0]))
+        self.assertIsNone(self.cache.get(srcs[1]))
+        self.assertIsNotNone(self.cache.get(srcs[3]))
@@ -0,0 +1,42 @@
+import builtins
+import sys
+import unittest
+from sys import path
+path.insert(0, "..")
+builtins.__dict__.setdefault("_", str)
+from xrcea.core.application import APPLICATION as APP
+from xrcea.core.project import Project
+
+
+class TestLazyComponents(unittest.TestCase):
+    def setUp(self):
+        self.compman = APP.compman
+        self.desc = {d["path"]: d for d in self.compman.descriptions}
+        self.compman.set_active({6, 9})
+
+    def tearDown(self):
+        self.compman.set_active(set())
+        self.compman.terminate(True)
+
+    def test_deferred_opener(self):
+        sys.modules.pop("xrcea.components.iextra", None)
+        self.assertFalse(self.compman.introduce(lazy=True))
+        iextra = self.desc["iextra"]
+        self.assertNotIn("module", iextra)
+        self.assertNotIn("xrcea.components.iextra", sys.modules)
+        stub = APP.get_opener(".xrdml")
+        self.assertIsNotNone(stub)
+        module = self.compman.load(iextra)
+        self.assertIs(iextra["module"], module)
+        self.assertIs(APP.get_opener(".xrdml"), module.open_xrdml)
+
+    def test_deferred_treater(self):
+        sys.modules.pop("xrcea.components.iextra", None)
+        self.compman.introduce(lazy=True)
+        treater = Project.treater("opddb")
+        self.assertEqual(treater.type, "XRD cards")
+        self.assertNotIn("module", self.desc["pddb"])
+        self.assertIsNotNone(APP.get_opener(".rasx"))
+        self.compman.terminate(True)
+        self.assertIsNone(APP.get_opener(".rasx"))
+        self.assertRaises(KeyError, Project.treater, "opddb")
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import unittest
+from os.path import abspath, join
+from sys import path
+from tempfile import TemporaryDirectory
+path.insert(0, "..")
+from xrcea.core.lazyimport import HEAVY_MODULES, lazy_callable
+
+ROOT = abspath("..")
+SCRIPT = """
+import builtins, sys
+builtins._ = str
+sys.argv = ["xrcea", "-c"]
+import xrcea.core.stdio
+import xrcea.core.idata, xrcea.core.multicurve, xrcea.core.project
+import xrcea.components.bbg, xrcea.components.cryp
+import xrcea.components.describer, xrcea.components.iextra
+import xrcea.components.pddb
+"""
+
+
+def imported_modules(script):
+    with TemporaryDirectory() as tmp:
+        os.makedirs(join(tmp, ".XRCEA"))
+        res = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script],
+            cwd=ROOT,
+            env=dict(os.environ, HOME=tmp, PYTHONPATH=ROOT),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    return {
+        line.rsplit("|", 1)[-1].strip()
+        for line in res.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+class TestConsoleImports(unittest.TestCase):
+    def test_no_heavy_imports(self):
+        imported = imported_modules(SCRIPT)
+        self.assertIn("xrcea.components.cryp.reflex", imported)
+        heavy = {i for i in imported if i.split(".")[0] in HEAVY_MODULES}
+        self.assertEqual(heavy, set())
+
+    def test_lazy_callable(self):
+        hypot = lazy_callable("math", "hypot")
+        self.assertEqual(hypot.__name__, "hypot")
+        self.assertEqual(hypot(3.0, 4.0), 5.0)
@@ -0,0 +1,85 @@
+import unittest
+from sys import path
+path.insert(0, "..")
+import numpy as np
+from xrcea.core.vi.decimation import (
+    is_increasing,
+    minmax_decimate,
+    select_labels,
+)
+
+
+def pixel_extrema(x, y, xlim, width):
+    bins = ((x - xlim[0]) * (width / (xlim[1] - xlim[0]))).astype(int)
+    inside = (bins >= 0) & (bins < width)
+    return {
+        b: (y[bins == b].min(), y[bins == b].max())
+        for b in np.unique(bins[inside])
+    }
+
+
+class TestDecimation(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.x = np.linspace(5.0, 120.0, 10**6)
+        self.y = rng.random(10**6)
+        self.y[123457] = 50.0  # narrow peak
+
+    def test_full_view(self):
+        xlim = (5.0, 120.0)
+        x, y = minmax_decimate(self.x, self.y, xlim, 800)
+        self.assertLessEqual(len(x), 4 * 800 + 8)
+        self.assertTrue(is_increasing(x))
+        self.assertEqual(y.max(), 50.0)
+        self.assertEqual(x[0], self.x[0])
+        self.assertEqual(x[-1], self.x[-1])
+        self.assertEqual(
+            pixel_extrema(x, y, xlim, 800),
+            pixel_extrema(self.x, self.y, xlim, 800),
+        )
+
+    def test_zoom(self):
+        xlim = (20.0, 20.5)
+        x, y = minmax_decimate(self.x, self.y, xlim, 500)
+        self.assertLessEqual(x[0], 20.0)
+        self.assertGreaterEqual(x[-1], 20.5)
+        self.assertLess(len(x), 4 * 500 + 8)
+        xlim = (20.0, 20.01)
+        x, y = minmax_decimate(self.x, self.y, xlim, 500)
+        inside = (self.x >= 20.0) & (self.x <= 20.01)
+        self.assertEqual(len(x), inside.sum() + 2)
+
+    def test_short(self):
+        x, y = minmax_decimate([1.0, 2.0, 3.0], [3, 1, 2], (0.0, 4.0), 100)
+        self.assertEqual(list(y), [3, 1, 2])
+        self.assertFalse(is_increasing([1.0, 3.0, 2.0]))
+
+
+class TestLabels(unittest.TestCase):
+    def test_culling(self):
+        px = np.array([-10.0, 50.0, 150.0, 250.0])
+        py = np.array([10.0, 10.0, 120.0, 10.0])
+        sel = select_labels(px, py, 20.0, (0.0, 0.0, 200.0, 100.0))
+        self.assertEqual(list(sel), [1])
+
+    def test_overlap(self):
+        rng = np.random.default_rng(2)
+        px = rng.random(5000) * 800.0
+        py = rng.random(5000) * 600.0
+        sizes = rng.random(5000) * 30.0 + 10.0
+        sel = select_labels(px, py, sizes, (0.0, 0.0, 800.0, 600.0))
+        self.assertGreater(len(sel), 100)
+        self.assertLess(len(sel), 5000)
+        self.assertIn(np.argmax(py), sel)
+        for n, i in enumerate(sel):
+            for j in sel[n + 1:]:
+                size = max(sizes[i], sizes[j])
+                self.assertFalse(
+                    abs(px[i] - px[j]) < size and abs(py[i] - py[j]) < size
+                )
+
+    def test_sparse(self):
+        px = np.arange(10) * 100.0
+        sel = select_labels(px, np.ones(10), 50.0, (0, 0, 1000, 10))
+        self.assertEqual(list(sel), list(range(10)))
+        self.assertEqual(len(select_labels([], [], 1.0, (0, 0, 1, 1))), 0)
@@ -0,0 +1,138 @@
+import builtins
+import unittest
+from os.path import join
+from sys import path
+from tempfile import TemporaryDirectory
+path.insert(0, "..")
+builtins.__dict__.setdefault("_", str)
+import numpy as np
+from xrcea.core.grid import UniformGrid
+from xrcea.core.idata import XrayData, _xrd_points, _xrd_points_tolerant
+
+HEADER = "#sample: powder\n#x_units: 2theta\n#lambda1: 1.54\n"
+
+
+class TestOpenXrd(unittest.TestCase):
+    def write(self, text):
+        fname = join(self.tmp.name, "test.xrd")
+        with open(fname, "w", encoding="utf8") as fobj:
+            fobj.write(text)
+        return fname
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fast_path(self):
+        x = np.linspace(10.0, 80.0, 1000)
+        y = np.random.random(1000)
+        order = np.random.permutation(1000)
+        body = "\n".join(
+            f"{a:.17g} {b:.17g} 0" for a, b in zip(x[order], y[order])
+        )
+        xrd = XrayData(self.write(HEADER + body))
+        self.assertTrue((xrd.x_data == x).all())
+        self.assertTrue((xrd.y_data == y).all())
+        self.assertEqual(xrd.lambda1, 1.54)
+        self.assertEqual(xrd.name, "test")
+
+    def test_malformed(self):
+        text = HEADER + "3 4\nbad line\n1 2\n5\n#comment: 1\n2 3 x\n"
+        xrd = XrayData(self.write(text))
+        self.assertEqual(xrd.x_data.tolist(), [1.0, 2.0, 3.0])
+        self.assertEqual(xrd.y_data.tolist(), [2.0, 3.0, 4.0])
+        self.assertEqual(
+            _xrd_points(text).tolist(),
+            sorted(_xrd_points_tolerant(text).tolist()),
+        )
+
+    def test_repeated_keys(self):
+        text = HEADER + "#comment: a\n#comment: b\n1 2\n"
+        xrd = XrayData(self.write(text))
+        self.assertEqual(xrd.comment, "a\nb")
+
+    def test_no_data(self):
+        self.assertFalse(XrayData(self.write(HEADER)))
+
+
+class TestDerived(unittest.TestCase):
+    def setUp(self):
+        self.xrd = XrayData(
+            {
+                "objtype": "xrd",
+                "x_data": [10.0, 20.0, 30.0],
+                "y_data": [1.0, 2.0, 3.0],
+                "x_units": "2theta",
+                "lambda1": 1.54,
+            }
+        )
+
+    def test_memoized(self):
+        xrd = self.xrd
+        theta = xrd.theta
+        self.assertIs(xrd.theta, theta)
+        self.assertFalse(theta.flags.writeable)
+        xrd.corr_intens
+        xrd.corr_intens
+        self.assertEqual(xrd.derived_stats, {"hits": 2, "misses": 3})
+
+    def test_invalidation(self):
+        xrd = self.xrd
+        q = xrd.qrange
+        xrd.lambda1 = 0.7
+        self.assertTrue(np.allclose(xrd.qrange, q * 1.54 / 0.7))
+        xrd.x_data = np.array([20.0, 40.0, 60.0])
+        self.assertTrue(np.allclose(xrd.theta, np.radians([10, 20, 30])))
+        xrd.set_description({"x_units": "q"})
+        self.assertIsNone(xrd.theta)
+        self.assertIs(xrd.qrange, xrd.x_data)
+        self.assertTrue(xrd.x_data.flags.writeable)
+
+
+class TestUniformGrid(unittest.TestCase):
+    def test_detect(self):
+        grid = UniformGrid.detect(np.linspace(10.0, 80.0, 3501))
+        self.assertEqual(grid, UniformGrid(10.0, 0.02, 3501))
+        self.assertIsNone(UniformGrid.detect(np.array([1.0, 2.0, 4.0])))
+        self.assertIsNone(UniformGrid.detect(np.array([3.0, 2.0, 1.0])))
+
+    def test_interp(self):
+        grid = UniformGrid(10.0, 0.5, 21)
+        fp = np.random.random(21)
+        x = np.linspace(9.0, 21.0, 97)
+        self.assertTrue(
+            np.allclose(
+                grid.interp(x, fp, 0.0, -1.0),
+                np.interp(x, grid.materialize(), fp, 0.0, -1.0),
+            )
+        )
+
+    def test_single_point(self):
+        grid = UniformGrid.from_range(20.0, 20.0, 1)
+        self.assertTrue(np.array_equal(grid, np.linspace(20.0, 20.0, 1)))
+        self.assertEqual(grid.max(), 20.0)
+        self.assertEqual(
+            grid.interp([19.0, 20.0, 21.0], [5.0], 0.0).tolist(),
+            [0.0, 5.0, 5.0],
+        )
+        self.assertEqual(len(UniformGrid.from_range(1.0, 2.0, 0)), 0)
+
+    def test_xrd(self):
+        xrd = XrayData()
+        x_data = np.linspace(10.0, 20.0, 11)
+        xrd.x_data = x_data
+        self.assertIs(xrd.x_data, x_data)
+        self.assertIsNone(xrd.x_grid)
+        xrd = XrayData({"objtype": "xrd", "x_data": x_data.tolist(),
+                        "y_data": np.arange(11.0)})
+        self.assertIsNotNone(xrd.x_grid)
+        obj = xrd.get_obj()
+        self.assertNotIn("x_data", obj)
+        copy = XrayData(obj)
+        self.assertEqual(copy.x_grid, xrd.x_grid)
+        self.assertEqual(copy.x_data.tolist(), xrd.x_data.tolist())
+        copy.x_data = np.array([1.0, 2.0, 4.0])
+        self.assertIsNone(copy.x_grid)
+        self.assertEqual(copy.get_obj()["x_data"].tolist(), [1.0, 2.0, 4.0])
@@ -0,0 +1,69 @@
+import builtins
+import unittest
+from sys import path
+path.insert(0, "..")
+builtins.__dict__.setdefault("_", str)
+import numpy as np
+from xrcea.core.multicurve import CurveMatrix, MultiXrCurve
+
+
+def make_obj(psis, npts=50, x_data=None):
+    if x_data is None:
+        x_data = np.linspace(10.0, 90.0, npts)
+    return {
+        "objtype": "multi_xrd",
+        "name": "series",
+        "xrds": [
+            {"objtype": "xrd", "name": str(psi), "psi": psi,
+             "x_units": "2theta", "lambda1": 1.54,
+             "x_data": x_data, "y_data": np.full(len(x_data), psi)}
+            for psi in psis
+        ],
+    }
+
+
+class TestMatrix(unittest.TestCase):
+    def test_views(self):
+        mcur = MultiXrCurve(make_obj([30.0, 10.0, 20.0]))
+        curves = mcur.get_curves()
+        self.assertEqual([c.psi for c in curves], [10.0, 20.0, 30.0])
+        mat = mcur.matrix()
+        self.assertIs(mcur.matrix(), mat)
+        self.assertEqual(mat.intensities.shape, (3, 50))
+        self.assertEqual(mat.psi.tolist(), [10.0, 20.0, 30.0])
+        self.assertTrue(np.array_equal(mat.x_data, curves[2].x_data))
+        self.assertIs(curves[0].x_grid, curves[1].x_grid)
+        mat.intensities *= 2
+        mat.changed()
+        self.assertEqual(curves[1].y_data[0], 40.0)
+        mat.set_rows("background", mat.intensities / 4)
+        self.assertEqual(curves[2].extra_data["background"][3], 15.0)
+        self.assertEqual(mat.stack("background").shape, (3, 50))
+        curves[0].y_data = np.zeros(50)
+        self.assertIsNot(mcur.matrix(), mat)
+        self.assertEqual(mcur.matrix().intensities[0, 0], 0.0)
+        curves[0].set_description({"psi": 25.0}, False)
+        self.assertEqual([c.psi for c in mcur.get_curves()],
+                         [20.0, 25.0, 30.0])
+
+    def test_add(self):
+        mcur = MultiXrCurve(make_obj([10.0]))
+        mat = mcur.matrix()
+        mcur.add(MultiXrCurve(make_obj([5.0])).get_curves()[0])
+        self.assertEqual(mcur.get_curves()[0].psi, 5.0)
+        self.assertEqual(len(mcur.matrix()), 2)
+        self.assertIsNot(mcur.matrix(), mat)
+
+    def test_incompatible(self):
+        mcur = MultiXrCurve(make_obj([1.0, 2.0]))
+        other = MultiXrCurve(make_obj([3.0], x_data=np.random.random(50)))
+        mcur.add(other.get_curves()[0])
+        self.assertIsNone(mcur.matrix())
+        self.assertIsNone(CurveMatrix.build([]))
+        mcur = MultiXrCurve(make_obj([1.0, 2.0]))
+        mcur.add(MultiXrCurve(make_obj([3.0], 40)).get_curves()[0])
+        self.assertIsNone(mcur.matrix())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import builtins
+import unittest
+from io import StringIO
+from os.path import join
+from sys import path
+from tempfile import TemporaryDirectory
+path.insert(0, "..")
+builtins.__dict__.setdefault("_", str)
+import numpy as np
+from xrcea.core.vi import plot as vi_plot
+from xrcea.core.vi.plot import Plot, plot_series, shared_grid
+
+
+class TestPlot(unittest.TestCase):
+    def setUp(self):
+        self.plot = Plot("test")
+        self.x = np.linspace(10.0, 90.0, 1000)
+        self.plot.add_plot("exp", {
+            "plots": [{"x1": self.x, "y1": np.sin(self.x), "color": "exp"}],
+            "x1label": "2theta",
+        })
+
+    def test_get_plot(self):
+        plt = self.plot.get_plot("exp")
+        self.assertIs(plt["plots"][0]["x1"], self.x)
+        plt["plots"].append({"x1": self.x, "y2": self.x, "type": "pulse"})
+        plt["plots"][0]["ylim"] = (0.0, 1.0)
+        orig = self.plot.plots["exp"]["plots"]
+        self.assertEqual(len(orig), 1)
+        self.assertNotIn("ylim", orig[0])
+        self.assertIsNone(self.plot.get_plot("none"))
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.plot = Plot("test")
+        self.x = np.linspace(10.0, 90.0, 1000)
+        self.px = np.array([20.0, 55.5])
+        self.plot.add_plot("exp", {
+            "plots": [
+                {"x1": self.x, "y1": np.sin(self.x), "color": "exp"},
+                {"x1": self.x, "y1": np.cos(self.x), "legend": "cos"},
+                {"x1": self.px, "y2": np.array([1.0, 2.0]),
+                 "type": "pulse"},
+            ],
+            "x1label": "2theta",
+        })
+
+    def test_ssv(self):
+        out = StringIO()
+        chunk = vi_plot.EXPORT_CHUNK
+        vi_plot.EXPORT_CHUNK = 300
+        try:
+            self.plot._export_as_ssv("exp", out)
+        finally:
+            vi_plot.EXPORT_CHUNK = chunk
+        lines = out.getvalue().split("\n")
+        self.assertEqual(lines[0], "#x1label\t2theta")
+        self.assertIn("#Second Y", lines)
+        rows = [i for i in lines if i and not i.startswith("#")]
+        self.assertEqual(len(rows), 2002)
+        data = np.array([[float(j) for j in i.split("\t")]
+                         for i in rows[:1000]])
+        np.testing.assert_array_equal(data[:, 0], self.x)
+        np.testing.assert_array_equal(data[:, 1], np.sin(self.x))
+        out = StringIO()
+        vi_plot._write_rows(out, (np.array([0.1, 1e-20]), np.array([2.5, 3])))
+        self.assertEqual(out.getvalue(), "0.1\t2.5\n1e-20\t3.0\n")
+
+    def test_shared_grid(self):
+        table = shared_grid(list(plot_series(self.plot.plots["exp"])))
+        self.assertEqual(table.shape, (1002, 4))
+        self.assertTrue(np.all(np.diff(table[:, 0]) > 0))
+        np.testing.assert_allclose(
+            table[:, 1], np.interp(table[:, 0], self.x, np.sin(self.x)))
+        pulses = table[:, 3]
+        self.assertEqual(np.count_nonzero(~np.isnan(pulses)), 2)
+        self.assertEqual(
+            list(table[~np.isnan(pulses), 0]), list(self.px))
+
+    def test_binary(self):
+        with TemporaryDirectory() as tmp:
+            for ext in (".csv", ".npy", ".npz"):
+                self.plot.export_data("exp", join(tmp, "exp" + ext))
+            arrays = np.load(join(tmp, "exp.npz"))
+            np.testing.assert_array_equal(arrays["y2_2"], [1.0, 2.0])
+            np.testing.assert_array_equal(arrays["x1_0"], self.x)
+            self.assertEqual(str(arrays["x1label"]), "2theta")
+            matrix = np.load(join(tmp, "exp.npy"))
+            with open(join(tmp, "exp.csv"), encoding="utf-8") as fobj:
+                self.assertEqual(
+                    fobj.readline().strip(), '"2theta","y0","cos","y2"')
+            csv = np.genfromtxt(join(tmp, "exp.csv"), delimiter=",",
+                                skip_header=1)
+            np.testing.assert_allclose(csv, matrix, equal_nan=True)
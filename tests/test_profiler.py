@@ -0,0 +1,54 @@
+import builtins
+import json
+import sys
+import unittest
+from os.path import join
+from sys import path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+path.insert(0, "..")
+builtins.__dict__.setdefault("_", str)
+from xrcea.core.profiler import StartupProfile
+
+
+class TestStartupProfile(unittest.TestCase):
+    def test_phases(self):
+        original = builtins.__import__
+        prof = StartupProfile(True)
+        with prof.phase("outer"):
+            with prof.phase("inner"):
+                import colorsys  # noqa: F401
+        with TemporaryDirectory() as tmp:
+            prof.output = join(tmp, "report.json")
+            prof.finish()
+            with open(prof.output) as fobj:
+                report = json.load(fobj)
+        self.assertIs(builtins.__import__, original)
+        self.assertEqual([p["phase"] for p in report["phases"]],
+                         ["outer", "inner"])
+        self.assertEqual([p["level"] for p in report["phases"]], [0, 1])
+        outer, inner = report["phases"]
+        self.assertGreaterEqual(outer["wall"], inner["wall"])
+        self.assertGreater(inner["import"], 0.0)
+        self.assertLessEqual(inner["import"], inner["wall"])
+        self.assertGreaterEqual(report["total"], outer["wall"])
+
+    def test_disabled(self):
+        prof = StartupProfile()
+        with prof.phase("nothing"):
+            pass
+        prof.finish()
+        self.assertEqual(prof.phases, [])
+        self.assertIsNone(prof.total)
+
+    def test_project_argument(self):
+        from xrcea import core
+
+        opened = []
+        argv = ["xrcea", "-c", "--profile-startup", "prj.xrp"]
+        with patch.object(sys, "argv", argv), \
+                patch.object(core, "open_later", opened.append), \
+                patch.object(core.PROFILE, "output", None):
+            core.parse_args()
+            self.assertEqual(core.PROFILE.output, "-")
+        self.assertEqual(opened, ["prj.xrp"])
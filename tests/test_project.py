@@ -0,0 +1,339 @@
+import builtins
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from os.path import isfile, join
+from sys import path
+from tempfile import TemporaryDirectory
+from json import dumps
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+path.insert(0, "..")
+builtins.__dict__.setdefault("_", str)
+import numpy as np
+from xrcea.core.idata import XrayData
+from xrcea.core.journal import Journal
+from xrcea.core.multicurve import MultiXrCurve
+from xrcea.core.project import (
+    LazyComponent,
+    LoadCancelled,
+    NumpyEncoder,
+    Project,
+    UnsupportedFormat,
+)
+
+for treater in (XrayData, MultiXrCurve):
+    try:
+        Project.add_treater(treater)
+    except AssertionError:
+        pass
+
+
+def make_xrd(name, npts=500):
+    xrd = XrayData()
+    xrd.set_description({"name": name, "x_units": "2theta", "lambda1": 1.5})
+    xrd.x_data = np.sort(np.random.random(npts)) * 100.0
+    xrd.y_data = np.random.random(npts)
+    xrd.extra_data["background"] = np.random.random(npts)
+    return xrd
+
+
+class Counter:
+    def __init__(self):
+        self.updates = 0
+
+    def update_components(self):
+        self.updates += 1
+
+    def modified(self):
+        pass
+
+
+class TestProject(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.fname = join(self.tmp.name, "test.xrp")
+        prj = Project()
+        self.xrds = [make_xrd(f"xrd{i}") for i in range(5)]
+        for xrd in self.xrds:
+            prj.add_component(xrd)
+        prj.save(self.fname)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def members(self, fname):
+        with ZipFile(fname) as zipf:
+            return {
+                i: zipf.read(i) for i in zipf.namelist()
+                if i.startswith("item")
+            }
+
+    def test_lazy_open(self):
+        prj = Project(self.fname)
+        entries = list(prj.entries())
+        self.assertTrue(all(isinstance(i, LazyComponent) for i in entries))
+        self.assertEqual([i.name for i in entries],
+                         [f"xrd{i}" for i in range(5)])
+        self.assertEqual(entries[0].type, XrayData.type)
+        self.assertFalse(prj.is_modified())
+        xrd = prj.materialize(entries[2])
+        self.assertTrue((xrd.y_data == self.xrds[2].y_data).all())
+        self.assertIs(xrd.get_container(), prj)
+        self.assertIsInstance(list(prj.entries())[0], LazyComponent)
+        self.assertFalse(prj.is_modified())
+        prj.UI = Counter()
+        comps = list(prj.components())
+        self.assertEqual(len(comps), 5)
+        self.assertTrue(all(isinstance(i, XrayData) for i in comps))
+        self.assertEqual(prj.UI.updates, 1)
+
+    def test_format(self):
+        newer = join(self.tmp.name, "newer.xrp")
+        with ZipFile(self.fname) as src, ZipFile(newer, "w") as dst:
+            for name in src.namelist():
+                data = b"3" if name == "format" else src.read(name)
+                dst.writestr(name, data)
+        with self.assertRaises(UnsupportedFormat):
+            Project(newer)
+
+    def test_resave(self):
+        prj = Project(self.fname)
+        prj.remove_component(list(prj.entries())[1])
+        saved = join(self.tmp.name, "saved.xrp")
+        prj.save(saved)
+        old = self.members(self.fname)
+        new = self.members(saved)
+        self.assertEqual(new["item1"], old["item2"])
+        self.assertEqual(list(prj.entries())[1].member, "item1")
+        self.assertEqual(prj.materialize(list(prj.entries())[1]).name, "xrd2")
+        eager = Project(saved, lazy=False)
+        self.assertEqual([c.name for c in eager.entries()],
+                         ["xrd0", "xrd2", "xrd3", "xrd4"])
+
+    def test_binary_arrays(self):
+        with ZipFile(self.fname) as zipf:
+            infos = {i.filename: i for i in zipf.infolist()}
+            item = zipf.read("item0")
+        self.assertIn(b'"__npy__"', item)
+        self.assertNotIn(b"[", item)
+        arrays = [i for i in infos if i.startswith("arrays/")]
+        self.assertEqual(len(arrays), 15)
+        self.assertTrue(
+            all(infos[i].compress_type == ZIP_STORED for i in arrays)
+        )
+        prj = Project(self.fname, lazy=False)
+        for xrd, orig in zip(prj.components(), self.xrds):
+            self.assertTrue((xrd.x_data == orig.x_data).all())
+            self.assertTrue(
+                (
+                    xrd.extra_data["background"]
+                    == orig.extra_data["background"]
+                ).all()
+            )
+        prj = Project(self.fname)
+        saved = join(self.tmp.name, "saved.xrp")
+        prj.save(saved, ZIP_DEFLATED)
+        self.assertEqual(
+            set(self.members(saved)), set(self.members(self.fname))
+        )
+        with ZipFile(saved) as zipf:
+            self.assertEqual(set(arrays), set(zipf.namelist()) & set(arrays))
+        self.assertEqual(
+            list(Project(saved).components())[4].y_data.tolist(),
+            self.xrds[4].y_data.tolist(),
+        )
+
+    def test_old_format(self):
+        old = join(self.tmp.name, "old.xrp")
+        with ZipFile(old, "w", compression=ZIP_DEFLATED) as zipf:
+            for i, xrd in enumerate(self.xrds):
+                zipf.writestr(
+                    "item%d" % i, dumps(xrd.get_obj(), cls=NumpyEncoder)
+                )
+            zipf.writestr("about", dumps({"name": "Old"}))
+        prj = Project(old)
+        self.assertEqual(prj.name(), "Old")
+        comps = list(prj.entries())
+        self.assertEqual(len(comps), 5)
+        self.assertTrue((comps[3].y_data == self.xrds[3].y_data).all())
+
+    def test_incremental_save(self):
+        prj = Project(self.fname)
+        xrd = prj.materialize(list(prj.entries())[2])
+        xrd.extra_data["stripped"] = np.random.random(500)
+        prj.element_changed(xrd)
+        self.assertTrue(prj.is_dirty(xrd))
+        prj.remove_component(list(prj.entries())[0])
+        with ZipFile(self.fname) as zipf:
+            old = {i.filename: i for i in zipf.infolist()}
+        prj.save(self.fname)
+        self.assertFalse(prj.is_dirty(xrd))
+        with ZipFile(self.fname) as zipf:
+            self.assertIsNone(zipf.testzip())
+            new = {i.filename: i for i in zipf.infolist()}
+        self.assertEqual(new["item0"].CRC, old["item1"].CRC)
+        added = [i for i in new if i not in old]
+        self.assertEqual(len(added), 1)
+        self.assertTrue(added[0].startswith("arrays/"))
+        names = [c.name for c in Project(self.fname).components()]
+        self.assertEqual(names, ["xrd1", "xrd2", "xrd3", "xrd4"])
+        loaded = list(Project(self.fname).components())[1]
+        self.assertTrue(
+            (
+                loaded.extra_data["stripped"] == xrd.extra_data["stripped"]
+            ).all()
+        )
+        self.assertFalse(isfile(self.fname + ".part"))
+
+    def test_silent_changes(self):
+        prj = Project(self.fname)
+        entries = list(prj.entries())
+        xrd = prj.materialize(entries[1])
+        self.assertTrue(prj.is_dirty(xrd))
+        xrd.set_description({"name": "renamed", "lambda1": 1.2}, False)
+        xrd.extra_data["UserIndexes"] = {"1": [1, 1, 0]}
+        with ZipFile(self.fname) as zipf:
+            old = {i.filename: i.CRC for i in zipf.infolist()}
+        prj.save(self.fname)
+        with ZipFile(self.fname) as zipf:
+            new = {i.filename: i.CRC for i in zipf.infolist()}
+        self.assertEqual(new["item2"], old["item2"])
+        self.assertNotEqual(new["item1"], old["item1"])
+        xrd.extra_data["UserIndexes"]["2"] = [2, 0, 0]
+        prj.save(self.fname)
+        loaded = list(Project(self.fname).components())[1]
+        self.assertEqual(loaded.name, "renamed")
+        self.assertEqual(loaded.lambda1, 1.2)
+        self.assertEqual(loaded.extra_data["UserIndexes"],
+                         {"1": [1, 1, 0], "2": [2, 0, 0]})
+
+    def test_parallel_decode(self):
+        status = {}
+        prj = Project(self.fname, lazy=False, status=status)
+        self.assertEqual(
+            [c.name for c in prj.entries()], [f"xrd{i}" for i in range(5)]
+        )
+        self.assertEqual(status["part"], 0.8)
+        self.assertFalse(prj.is_modified())
+        with ProcessPoolExecutor(2) as executor:
+            prj = Project()
+            prj.read(self.fname, False, None, executor)
+        self.assertTrue(
+            all(
+                (c.y_data == o.y_data).all()
+                for c, o in zip(prj.entries(), self.xrds)
+            )
+        )
+        self.assertRaises(
+            LoadCancelled, Project, self.fname, False, {"stop": True}
+        )
+
+    def test_journal(self):
+        prj = Project(self.fname)
+        prj.start_journal(3600.0)
+        xrd = prj.materialize(list(prj.entries())[1])
+        xrd.y_data = xrd.y_data * 2.0
+        xrd._emit_changed()
+        prj.remove_component(list(prj.entries())[3])
+        prj.add_component(make_xrd("new"))
+        self.assertFalse(prj.recoverable())
+        prj.journal.flush()
+        self.assertTrue(prj.recoverable())
+        crashed = Project(self.fname)
+        self.assertFalse(crashed.is_modified())
+        crashed.recover()
+        self.assertTrue(crashed.is_modified())
+        self.assertEqual(
+            [c.name for c in crashed.entries()],
+            ["xrd0", "xrd1", "xrd2", "xrd4", "new"],
+        )
+        self.assertIsInstance(list(crashed.entries())[0], LazyComponent)
+        restored = list(crashed.components())[1]
+        self.assertTrue(
+            (restored.y_data == self.xrds[1].y_data * 2.0).all()
+        )
+        xrd.y_data = xrd.y_data * 2.0
+        xrd._emit_changed()
+        prj.journal.flush()
+        puts = [r["put"] for r in prj.journal.records() if "put" in r]
+        self.assertEqual(puts.count("item1"), 2)
+        prj.journal._compact()
+        puts = [r["put"] for r in prj.journal.records() if "put" in r]
+        self.assertEqual(sorted(puts), sorted(set(puts)))
+        crashed = Project(self.fname)
+        crashed.recover()
+        restored = list(crashed.components())[1]
+        self.assertTrue(
+            (restored.y_data == self.xrds[1].y_data * 4.0).all()
+        )
+        prj.save(self.fname)
+        self.assertFalse(prj.recoverable())
+        self.assertFalse(isfile(self.fname + ".journal"))
+
+    def test_journal_poll(self):
+        class Item:
+            fail = True
+
+            def get_obj(self):
+                if self.fail:
+                    raise RuntimeError("changed while encoding")
+                return {"objtype": "xrd"}
+
+        journal = Journal(self.fname + ".journal", "id", 0.0)
+        item = Item()
+        journal.put("a", item)
+        journal.set_order(["a"])
+        journal.flush()
+        self.assertEqual(journal.records(), [{"order": ["a"]}])
+        item.fail = False
+        journal.poll()
+        journal._writer.join(5)
+        self.assertEqual(journal.records()[-1]["put"], "a")
+        journal.put("a", item)
+        lines, generation = journal._snapshot()
+        journal.discard()
+        journal._write(lines, generation)
+        self.assertFalse(isfile(self.fname + ".journal"))
+
+    def test_index_meta(self):
+        prj = Project(self.fname)
+        xrd = prj.materialize(list(prj.entries())[2])
+        xrd.extra_data["pddb_colors"] = {"7": "red"}
+        xrd._emit_changed()
+        prj.save(self.fname)
+        prj = Project(self.fname)
+        entries = list(prj.entries())
+        self.assertEqual(entries[2].meta, {"pddb_colors": ["7"]})
+        self.assertEqual(entries[1].meta, {})
+
+    def test_shared_arrays(self):
+        mcurve = MultiXrCurve()
+        mcurve.name = "set"
+        x_data = self.xrds[0].x_data
+        for i in range(3):
+            xrd = make_xrd(f"curve{i}")
+            xrd.x_data = x_data.copy()
+            xrd.psi = float(i)
+            mcurve.add(xrd)
+        prj = Project(self.fname)
+        prj.add_component(mcurve)
+        prj.save(self.fname)
+        with ZipFile(self.fname) as zipf:
+            arrays = [i for i in zipf.namelist() if i.startswith("arrays/")]
+        # 8 distinct y_data, 8 backgrounds and 5 distinct x_data
+        self.assertEqual(len(arrays), 21)
+        for lazy, executor in ((True, None), (False, None),
+                               (False, ProcessPoolExecutor(2))):
+            prj = Project()
+            prj.read(self.fname, lazy, None, executor)
+            if executor is not None:
+                executor.shutdown()
+            comps = list(prj.components())
+            curves = comps[-1].get_curves()
+            self.assertIs(curves[0].x_data, curves[1].x_data)
+            self.assertIs(curves[0].x_data, comps[0].x_data)
+            self.assertFalse(curves[0].x_data.flags.writeable)
+            curves[0].y_data.fill(0.0)
+            self.assertTrue((curves[1].y_data != 0.0).all())
+            curves[0].x_data = curves[0].x_data * 2.0
+            self.assertIsNot(curves[0].x_data, curves[1].x_data)
+            self.assertTrue((curves[1].x_data == x_data).all())
@@ -0,0 +1,119 @@
+import builtins
+import unittest
+from importlib.util import find_spec
+from os.path import getsize, join
+from sys import path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+path.insert(0, "..")
+builtins.__dict__.setdefault("_", str)
+import numpy as np
+from xrcea.core import project
+from xrcea.core.idata import XrayData
+from xrcea.core.multicurve import MultiXrCurve
+from xrcea.core.render import (
+    export_figures,
+    project_plot_jobs,
+    resolve_colors,
+    xrd_plots,
+)
+
+
+def make_xrd(name, npts=300):
+    xrd = XrayData()
+    xrd.set_description({"name": name, "x_units": "2theta", "lambda1": 1.5})
+    xrd.x_data = np.linspace(10.0, 90.0, npts)
+    xrd.y_data = np.random.random(npts)
+    xrd.extra_data["background"] = np.random.random(npts)
+    xrd._saved_plots["bg/ref"] = {
+        "plots": [{"x1": "x_data", "y1": "background"}]}
+    return xrd
+
+
+class TestRender(unittest.TestCase):
+    def test_resolve_colors(self):
+        x = np.arange(3.0)
+        dset = {"plots": [{"x1": x, "y1": x, "color": "exp_dat"},
+                          {"x1": x, "y1": x, "color": "red"}]}
+        with patch("xrcea.core.render.APP.settings.get_color",
+                   lambda name: {"exp_dat": "black"}.get(name)):
+            res = resolve_colors(dset)
+        self.assertEqual(res["plots"][0]["color"], "black")
+        self.assertEqual(res["plots"][1]["color"], "red")
+        self.assertEqual(dset["plots"][0]["color"], "exp_dat")
+        self.assertIs(res["plots"][0]["x1"], x)
+
+    def test_xrd_plots(self):
+        xrd = make_xrd("sample")
+        names = [n for n, p in xrd_plots(xrd)]
+        self.assertEqual(names, ["main", "bg/ref"])
+        xrd._saved_plots["bad"] = {"plots": [{"x1": "nothing"}]}
+        self.assertEqual(len(list(xrd_plots(xrd))), 2)
+
+    def test_jobs(self):
+        prj = project.Project()
+        for name in ("a b", "a b"):
+            prj.add_component(make_xrd(name))
+        with patch.object(project, "_CURRENT_PROJECT", prj):
+            jobs = list(project_plot_jobs("out", "svg"))
+        self.assertEqual(
+            [j[1] for j in jobs],
+            [join("out", i) for i in (
+                "a_b.svg", "a_b-bg_ref.svg", "a_b-1.svg",
+                "a_b-bg_ref-1.svg")])
+        with self.assertRaises(ValueError):
+            list(project_plot_jobs("out", "bmp"))
+
+    def test_series_jobs(self):
+        mcurve = MultiXrCurve()
+        mcurve.name = "set"
+        for psi in (20.0, 10.0):
+            xrd = make_xrd(f"psi{psi:g}")
+            xrd.psi = psi
+            mcurve.add(xrd)
+        prj = project.Project()
+        prj.add_component(mcurve)
+        with patch.object(project, "_CURRENT_PROJECT", prj):
+            jobs = list(project_plot_jobs("out", "svg"))
+        self.assertEqual(
+            [j[1] for j in jobs],
+            [join("out", i) for i in (
+                "set-psi10.svg", "set-psi10-bg_ref.svg", "set-psi20.svg",
+                "set-psi20-bg_ref.svg")])
+
+    @unittest.skipIf(find_spec("matplotlib") is None, "no matplotlib")
+    def test_export(self):
+        xrd = make_xrd("sample")
+        with TemporaryDirectory() as tmp:
+            jobs = [(p, join(tmp, n.replace("/", "_") + "." + fmt))
+                    for n, p in xrd_plots(xrd) for fmt in ("png", "svg")]
+            jobs[0][0]["plots"][0]["color"] = "not_declared"
+            jobs.append(({"plots": [{"x1": "bad"}]}, join(tmp, "bad.png")))
+            errors = []
+            with patch("xrcea.core.vi.print_error",
+                       lambda title, info: errors.append(info)):
+                files = export_figures(jobs, 2)
+            self.assertEqual(len(files), 4)
+            self.assertTrue(all(getsize(f) > 0 for f in files))
+            self.assertEqual(len(errors), 1)
+            self.assertTrue(errors[0].startswith(join(tmp, "bad.png")))
+
+    @unittest.skipIf(find_spec("matplotlib") is None, "no matplotlib")
+    def test_decimated(self):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from xrcea.core.figure import PlotFigure
+
+        fig = Figure(figsize=(8.0, 6.0), dpi=100)
+        FigureCanvasAgg(fig)
+        pfig = PlotFigure(fig, animated=False)
+        x = np.linspace(10.0, 90.0, 20000)
+        pfig.update_plots({"plots": [{"x1": x, "y1": np.sin(x)}]})
+        line = pfig.axes1.get_lines()[0]
+        self.assertGreater(len(line.get_xdata()), 1)
+        self.assertLess(len(line.get_xdata()), 20000)
+        self.assertEqual(line.get_xdata()[0], 10.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
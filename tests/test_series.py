@@ -0,0 +1,114 @@
+import builtins
+import unittest
+from sys import path
+from unittest.mock import patch
+path.insert(0, "..")
+builtins.__dict__.setdefault("_", str)
+import numpy as np
+from xrcea.core import tasks
+from xrcea.core.multicurve import MultiXrCurve
+from xrcea.core.shared import owner_store
+from xrcea.core.vi.mixins import DialogsMixin
+from xrcea.components.cryp import Mcall, _data
+from xrcea.components.cryp import series
+from xrcea.components.cryp.reflex import background
+from xrcea.components.cryp.series import (
+    bg_xy,
+    curve_background,
+    curve_reflexes,
+    map_curves,
+)
+
+
+class Gui(DialogsMixin):
+    name = "series"
+
+    def __init__(self):
+        self.gui_functions = {}
+
+
+def make_series(psis, npts=1200):
+    x_data = np.linspace(20.0, 80.0, npts)
+    xrds = []
+    for psi in psis:
+        y_data = 50.0 + 0.1 * x_data + 1000.0 * np.exp(
+            -((x_data - 40.0 - psi / 10.0) ** 2) / 2.0)
+        xrds.append({"objtype": "xrd", "name": str(psi), "psi": psi,
+                     "x_units": "2theta", "lambda1": 1.54,
+                     "x_data": x_data, "y_data": y_data})
+    mxrd = MultiXrCurve(
+        {"objtype": "multi_xrd", "name": "series", "xrds": xrds})
+    mxrd._uis["main"] = Gui()
+    return mxrd
+
+
+def run(function, *args):
+    task = tasks.scheduler().submit(function, *args)
+    tasks.scheduler().wait([task])
+    return task.result()
+
+
+class TestSeries(unittest.TestCase):
+    def test_backgrounds(self):
+        mxrd = make_series([0.0, 5.0, 10.0])
+        curves = mxrd.get_curves()
+        xys = [bg_xy(xrd) for xrd in curves]
+        columns = [("x", [xy[0] for xy in xys]), ("y", [xy[1] for xy in xys])]
+        found = run(map_curves, mxrd, curve_background, columns, (2, 2.0, 1))
+        for (x, y), bgnd in zip(xys, found):
+            self.assertTrue(np.allclose(bgnd, background(x, y, 2, 2.0, 1)))
+        columns[0][1][0] = columns[0][1][0][1:]
+        columns[1][1][0] = columns[1][1][0][1:]
+        self.assertEqual(
+            len(run(map_curves, mxrd, curve_background, columns,
+                    (2, 2.0, 0))[0]), 1199)
+
+    def test_concurrent(self):
+        mxrd = make_series([0.0, 5.0, 10.0])
+        xys = [bg_xy(xrd) for xrd in mxrd.get_curves()]
+        columns = [("x", [xy[0] for xy in xys]), ("y", [xy[1] for xy in xys])]
+        nested = []
+
+        def parallel_map(status, function, args_list, part):
+            # other task maps the same series meanwhile
+            if not nested:
+                nested.append(None)
+                nested[0] = map_curves(
+                    status, mxrd, function, columns, (1, 2.0, 1))
+            return tasks.parallel_map(status, function, args_list, part)
+
+        with patch.object(series, "parallel_map", parallel_map):
+            found = run(map_curves, mxrd, curve_background, columns,
+                        (2, 2.0, 1))
+        for deg, res in ((2, found), (1, nested[0])):
+            for (x, y), bgnd in zip(xys, res):
+                self.assertTrue(
+                    np.allclose(bgnd, background(x, y, deg, 2.0, 1)))
+        self.assertEqual(len(owner_store(mxrd)), 0)
+
+    def test_batch(self):
+        mxrd = make_series([0.0, 5.0, 10.0])
+        mcall = Mcall(_data, "calc_bg")
+        mcall._calc_series_bg(mxrd._uis["main"], mxrd, 2.0, 2, 0)
+        tasks.scheduler().wait()
+        curves = mxrd.get_curves()
+        stripped = mxrd.matrix().stack("stripped")
+        self.assertEqual(stripped.shape, (3, 1200))
+        self.assertTrue(all(
+            np.allclose(xrd.extra_data["stripped"],
+                        xrd.corr_intens - xrd.extra_data["background"])
+            for xrd in curves))
+        self.assertIn("Background", curves[1]._saved_plots)
+        items = run(map_curves, mxrd, curve_reflexes, [
+            ("x", [np.sin(xrd.theta) for xrd in curves]),
+            ("y", [xrd.extra_data["stripped"] for xrd in curves]),
+        ], (2.0, 2.0, 4, None, None, "Lorentz", 1e-3, True, 3))
+        self.assertEqual(len(items), 3)
+        self.assertTrue(all(len(i) >= 1 and len(i[0]) == 4 for i in items))
+        peaks = [max(i, key=lambda r: r[1])[0] for i in items]
+        self.assertLess(peaks[0], peaks[1])
+        self.assertLess(peaks[1], peaks[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import builtins
+import gc
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from sys import path
+path.insert(0, "..")
+builtins.__dict__.setdefault("_", str)
+import numpy as np
+from xrcea.core import shared
+from xrcea.core.idata import XrayData
+from xrcea.components.pddb.analyse import mul_plot, relevances
+from xrcea.components.pddb.opddb import ObjDB
+
+
+def _total(handle):
+    return float(handle.get().sum())
+
+
+def _exists(name):
+    try:
+        SharedMemory(name).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+class Owner:
+    pass
+
+
+class TestStore(unittest.TestCase):
+    def test_publish(self):
+        store = shared.ArrayStore()
+        arr = np.arange(1000.0)
+        handle = store.publish("a", arr)
+        self.assertIs(store.publish("a", arr), handle)
+        self.assertEqual(pickle.loads(pickle.dumps(handle)).shape, (1000,))
+        with ProcessPoolExecutor(1) as pool:
+            self.assertEqual(pool.submit(_total, handle).result(),
+                             arr.sum())
+        view = handle.get()
+        self.assertFalse(view.flags.writeable)
+        other = store.publish("a", arr.copy())
+        self.assertNotEqual(other.name, handle.name)
+        self.assertFalse(_exists(handle.name))
+        store.clear()
+        self.assertFalse(_exists(other.name))
+        self.assertEqual(len(store), 0)
+
+    def test_owner(self):
+        owner = Owner()
+        handle = shared.owner_store(owner).publish("a", np.ones(3))
+        self.assertTrue(_exists(handle.name))
+        del owner
+        gc.collect()
+        self.assertFalse(_exists(handle.name))
+
+    def test_xrd(self):
+        xrd = XrayData()
+        xrd.x_data = np.linspace(10.0, 90.0, 100)
+        xrd.y_data = np.random.random(100)
+        handle = xrd.share("y_data")
+        self.assertTrue(np.array_equal(handle.get(), xrd.y_data))
+        xrd.y_data = xrd.y_data * 2
+        self.assertFalse(_exists(handle.name))
+        self.assertTrue(np.array_equal(xrd.share("y_data").get(),
+                                       xrd.y_data))
+
+
+class TestRelevance(unittest.TestCase):
+    def test_relevances(self):
+        cards = {
+            str(n): {"reflexes": [[d, 100 - 10 * i, 1, 0, i]
+                                  for i, d in enumerate(ds)]}
+            for n, ds in ((1, (2.0, 1.5, 1.2)), (2, ()), (3, (1.8,)))
+        }
+        pddb = ObjDB({"objtype": "opddb", "cards": cards})
+        xrd = XrayData()
+        xrd.set_description({"name": "s", "x_units": "2theta",
+                             "lambda1": 1.54, "lambda2": 1.6, "I2": 0.5})
+        xrd.x_data = np.linspace(10.0, 90.0, 500)
+        xrd.extra_data["stripped"] = np.random.random(500)
+        patterns, offsets = pddb.share_patterns(
+            [1, 2, 3], "2theta", (1.54, 1.6), (10.0, 90.0))
+        args = (xrd.share("x_data"), xrd.share("stripped"), patterns)
+        rels = (relevances(*args, offsets[:2], [1.0, 0.5])
+                + relevances(*args, offsets[1:], [1.0, 0.5]))
+        self.assertAlmostEqual(rels[0], mul_plot(xrd, pddb, 1), 5)
+        self.assertEqual(rels[1], float("-inf"))
+        self.assertAlmostEqual(rels[2], mul_plot(xrd, pddb, 3), 5)
+        pddb.release_shared()
+        self.assertFalse(_exists(patterns.name))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import builtins
+import unittest
+from sys import path
+path.insert(0, "..")
+builtins.__dict__.setdefault("_", str)
+import numpy as np
+from xrcea.core.vi.value import ColumnTabular, TabCell
+from xrcea.components.cryp.preflex import CompCards, PeakLocator
+from xrcea.components.cryp.positions import sorted_bells
+
+
+class Made(TabCell):
+    made = 0
+
+    def __init__(self, value):
+        Made.made += 1
+        super().__init__(value)
+
+
+class _Xrd:
+    def __init__(self, cards):
+        self.extra_data = {"CompCards": cards}
+
+
+class TestColumnTabular(unittest.TestCase):
+    def setUp(self):
+        Made.made = 0
+        self.data = np.arange(30000.0).reshape(3, -1)
+        self.tab = ColumnTabular(
+            ["a", "b", "c"], self.data, [Made, None, Made])
+
+    def test_virtual(self):
+        tab = self.tab
+        self.assertEqual(tab.rows, 10000)
+        self.assertEqual(tab.columns, 3)
+        self.assertEqual(Made.made, 0)
+        cell = tab.get(5, 0)
+        self.assertEqual((cell.row, cell.col, cell.value), (5, 0, 5.0))
+        self.assertIs(tab.get(5, 0), cell)
+        self.assertEqual(tab.get(9999, 1), 19999.0)
+        self.assertIsNone(tab.get(10000, 0))
+        tab.get(5000, 2)
+        self.assertIsNot(tab.get(5000, 2), tab.get(5000, 2))
+        tab.set_visible(4990, 5010)
+        self.assertIs(tab.get(5000, 2), tab.get(5000, 2))
+        self.assertIsNot(tab.get(5, 0), cell)
+
+    def test_set_and_columns(self):
+        tab = self.tab
+        tab.set(3, 1, 7.0)
+        self.assertEqual(self.data[1, 3], 7.0)
+        tab.set(3, 0, 1.5)
+        self.assertEqual(tab.get(3, 0).value, 1.5)
+        tab.insert_column(1, "new", lambda: TabCell("x"))
+        self.assertEqual(tab.colname(1), "new")
+        self.assertEqual(tab.get(8, 1).row, 8)
+        self.assertEqual(tab.get(8, 2), 10008.0)
+        tab.remove_column(1)
+        self.assertEqual(tab.get(8, 1), 10008.0)
+        with self.assertRaises(RuntimeError):
+            tab.insert_row(0)
+
+    def test_callable_column(self):
+        tab = ColumnTabular(["r"], [lambda row: TabCell(row * 2)], rows=4)
+        self.assertEqual(tab.rows, 4)
+        self.assertEqual(tab.get(3, 0).value, 6)
+
+    def test_sorted_bells(self):
+        cryb = np.array([3.0, 1, 1, 1, 1.0, 2, 2, 2, 1.0, 1, 3, 3])
+        self.assertEqual(
+            sorted_bells(cryb).tolist(),
+            sorted(map(list, cryb.reshape(-1, 4))))
+
+
+class TestCompCards(unittest.TestCase):
+    def test_lookup(self):
+        cards = {
+            str(n): {
+                "number": str(n),
+                "name": f"card{n}",
+                "reflexes": [[1.0 + i, 100 - i, [1, 0, i]]
+                             for i in range(nref)],
+            }
+            for n, nref in ((1, 2), (2, 10), (3, 5))
+        }
+        tab = CompCards(_Xrd(cards), PeakLocator("d", 1.54))
+        self.assertEqual(tab.rows, 3 + 10 + 5)
+        self.assertEqual(tab.get(0, 3), _("Number"))
+        self.assertEqual(tab.get(2, 4), None)
+        self.assertEqual(tab.get(3, 2), "1 0 0")
+        self.assertEqual(tab.get(12, 1), "91")
+        self.assertEqual(tab.get(13, 1), "100")
+        self.assertEqual(tab.get(17, 2), "1 0 4")
+        self.assertIsNone(tab.get(18, 2))
+        self.assertIsNone(tab.get(-1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
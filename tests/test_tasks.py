@@ -0,0 +1,193 @@
+import builtins
+import os
+import unittest
+from sys import path
+from threading import Event
+from unittest.mock import patch
+import numpy as np
+path.insert(0, "..")
+builtins.__dict__.setdefault("_", str)
+from xrcea.core import tasks
+from xrcea.core.tasks import Cancelled, Scheduler
+from xrcea.core.vi.mixins import DialogsMixin
+
+
+def count_to(status, num, events=None):
+    status["description"] = "counting"
+    done = 0
+    for i in range(num):
+        if status.get("stop"):
+            break
+        if events is not None:
+            events[i].wait(5)
+        status["part"] = i / num
+        done += 1
+    status["complete"] = True
+    return done
+
+
+class Dialogs(DialogsMixin):
+    name = "test"
+
+    def __init__(self):
+        self.gui_functions = {}
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.sched = Scheduler(1)
+        self.events = []
+        self.sched.add_listener(lambda k, t: self.events.append((k, t.uid)))
+
+    def tearDown(self):
+        self.sched.shutdown()
+
+    def test_run(self):
+        done = []
+        task = self.sched.submit(count_to, 5, name="count",
+                                 on_done=lambda t: done.append(t.result()))
+        self.sched.wait()
+        self.assertEqual(task.state, tasks.FINISHED)
+        self.assertEqual(done, [5])
+        kinds = [k for k, u in self.events]
+        self.assertEqual(kinds[:2], [tasks.QUEUED, tasks.STARTED])
+        self.assertIn(tasks.PROGRESS, kinds)
+        self.assertEqual(kinds[-1], tasks.FINISHED)
+        self.assertEqual(task.description, "counting")
+        self.assertEqual(self.sched.tasks(), [])
+
+    def test_queue_and_cancel(self):
+        gates = [Event() for i in range(3)]
+        first = self.sched.submit(count_to, 3, gates)
+        second = self.sched.submit(count_to, 3)
+        second.cancel()
+        gates[0].set()
+        first.cancel()
+        for gate in gates:
+            gate.set()
+        self.sched.wait()
+        self.assertEqual(second.state, tasks.CANCELLED)
+        self.assertEqual(first.state, tasks.FINISHED)
+        self.assertTrue(first.cancelled)
+        self.assertLess(first.result(), 3)
+
+    def test_failure(self):
+        def fail(status):
+            status["stop"] = True
+            status["token"] = status.get("stop")
+            raise ValueError("bad")
+
+        task = self.sched.submit(fail)
+        self.sched.wait()
+        self.assertEqual(task.state, tasks.FAILED)
+        self.assertIsInstance(task.error, ValueError)
+        self.assertTrue(task.status["token"])
+
+    def test_bad_handler(self):
+        def bad(*args):
+            raise RuntimeError("handler")
+
+        self.sched.add_listener(bad)
+        errors = []
+        with patch("xrcea.core.vi.print_error",
+                   lambda title, info: errors.append((title, info))):
+            self.sched.submit(count_to, 1, name="count", on_done=bad)
+            self.sched.wait()
+        self.assertEqual(self.events[-1][0], tasks.FINISHED)
+        self.assertIn(("count", "handler"), errors)
+        self.assertEqual(len(errors), len(self.events) + 1)
+
+    def test_pollers(self):
+        polls = []
+        self.sched.add_poller(lambda: polls.append(1))
+        self.sched.process_events()
+        self.sched.process_events()
+        self.assertEqual(len(polls), 2)
+        self.sched._pollers.clear()
+
+    def test_token(self):
+        task = self.sched.prepare(count_to, 1)
+        task.cancel()
+        with self.assertRaises(Cancelled):
+            task.token.check()
+
+    def test_process(self):
+        task = self.sched.submit(sum, [1, 2, 3], process=True)
+        self.sched.wait()
+        self.assertEqual(task.result(), 6)
+        self.assertEqual(task.state, tasks.FINISHED)
+
+
+class TestParallel(unittest.TestCase):
+    def test_parallel_map(self):
+        def run(status):
+            return tasks.parallel_map(
+                status, pow, [(i, 2) for i in range(10)], (0.5, 1.0))
+
+        task = tasks.scheduler().submit(run)
+        tasks.scheduler().wait([task])
+        self.assertEqual(task.result(), [i * i for i in range(10)])
+        self.assertEqual(task.part, 1.0)
+
+    def test_broken_pool(self):
+        sched = Scheduler(2)
+        try:
+            future = sched.submit_process(os._exit, 1)
+            with self.assertRaises(tasks.BrokenProcessPool):
+                future.result()
+            self.assertEqual(sched.submit_process(pow, 3, 2).result(), 9)
+        finally:
+            sched.shutdown()
+
+    def test_stopped(self):
+        task = tasks.scheduler().prepare(tasks.parallel_map, pow, [])
+        task.cancel()
+        self.assertIsNone(
+            tasks.parallel_map(task.status, pow, [(i, 2) for i in range(4)]))
+
+    def test_fit_masks(self):
+        from xrcea.components.cryp.indexer import _fit_masks
+
+        locs = np.array([4.0 / np.sqrt(h) for h in (1, 2, 3, 4, 5)])
+        args = ("cubic", 3, locs, [3.9], 3, 4)
+        whole = _fit_masks(*args, 0, 32)
+        parts = _fit_masks(*args, 0, 13) + _fit_masks(*args, 13, 32)
+        parts.sort(key=lambda x: x[1][6])
+        self.assertEqual([r[-1] for r in parts[:4]],
+                         [r[-1] for r in whole])
+        self.assertEqual(len(whole[0][-1]), 5)
+
+
+class TestMixin(unittest.TestCase):
+    def test_bg_process(self):
+        dlg = Dialogs()
+        done = []
+        dlg.bg_process(lambda status: done.append(1))
+        self.assertEqual(done, [])
+
+        def gui(status):
+            status["start"]()
+            tasks.scheduler().wait()
+
+        dlg.gui_functions["bg_process"] = gui
+        dlg.bg_process(lambda status, x: done.append(x), 2)
+        self.assertEqual(done, [2])
+        task = dlg.run_task(count_to, 4)
+        tasks.scheduler().wait()
+        self.assertEqual(task.result(), 4)
+        self.assertEqual(task.name, "test")
+        gate = Event()
+
+        def cancel(status):
+            status["start"]()
+            status["stop"] = True
+
+        dlg.gui_functions["bg_process"] = cancel
+        dlg.bg_process(lambda status: gate.wait(5))
+        self.assertEqual(len(tasks.scheduler().tasks()), 1)
+        gate.set()
+        tasks.scheduler().wait()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from sys import path
+path.insert(0, "..")
+from xrcea.core.vi.value import Value
+
+
+class Recorder:
+    def __init__(self, value):
+        self.value = value
+        self.patches = []
+        self.updates = 0
+        value.set_updater(self.updater)
+        value.set_patcher(self.patcher)
+
+    def updater(self, _lst):
+        self.updates += 1
+
+    def patcher(self, operation, args, change):
+        before = list(self.value.get())
+        change()
+        self.patches.append((operation, args, before))
+
+
+class TestValuePatches(unittest.TestCase):
+    def setUp(self):
+        self.value = Value(list)
+        self.value.update([(i, str(i)) for i in range(10)])
+        self.rec = Recorder(self.value)
+
+    def test_insert_remove(self):
+        self.value.insert(2, [("a",), ("b",)])
+        self.assertEqual(self.value.get()[2:4], [("a",), ("b",)])
+        self.assertEqual(self.rec.patches[-1][:2], ("insert", (2, 3)))
+        self.value.remove([2, 3, 7, 11])
+        self.assertEqual([op[:2] for op in self.rec.patches[1:]],
+                         [("remove", (11, 11)), ("remove", (7, 7)),
+                          ("remove", (2, 3))])
+        self.assertEqual([r[0] for r in self.value.get()],
+                         [0, 1, 2, 3, 4, 6, 7, 8])
+        self.assertEqual(self.rec.updates, 0)
+        self.value.update([(i,) for i in range(40)], False)
+        self.value.remove(range(0, 40, 2))
+        self.assertEqual(len(self.rec.patches), 4)
+        self.assertEqual(self.rec.updates, 1)
+        self.assertEqual([r[0] for r in self.value.get()],
+                         list(range(1, 40, 2)))
+
+    def test_replace_reorder(self):
+        self.value.replace({5: (5, "five"), 1: (1, "one")})
+        self.assertEqual(self.rec.patches[-1][:2], ("replace", [1, 5]))
+        self.assertEqual(self.value.get()[5], (5, "five"))
+        self.value.reorder(reversed(range(10)))
+        self.assertEqual(self.value.get()[0], (9, "9"))
+        self.assertEqual(self.rec.patches[-1][1][:2], [9, 8])
+        with self.assertRaises(ValueError):
+            self.value.reorder([0, 0])
+
+    def test_sync(self):
+        rows = [(i, str(i)) for i in (12, 3, 1, 0, 11)]
+        rows[1] = (3, "three")
+        self.value.sync(rows, lambda r: r[0])
+        self.assertEqual(self.value.get(), rows)
+        self.assertEqual([p[0] for p in self.rec.patches],
+                         ["remove", "remove", "insert", "reorder",
+                          "replace"])
+        self.value.sync(rows, lambda r: r[0])
+        self.assertEqual(len(self.rec.patches), 5)
+
+    def test_without_patcher(self):
+        value = Value(list)
+        calls = []
+        value.set_updater(calls.append)
+        value.insert(0, [1, 2, 3])
+        value.remove([1])
+        self.assertEqual(calls, [[1, 3], [1, 3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
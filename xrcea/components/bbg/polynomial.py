@@ -19,8 +19,10 @@ Polynomial fitting
 
 from xrcea.core.application import APPLICATION as APP
 from numpy import arcsin, sin, polyval, zeros, sqrt, array, pi
-from scipy.optimize import fmin
 from locale import format_string
+from xrcea.core.lazyimport import lazy_callable
+
+fmin = lazy_callable("scipy.optimize", "fmin")
 
 
 def detect_polynome(xrd, vis):
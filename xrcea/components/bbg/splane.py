@@ -19,8 +19,10 @@ Sample's plane correction
 
 from xrcea.core.application import APPLICATION as APP
 from numpy import sqrt, array
-from scipy.optimize import fmin
 from locale import format_string
+from xrcea.core.lazyimport import lazy_callable
+
+fmin = lazy_callable("scipy.optimize", "fmin")
 
 
 def detect_plane_shift(xrd, vis):
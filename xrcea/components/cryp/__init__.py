@@ -24,6 +24,7 @@ import numpy as np
 from xrcea.core.application import APPLICATION as APP
 from xrcea.core.idata import XrayData
 from xrcea.core.multicurve import MCUR_MENU_NAME, MultiXrCurve
+from xrcea.core.tasks import parallel_map
 
 from .assume import show_struct_assumptions
 from .cellparams import CALCULATORS
@@ -32,7 +33,15 @@ from .peakshape import PeaksShape
 from .positions import show_sheet
 from .preflex import show_assumed
 from .psipos import show_psi_plots, show_psi_sheet
-from .reflex import Cryplots, ReflexDedect, calc_bg, calc_bg_cheb, refl_sects
+from .reflex import Cryplots, background, find_sect_bells, refl_sects
+from .series import (
+    assumed_positions,
+    bg_xy,
+    curve_background,
+    curve_reflexes,
+    map_curves,
+    refl_x,
+)
 
 _DEFAULTS = {
     "bg_sigmul": 2.0,
@@ -75,6 +84,10 @@ def introduce():
     mn = MCUR_MENU_NAME
     mitems = [
         ((mn, _("Find backgrounds...")), Mcall(_data, "calc_bg")),
+        (
+            (mn, _("Calc. refl. shapes...")),
+            Mcall(_data, "calc_series_reflexes"),
+        ),
         ((mn, _("Show found refl. shapes")), Mcall(_data, "show_sheet")),
         ((mn, _("Show plots")), Mcall(_data, "show_plots")),
     ]
@@ -119,21 +132,17 @@ class Mcall:
         self.data = xrd
         return self.__action()
 
-    @staticmethod
-    def _calc_xrd_bg(xrd: XrayData, sigmul: float, deg: float, mode: int):
-        if xrd.x_units != "q":
-            x = np.sin(xrd.theta)
-            y = xrd.corr_intens
-        else:
-            x = xrd.qrange
-            y = xrd.y_data
-        if mode == 0:
-            xrd.extra_data["background"] = bgnd = calc_bg(x, y, deg, sigmul)[0]
-        elif mode == 1:
-            xrd.extra_data["background"] = bgnd = calc_bg_cheb(
-                x, y, deg, sigmul
-            )[0]
+    @classmethod
+    def _calc_xrd_bg(cls, xrd: XrayData, sigmul: float, deg: float,
+                     mode: int):
+        x, y = bg_xy(xrd)
+        bgnd = background(x, y, deg, sigmul, mode)
+        xrd.extra_data["background"] = bgnd
         xrd.extra_data["stripped"] = y - bgnd
+        cls._remember_bg_plots(xrd)
+
+    @staticmethod
+    def _remember_bg_plots(xrd: XrayData):
         x_label = {
             "theta": "$\\theta$",
             "2theta": "$2\\theta$",
@@ -196,21 +205,76 @@ class Mcall:
                 self._calc_xrd_bg(dat, sigmul, deg, mode)
                 dat.show_plot(d_("Background"))
             elif isinstance(dat, MultiXrCurve):
-                for xrd in dat.get_curves():
-                    self._calc_xrd_bg(xrd, sigmul, deg, mode)
+                self._calc_series_bg(gui, dat, sigmul, deg, mode)
+
+    def _calc_series_bg(self, gui, dat, sigmul, deg, mode):
+        "Find backgrounds of the curves in worker processes"
+        curves = list(dat.get_curves())
+        xys = [bg_xy(xrd) for xrd in curves]
+        ys = [xy[1] for xy in xys]
+        found = []
+
+        def progress(status):
+            status["description"] = _("Calculating backgrounds...")
+            bgs = map_curves(
+                status,
+                dat,
+                curve_background,
+                [("bg_x", [xy[0] for xy in xys]), ("bg_y", ys)],
+                (deg, sigmul, mode),
+            )
+            if bgs is not None:
+                found.extend(bgs)
+            status["complete"] = True
+
+        def finish(_task):
+            if len(found) != len(curves):
+                return
+            mat = dat.matrix()
+            if mat is not None and mat.valid(curves):
+                bgs = np.vstack(found)
+                mat.set_rows("background", bgs)
+                mat.set_rows("stripped", np.vstack(ys) - bgs)
+            else:
+                for xrd, y, bgnd in zip(curves, ys, found):
+                    xrd.extra_data["background"] = bgnd
+                    xrd.extra_data["stripped"] = y - bgnd
+            for xrd in curves:
+                self._remember_bg_plots(xrd)
+
+        gui.run_task(
+            progress,
+            name=str(dat.name) + _(": backgrounds"),
+            on_done=finish,
+        )
 
     def calc_reflexes(self):
         "calculate reflexes"
         dat = self.data
-        rv = calculate_reflexes(dat)
-        if rv is None:
-            return
+        calculate_reflexes(dat, lambda rv: self._reflexes_found(dat, rv))
+
+    @staticmethod
+    def _reflexes_found(dat, rv, show=True):
         ps = PeaksShape(dat)
         ps.bells = rv["items"]
         ps.shape = rv["shape"]
         plot_name = d_("Peaks description")
         dat.remember_plot(plot_name, "cryp" + rv["shape"])
-        dat.show_plot(plot_name)
+        if show:
+            dat.show_plot(plot_name)
+
+    def calc_series_reflexes(self):
+        "calculate reflexes of the curves"
+        dat = self.data
+        calculate_series_reflexes(dat, self._series_reflexes_found)
+
+    def _series_reflexes_found(self, dat, found):
+        for xrd, rv in found:
+            self._reflexes_found(xrd, rv, False)
+        # tables of the former reflexes are out of date
+        dat._uis.pop("FoundReflexes", None)
+        dat._uis.pop("FuncView", None)
+        show_psi_sheet(dat)
 
     def show_sheet(self):
         "Show table"
@@ -229,32 +293,49 @@ class Mcall:
 
 def calc_refl_dialog(idata):
     "Dialog for reflexes calculation"
-    plot = idata.UIs.get("main")
+    if isinstance(idata, MultiXrCurve):
+        plot = idata._uis.get("main")
+        curves = idata.get_curves()
+    else:
+        plot = idata.UIs.get("main")
+        curves = [idata]
     sigmin = _("Min. %s:") % "\u03c3", _data["refl_sigmin"]
     consig = _("Const. %s") % "\u03c3", _data["refl_consig"]
     mbells = _("Max. bells:"), _data["refl_mbells"]
     bell_t = _("Shape function:"), _BELL_NAMES, _data["refl_bt"]
     pts_mi = _("Ignore points:"), _data["refl_ptm"], 4
     bf = _("Believe factor:"), _data["refl_bf"]
-    alg = 1 if idata.extra_data.get("CompCards") else 0
+    alg = 1 if any(c.extra_data.get("CompCards") for c in curves) else 0
     algorithm = (
         _("Mode:"),
         (_("Without any user assumption"), _("By predefined reflexes")),
         alg,
     )
-    return plot.input_dialog(
+    rv = plot.input_dialog(
         _("Shapes of reflexes"),
         [sigmin, consig, mbells, bell_t, bf, pts_mi, algorithm],
     )
+    if rv is not None:
+        for name, val in zip(
+            (
+                "refl_sigmin",
+                "refl_consig",
+                "refl_mbells",
+                "refl_bt",
+                "refl_bf",
+                "refl_ptm",
+            ),
+            rv,
+        ):
+            _data[name] = val
+    return rv
 
 
-def calculate_reflexes(idata):
-    "Search reflexes shapes"
+def calculate_reflexes(idata, done):
+    """Search reflexes shapes in background, done(reflexes) is called
+    when they are found"""
     plot = idata.UIs.get("main")
-    if idata.x_units != "q":
-        x = np.sin(idata.theta)
-    else:
-        x = idata.qrange
+    x = refl_x(idata)
     try:
         stripped_y = idata.extra_data["stripped"]
     except KeyError:
@@ -272,62 +353,130 @@ def calculate_reflexes(idata):
     if rv is None:
         return
     sigmin, consig, mbells, bell_t, bf, pts_mi, algorithm = rv
-    _data["refl_sigmin"] = sigmin
-    _data["refl_consig"] = consig
-    _data["refl_mbells"] = mbells
-    _data["refl_bt"] = bell_t
-    _data["refl_ptm"] = pts_mi
-    _data["refl_bf"] = bf
     sects = refl_sects(x, stripped_y, sig2, bf)
     sects = [i for i in sects if len(i) > pts_mi]
     totreflexes = []
     totsigmas = []
     if algorithm == 1:
-        apposs = []
-        for v in idata.extra_data.get("CompCards", {}).values():
-            extinguished = set(v.get("extinguished", ()))
-            for i, r in enumerate(v.get("reflexes", ())):
-                if i not in extinguished:
-                    apposs.append(r[0])
-        apposs = idata.lambda1 / 2.0 / np.array(apposs)
+        apposs = assumed_positions(idata)
 
     def progress(status):
         status["description"] = _("Calculating shapes of the reflexes...")
-        lsec = len(sects)
-        for i, sect in enumerate(sects):
-            status["part"] = i / lsec
-            if status.get("stop"):
-                break
-            print(
-                len(sect),
-                np.arcsin(np.array(sect)[(0, -1), 0]) / np.pi * 360.0,
-            )
-            rfd = ReflexDedect(sect, l21, I2)
-            if algorithm == 0:
-                reflexes, stdev = rfd.find_bells(
-                    sigmin, not consig, mbells, _BELL_TYPES[bell_t]
+        if algorithm == 0:
+            jobs = (
+                (
+                    np.array(sect),
+                    l21,
+                    I2,
+                    _BELL_TYPES[bell_t],
+                    sigmin,
+                    not consig,
+                    mbells,
                 )
-                reflexes = list(reflexes)
-                print(reflexes, stdev)
-            else:
-                mi = sect[0][0]
-                ma = sect[-1][0]
-                pposs = [i for i in apposs if mi <= i <= ma]
-                reflexes, stdev = rfd.find_bells_pp(
-                    _BELL_TYPES[bell_t], pposs, ()
+                for sect in sects
+            )
+        else:
+            jobs = (
+                (
+                    np.array(sect),
+                    l21,
+                    I2,
+                    _BELL_TYPES[bell_t],
+                    None,
+                    None,
+                    None,
+                    [i for i in apposs if sect[0][0] <= i <= sect[-1][0]],
                 )
+                for sect in sects
+            )
+        found = parallel_map(status, find_sect_bells, jobs)
+        for reflexes, stdev in found or ():
             totreflexes.extend(reflexes)
             totsigmas.extend([stdev] * (len(totreflexes) - len(totsigmas)))
-            rfd.x_ar = np.linspace(
-                rfd.x_ar[0], rfd.x_ar[-1], len(rfd.x_ar) * 10
-            )
-            rfd.lambda21 = None
         status["complete"] = True
 
-    plot.bg_process(progress)
-    dreflexes["shape"] = _BELL_TYPES[bell_t]
-    dreflexes["items"] = [i + (j,) for i, j in zip(totreflexes, totsigmas)]
-    return dreflexes
+    def finish(task):
+        if task.cancelled:
+            return
+        dreflexes["shape"] = _BELL_TYPES[bell_t]
+        dreflexes["items"] = [
+            i + (j,) for i, j in zip(totreflexes, totsigmas)
+        ]
+        done(dreflexes)
+
+    return plot.run_task(
+        progress,
+        name=str(idata.name) + _(": reflexes"),
+        on_done=finish,
+    )
+
+
+def calculate_series_reflexes(mxrd, done):
+    """Search reflexes shapes of the curves in worker processes, a task
+    per curve, done(mxrd, [(xrd, reflexes), ...]) is called when they
+    are found"""
+    gui = mxrd._uis.get("main")
+    curves = list(mxrd.get_curves())
+    if any("stripped" not in xrd.extra_data for xrd in curves):
+        gui.print_error(_("It is no background calculated."))
+        return
+    rv = calc_refl_dialog(mxrd)
+    if rv is None:
+        return
+    sigmin, consig, mbells, bell_t, bf, pts_mi, algorithm = rv
+    sh_type = _BELL_TYPES[bell_t]
+    # curves of a series share wavelengths
+    first = curves[0]
+    l21 = first.lambda2 / first.lambda1 if first.lambda2 else None
+    found = []
+
+    def progress(status):
+        status["description"] = _("Calculating shapes of the reflexes...")
+        args = (_data["bg_sigmul"], bf, pts_mi, l21, first.I2, sh_type)
+        if algorithm == 0:
+            args += (sigmin, not consig, mbells)
+            curve_args = None
+        else:
+            args += (None, None, None)
+            curve_args = [(assumed_positions(xrd),) for xrd in curves]
+        items = map_curves(
+            status,
+            mxrd,
+            curve_reflexes,
+            [
+                ("refl_x", [refl_x(xrd) for xrd in curves]),
+                ("refl_y", [xrd.extra_data["stripped"] for xrd in curves]),
+            ],
+            args,
+            curve_args,
+        )
+        if items is not None:
+            found.extend(items)
+        status["complete"] = True
+
+    def finish(task):
+        if task.cancelled or len(found) != len(curves):
+            return
+        done(
+            mxrd,
+            [
+                (
+                    xrd,
+                    {
+                        "lambda": xrd.lambda1,
+                        "shape": sh_type,
+                        "items": items,
+                    },
+                )
+                for xrd, items in zip(curves, found)
+            ],
+        )
+
+    return gui.run_task(
+        progress,
+        name=str(mxrd.name) + _(": reflexes"),
+        on_done=finish,
+    )
 
 
 def reflexes_markup(reflexes):
@@ -31,9 +31,11 @@ from numpy import (
     zeros,
 )
 from numpy.linalg import lstsq
-from scipy.optimize import fmin
 
 from xrcea.core.description import Cell, Row, Table
+from xrcea.core.lazyimport import lazy_callable
+
+fmin = lazy_callable("scipy.optimize", "fmin")
 
 _GAUSS_RAD_C = 360.0 / pi * 2.0 * sqrt(log(2))
 _LORENTZ_RAD_C = 360.0 / pi * 2.0
@@ -53,7 +55,7 @@ class BroadAn:
         extra_data = xrd.extra_data
         self._lambda = xrd.lambda1
         cryb = extra_data["crypbells"]
-        cryb = cryb.reshape(len(cryb) // 4, 4)
+        cryb = cryb.reshape(len(cryb) // 4, 4).copy()
         self.shape = shape = extra_data["crypShape"]
         self._instr_broad = extra_data.get("crypInstrumental", {}).get(shape)
         if self.shape not in ("GaussRad", "LorentzRad"):
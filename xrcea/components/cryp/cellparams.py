@@ -32,9 +32,11 @@ from numpy import (
     radians,
 )
 from numpy.linalg import solve, LinAlgError
-from scipy.optimize import fmin
 from itertools import product
 from xrcea.core.description import SubScript, SuperScript, Table, Row, Cell
+from xrcea.core.lazyimport import lazy_callable
+
+fmin = lazy_callable("scipy.optimize", "fmin")
 
 
 def get_dhkl(ipd, inds):
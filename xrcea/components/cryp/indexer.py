@@ -15,35 +15,64 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 """Set Miller's indices automatically"""
 
-from itertools import product
 from numpy import array
+from xrcea.core.tasks import parallel_map, scheduler
 from .cellparams import FitIndices
 
+# chunks of work per worker process, more chunks balance load better
+CHUNKS_PER_WORKER = 4
+
+
+def _fit_masks(cs, max_index, locations, ini_p, min_peaks, max_results,
+               start, stop):
+    """Fit indices to subsets of locations from start to stop
+
+    Subsets are numbered as binary numbers, the first location is the
+    most significant bit, which is order of itertools.product.
+    """
+    fit_ = FitIndices(cs, max_index)
+    max_res15 = int(1.5 * max_results)
+    nloc = len(locations)
+    result = []
+    for i in range(start, stop):
+        c = tuple((i >> (nloc - 1 - k)) & 1 for k in range(nloc))
+        if sum(c) < min_peaks:
+            continue
+        mask = array(c, dtype=bool)
+        minc = (cs,) + fit_(locations[mask], ini_p)
+        result.append(minc + (c,))
+        if len(result) > max_res15:
+            result.sort(key=lambda x: x[1][6])
+            del result[max_results:]
+    result.sort(key=lambda x: x[1][6])
+    del result[max_results:]
+    return result
+
 
 def find_indices(
     locations, ini_p, cs, max_index, min_peaks, max_results, result
 ):
-    """Wrapper for Miller's indices searcher"""
+    """Wrapper for Miller's indices searcher
+
+    Subsets of locations are fitted by worker processes.
+    """
     locations = array(locations)
 
     def progress(status):
         status["description"] = _("Trying to find Miller's indices...")
         total = 2 ** len(locations)
-        fit_ = FitIndices(cs, max_index)
-        max_res15 = int(1.5 * max_results)
-        for i, c in enumerate(product(*(((0, 1),) * len(locations)))):
-            npeaks = sum(c)
-            if npeaks < min_peaks:
-                continue
-            status["part"] = i / total
-            if status.get("stop"):
-                break
-            mask = array(c, dtype=bool)
-            minc = (cs,) + fit_(locations[mask], ini_p)
-            result.append(minc + (c,))
-            if len(result) > max_res15:
-                result.sort(key=lambda x: x[1][6])
-                del result[max_results:]
+        chunk = -(-total // (scheduler().workers * CHUNKS_PER_WORKER))
+        parts = parallel_map(
+            status,
+            _fit_masks,
+            (
+                (cs, max_index, locations, ini_p, min_peaks, max_results,
+                 start, min(start + chunk, total))
+                for start in range(0, total, chunk)
+            ),
+        )
+        for part in parts or ():
+            result.extend(part)
         result.sort(key=lambda x: x[1][6])
         del result[max_results:]
         status["complete"] = True
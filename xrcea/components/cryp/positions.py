@@ -18,11 +18,18 @@
 from locale import format_string
 from math import asin, pi
 
+import numpy as np
+
 from xrcea.core.application import APPLICATION as APP
 from xrcea.core.idata import XrayData
 from xrcea.core.vi import copy_to_clipboard
 from xrcea.core.vi.spreadsheet import Spreadsheet
-from xrcea.core.vi.value import TabCell, Tabular, Value, lfloat
+from xrcea.core.vi.value import (
+    ColumnTabular,
+    TabCell,
+    Value,
+    lfloat,
+)
 
 from .fviewer import show_func_view
 from .indexer import find_indices, indices_from_card
@@ -132,18 +139,23 @@ class DisplayX0:
             return asin(val) * 360.0 / pi
 
 
+def sorted_bells(cryb):
+    """Rows (x0, h, w, s) of the bells sorted by x0"""
+    cryb = np.asarray(cryb).reshape(-1, 4)
+    return cryb[np.lexsort(cryb.T[::-1])]
+
+
 class FoundBells(Spreadsheet):
     def __init__(self, xrd):
         self._xrd = xrd
         self._uindex = xrd.extra_data.setdefault("UserIndexes", {})
-        cryb = xrd.extra_data.get("crypbells")
-        self.cryb = cryb = sorted(map(tuple, cryb.reshape(len(cryb) // 4, 4)))
-        val = Tabular(colnames=["x\u2080", "h", "w", "s"])
+        self.cryb = cryb = sorted_bells(xrd.extra_data.get("crypbells"))
         self.display = display = DisplayX0("sin", xrd)
-        for i, data in enumerate(cryb):
-            val.insert_row(
-                i, [X0Cell(data[0], display)] + [IFloat(i) for i in data[1:]]
-            )
+        val = ColumnTabular(
+            ["x\u2080", "h", "w", "s"],
+            cryb.T,
+            [lambda x0: X0Cell(x0, display)] + [IFloat] * 3,
+        )
         super().__init__(str(xrd.name) + _(" (found reflexes)"), val)
         self.load_miller_indices()
         self.int_groups = []
@@ -272,9 +284,13 @@ class FoundBells(Spreadsheet):
             )
             return
         groups = []
-        self.bg_process(
-            find_indices(ipd, ipars, CELL_TYPE_C[cs], mi, mp, mr, groups)
+        self.run_task(
+            find_indices(ipd, ipars, CELL_TYPE_C[cs], mi, mp, mr, groups),
+            name=str(self._xrd.name) + _(": Miller's indices"),
+            on_done=lambda task: self._add_groups(groups, cs),
         )
+
+    def _add_groups(self, groups, cs):
         curauto = 0
         for name in self._uindex:
             if name.startswith("auto"):
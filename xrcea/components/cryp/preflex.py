@@ -17,6 +17,8 @@
 About predefined reflexes
 """
 import json
+from bisect import bisect_right
+from itertools import accumulate
 from locale import atof, format_string
 from math import asin, pi, sin
 from typing import Any, Optional, Union
@@ -200,6 +202,8 @@ class CompCards(Tabular):
         self._locator = locator
         self._cards = xrd.extra_data.setdefault("CompCards", {})
         self._comp_cards = []
+        # first rows of cards and the total number of rows
+        self._starts = [0]
         super().__init__(
             colnames=["x\u2080", "I", "(h k l)", _("Parameter"), _("Value")]
         )
@@ -207,7 +211,7 @@ class CompCards(Tabular):
 
     @property
     def rows(self):
-        return sum(i.rows for i in self._comp_cards)
+        return self._starts[-1]
 
     def from_origin(self):
         "ab initio"
@@ -216,23 +220,28 @@ class CompCards(Tabular):
             CompCard(self._cards[cno], self._locator)
             for cno in sorted(self._cards, key=int)
         )
+        self._starts = list(
+            accumulate((c.rows for c in self._comp_cards), initial=0)
+        )
         self.refresh()
 
+    def _card(self, row: int) -> tuple[Optional[CompCard], int]:
+        "card containing the row and the row in the card"
+        if row < 0 or row >= self._starts[-1]:
+            return None, row
+        num = bisect_right(self._starts, row) - 1
+        return self._comp_cards[num], row - self._starts[num]
+
     def get(self, row: int, col: int) -> Optional[Union[str, PosCell]]:
-        nr = 0
-        for card in self._comp_cards:
-            if row < nr + card.rows:
-                return card.get(row - nr, col)
-            nr += card.rows
-        return None
+        card, row = self._card(row)
+        if card is None:
+            return None
+        return card.get(row, col)
 
     def set(self, row: int, col: int, data: str) -> None:
-        nr = 0
-        for card in self._comp_cards:
-            if row < nr + card.rows:
-                card.set(row - nr, col, data)
-                return
-            nr += card.rows
+        card, row = self._card(row)
+        if card is not None:
+            card.set(row, col, data)
 
     def on_del_pressed(self, cells):
         start = 0
@@ -21,12 +21,13 @@ from xrcea.core.vi import Plot
 
 from .peakshape import PeaksShape
 from .positions import (
+    ColumnTabular,
     DisplayX0,
     IFloat,
     Spreadsheet,
-    Tabular,
     X0Cell,
     copy_to_clipboard,
+    sorted_bells,
 )
 
 _treat = _("Treat")
@@ -40,22 +41,27 @@ class PsiBells(Spreadsheet):
         self._uindex = [
             xrd.extra_data.setdefault("UserIndexes", {}) for xrd in xrds
         ]
-        crybs = [xrd.extra_data.get("crypbells") for xrd in xrds]
         self.crybs = [
-            sorted(map(tuple, cryb.reshape(len(cryb) // 4, 4)))
-            for cryb in crybs
+            sorted_bells(xrd.extra_data.get("crypbells")) for xrd in xrds
         ]
-        val = Tabular(colnames=["\u03c8", "x\u2080", "h", "w", "s"])
-        self.displays = [DisplayX0("sin", xrd) for xrd in xrds]
-        start = 0
-        for cryb, display, xrd in zip(self.crybs, self.displays, xrds):
-            for i, data in enumerate(cryb, start):
-                val.insert_row(
-                    i,
-                    [IFloat(xrd.psi), X0Cell(data[0], display)]
-                    + [IFloat(i) for i in data[1:]],
-                )
-            start += len(cryb)
+        self.displays = displays = [DisplayX0("sin", xrd) for xrd in xrds]
+        # first rows of curves
+        starts = np.cumsum([0] + [len(cryb) for cryb in self.crybs])
+        bells = np.concatenate(self.crybs)
+        psis = np.repeat(
+            [float(xrd.psi) for xrd in xrds], np.diff(starts)
+        )
+
+        def x0_cell(row):
+            curve = np.searchsorted(starts, row, "right") - 1
+            return X0Cell(bells[row, 0], displays[curve])
+
+        val = ColumnTabular(
+            ["\u03c8", "x\u2080", "h", "w", "s"],
+            [psis, x0_cell] + list(bells[:, 1:].T),
+            [IFloat, None] + [IFloat] * 3,
+            len(bells),
+        )
         super().__init__(str(mxrd.name) + _(" (found reflexes)"), val)
         self.menu.append_item(
             (_treat,),
@@ -17,7 +17,13 @@
 
 import numpy as np
 from numpy.polynomial.chebyshev import chebfit, chebval
-from scipy.optimize import curve_fit, fmin  # type: ignore
+
+from xrcea.core.lazyimport import lazy_callable
+
+curve_fit = lazy_callable("scipy.optimize", "curve_fit")
+fmin = lazy_callable("scipy.optimize", "fmin")
+# numpy 2 renamed trapz
+_trapezoid = getattr(np, "trapezoid", None) or getattr(np, "trapz")
 
 _SH_FUNCTIONS = {
     "Gauss": lambda the_x, x0, h, w: h * np.exp(-((the_x - x0) ** 2) / w),
@@ -78,6 +84,13 @@ def calc_bg_cheb(data_x, data_y, deg, bf=3.0):
     return tbg, sigma2, coeffs
 
 
+def background(x, y, deg, sigmul, mode=0):
+    """Background by polynomial (mode 0) or Chebyshev (mode 1) fit"""
+    if mode == 1:
+        return calc_bg_cheb(x, y, deg, sigmul)[0]
+    return calc_bg(x, y, deg, sigmul)[0]
+
+
 def refl_sects(s_x, stripped_y, sigma2, bf=3.0):
     sigma = sigma2**0.5 * bf
     sector = []
@@ -201,7 +214,7 @@ class ReflexDedect:
         self.sh_func = _SH_FUNCTIONS[sh_type]
         y_ar = self.y_ar
         x_ar = self.x_ar
-        area = np.trapz(y_ar, x_ar)
+        area = _trapezoid(y_ar, x_ar)
         hght = y_ar.max()
         if self.lambda21:
             area /= 1.0 + self.I2
@@ -249,7 +262,7 @@ class ReflexDedect:
             return [], 0.0
         y_ar = self.y_ar
         x_ar = self.x_ar
-        area = np.trapz(y_ar, x_ar)
+        area = _trapezoid(y_ar, x_ar)
         hght = y_ar.max()
         if self.lambda21:
             area /= 1.0 + self.I2
@@ -293,6 +306,17 @@ class ReflexDedect:
         return self.peaks, np.sqrt(sig2)
 
 
+def find_sect_bells(sect, lambda21, i2, sh_type, sigmin=None, varsig=None,
+                    max_peaks=None, pposs=None):
+    """Find bells in the sector, pposs are predefined positions"""
+    rfd = ReflexDedect(sect, lambda21, i2)
+    if pposs is None:
+        reflexes, stdev = rfd.find_bells(sigmin, varsig, max_peaks, sh_type)
+    else:
+        reflexes, stdev = rfd.find_bells_pp(sh_type, pposs, ())
+    return list(reflexes), stdev
+
+
 class Cryplots:
     @staticmethod
     def _calc_shape(xrd, shfunc):
@@ -0,0 +1,134 @@
+# XRCEA (C) 2026 Serhii Lysovenko
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or (at
+# your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+"""Processing of curves of a series in worker processes"""
+
+from itertools import count
+
+import numpy as np
+
+from xrcea.core.shared import owner_store, shared
+from xrcea.core.tasks import parallel_map
+
+from .reflex import background, find_sect_bells, refl_sects
+
+# calls of map_curves, they publish arrays of the same owner by own keys
+_CALLS = count()
+
+
+def bg_xy(xrd):
+    """Abscissas and intensities to find background of xrd"""
+    if xrd.x_units != "q":
+        return np.sin(xrd.theta), xrd.corr_intens
+    return xrd.qrange, xrd.y_data
+
+
+def refl_x(xrd):
+    """Abscissas of reflexes of xrd"""
+    if xrd.x_units != "q":
+        return np.sin(xrd.theta)
+    return xrd.qrange
+
+
+def assumed_positions(xrd):
+    """Positions of predefined reflexes of xrd not extinguished"""
+    apposs = []
+    for v in xrd.extra_data.get("CompCards", {}).values():
+        extinguished = set(v.get("extinguished", ()))
+        for i, r in enumerate(v.get("reflexes", ())):
+            if i not in extinguished:
+                apposs.append(r[0])
+    return xrd.lambda1 / 2.0 / np.array(apposs)
+
+
+def _row(arr, row):
+    arr = shared(arr)
+    return arr if row is None else arr[row]
+
+
+def curve_background(x, y, row, deg, sigmul, mode):
+    """Background of the curve, x and y may be shared matrices"""
+    return background(_row(x, row), _row(y, row), deg, sigmul, mode)
+
+
+def curve_reflexes(x, stripped, row, sig2, bf, pts_mi, lambda21, i2,
+                   sh_type, sigmin, varsig, max_peaks, apposs=None):
+    """
+    Reflexes of the curve found sector by sector as items of
+    "crypbells", x and stripped may be shared matrices.
+    """
+    items = []
+    for sect in refl_sects(_row(x, row), _row(stripped, row), sig2, bf):
+        if len(sect) <= pts_mi:
+            continue
+        sect = np.array(sect)
+        if apposs is None:
+            reflexes, stdev = find_sect_bells(
+                sect, lambda21, i2, sh_type, sigmin, varsig, max_peaks
+            )
+        else:
+            pposs = [i for i in apposs if sect[0, 0] <= i <= sect[-1, 0]]
+            reflexes, stdev = find_sect_bells(
+                sect, lambda21, i2, sh_type, pposs=pposs
+            )
+        items.extend(tuple(r) + (stdev,) for r in reflexes)
+    return items
+
+
+def map_curves(status, owner, function, columns, args=(), curve_args=None,
+               part=(0.0, 1.0)):
+    """
+    Call function(*arrays, row, *args, *curve_args[i]) for each curve i
+    in worker processes.  Columns are pairs of names and lists of arrays
+    of the curves, columns of arrays of equal lengths are published in
+    shared memory as matrices with rows of the curves.
+
+    :returns: List of results of the curves or None if stopped.
+    """
+    count = len(columns[0][1])
+    if curve_args is None:
+        curve_args = [()] * count
+    if not all(len(set(map(len, arrs))) == 1 for name, arrs in columns):
+        return parallel_map(
+            status,
+            function,
+            [
+                tuple(arrs[i] for name, arrs in columns)
+                + (None,)
+                + tuple(args)
+                + tuple(curve_args[i])
+                for i in range(count)
+            ],
+            part,
+        )
+    store = owner_store(owner)
+    call = next(_CALLS)
+    try:
+        handles = tuple(
+            store.publish((name, call), np.vstack(arrs))
+            for name, arrs in columns
+        )
+        return parallel_map(
+            status,
+            function,
+            [
+                handles + (i,) + tuple(args) + tuple(curve_args[i])
+                for i in range(count)
+            ],
+            part,
+        )
+    finally:
+        for name, arrs in columns:
+            store.release((name, call))
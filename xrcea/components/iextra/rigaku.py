@@ -19,7 +19,10 @@ import xml.etree.ElementTree as etree
 from os.path import basename, splitext
 from zipfile import ZipFile
 
+import numpy as np
+
 from xrcea.core.application import APPLICATION as APP
+from xrcea.core.cache import cached_reader
 from xrcea.core.idata import XrayData
 from xrcea.core.multicurve import MultiXrCurve
 
@@ -43,6 +46,7 @@ def open_rasx(fname):
         xrd.display()
 
 
+@cached_reader
 def rasx_obj(fname):
     objs = []
     with ZipFile(fname, "r") as zf:
@@ -63,16 +67,9 @@ def get_xrd(zf, num):
         .decode(encoding="utf-8-sig")
         .splitlines()
     )
-    x_data = []
-    y_data = []
-    for line in sl:
-        x, y = line.split()[:2]
-        x = float(x)
-        y = int(y)
-        x_data.append(x)
-        y_data.append(y)
-    obj["x_data"] = x_data
-    obj["y_data"] = y_data
+    pts = np.array([line.split()[:2] for line in sl if line.strip()])
+    obj["x_data"] = pts[:, 0].astype(float)
+    obj["y_data"] = pts[:, 1].astype(int)
     tree = etree.fromstring(
         zf.read(f"Data{num}/MesurementConditions{num}.xml").decode()
     )
@@ -16,7 +16,12 @@
 """ """
 
 import xml.etree.ElementTree as etree
+
+import numpy as np
+
 from xrcea.core.application import APPLICATION as APP
+from xrcea.core.cache import cached_reader
+from xrcea.core.grid import UniformGrid
 from xrcea.core.idata import XrayData
 
 
@@ -28,6 +33,7 @@ def open_xrdml(fname):
         xrd.display()
 
 
+@cached_reader
 def xrdml_obj(fname):
     obj = {"objtype": "xrd"}
 
@@ -58,7 +64,6 @@ def xrdml_obj(fname):
             obj[par] = float(wavels.find("xrd:" + tag, ns).text)
         except AttributeError:
             pass
-    x_data = []
     scan = measurement.find("xrd:scan", ns)
     dpoints = scan.find("xrd:dataPoints", ns)
     for pos in dpoints.findall("xrd:positions", ns):
@@ -67,9 +72,8 @@ def xrdml_obj(fname):
             end = float(pos.find("xrd:endPosition", ns).text)
             obj["x_units"] = "2theta"
     pts = dpoints.find("xrd:intensities", ns).text
-    y_data = list(map(int, pts.split()))
-    step = (end - start) / (len(y_data) - 1.0)
-    x_data = [start + i * step for i in range(len(y_data))]
+    y_data = np.array(pts.split(), dtype=int)
+    x_data = UniformGrid.from_range(start, end, len(y_data))
     obj["x_data"] = x_data
     obj["y_data"] = y_data
     return obj
@@ -16,26 +16,70 @@
 """
 Put the pattern over the diffractogram
 """
-from numpy import interp
 
 
-def mul_plot(xrd, pddb, card):
+import numpy as np
+from xrcea.core.shared import shared
+
+
+def _wavis(xrd):
+    return [(wavel, intens) for wavel, intens in (
+        (xrd.lambda1, 1.), (xrd.lambda2, xrd.I2), (xrd.lambda3, xrd.I3))
+        if wavel is not None and intens is not None]
+
+
+def card_pattern(xrd, pddb, card):
+    """Pattern of the card for wavelengths and range of xrd"""
+    return pddb.get_di(card, xrd.x_units, wave_lengths(xrd),
+                       (xrd.x_data.min(), xrd.x_data.max()))
+
+
+def wave_lengths(xrd):
+    """Wavelengths of xrd"""
+    return tuple(i[0] for i in _wavis(xrd))
+
+
+def wave_intensities(xrd):
+    """Relative intensities of the wavelengths of xrd"""
+    return [i[1] for i in _wavis(xrd)]
+
+
+def pattern_relevance(x_data, scattering, dis, intensities):
     """
     Multiply scattering by pattern
     """
-    units = xrd.x_units
-    xmin = xrd.x_data.min()
-    xmax = xrd.x_data.max()
-    scattering = xrd.extra_data["stripped"]
-    wavis = [(wavel, intens) for wavel, intens in (
-        (xrd.lambda1, 1.), (xrd.lambda2, xrd.I2), (xrd.lambda3, xrd.I3))
-        if wavel is not None and intens is not None]
-    wavels = tuple(i[0] for i in wavis)
-    dis = pddb.get_di(card, units, wavels, (xmin, xmax))
     ssum = 0.
     psum = 0.
-    for (x, y), (w, i) in zip(dis, wavis):
-        ys = interp(x, xrd.x_data, scattering, 0., 0.)
+    for (x, y, *_m), i in zip(dis, intensities):
+        ys = np.interp(x, x_data, scattering, 0., 0.)
         ssum += (ys * y * i).sum()
         psum += ((y * i) ** 2).sum()
     return ssum / psum
+
+
+def relevances(x_data, scattering, patterns, offsets, intensities):
+    """
+    Relevances of cards of the patterns published by
+    ObjDB.share_patterns, runs in worker processes.
+
+    :param offsets: Offsets of the cards in patterns.
+    """
+    x_data, scattering, patterns = map(
+        shared, (x_data, scattering, patterns))
+    rows = patterns[:, offsets[0]:offsets[-1]]
+    weights = rows[1] * np.asarray(intensities)[rows[2].astype(int)]
+    cards = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    ys = np.interp(rows[0], x_data, scattering, 0., 0.)
+    ssum = np.bincount(cards, ys * weights, len(offsets) - 1)
+    psum = np.bincount(cards, weights ** 2, len(offsets) - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(psum > 0., ssum / psum, -np.inf).tolist()
+
+
+def mul_plot(xrd, pddb, card):
+    """
+    Multiply scattering by pattern
+    """
+    return pattern_relevance(
+        xrd.x_data, xrd.extra_data["stripped"],
+        card_pattern(xrd, pddb, card), wave_intensities(xrd))
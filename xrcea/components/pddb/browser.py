@@ -22,9 +22,10 @@ from xrcea.core.idata import XrayData
 from xrcea.core.vi import Page, Button, print_error
 from xrcea.core.vi.value import Value
 from xrcea.core.application import APPLICATION as APP
+from xrcea.core.tasks import parallel_map, scheduler
 from .pddb import switch_number
 from .plot import plot_over
-from .analyse import mul_plot
+from .analyse import relevances, wave_intensities, wave_lengths
 
 PARAMS: Dict[str, object] = {}
 COLORS, COLORNAMES = zip(
@@ -98,16 +99,16 @@ class Browser(Page):
         nu, na, fo, pt, (snu, sna, sfo, spt), cn = row
         sna = "blue"
         cl = self.cards.get()
-        cl[cl.index(row)] = nu, na, fo, pt, (snu, sna, sfo, spt), cn
-        self.cards.update(cl)
+        self.cards.replace(
+            {cl.index(row): (nu, na, fo, pt, (snu, sna, sfo, spt), cn)}
+        )
 
     def del_the_card(self, row, _c=None):
         "Remove the card from list"
         cl = self.cards.get()
         self._marked_cards.discard(row[-1])
         self.nums.discard(row[-1])
-        cl.remove(row)
-        self.cards.update(cl)
+        self.cards.remove([cl.index(row)])
         if self._colored_cards.pop(row[-1], None) is not None:
             self._upd_clrs()
             self.plot(True)
@@ -115,7 +116,7 @@ class Browser(Page):
     def remove_deleted(self, _row, _c=None):
         "Remove deleted cards"
         cl = self.cards.get()
-        self.cards.update(i for i in cl if "D" not in i[4][0])
+        self.cards.remove(i for i, r in enumerate(cl) if "D" in r[4][0])
         self.nums = set(i[-1] for i in self.cards.get())
         self._marked_cards.intersection_update(self.nums)
         ncolored = len(self._colored_cards)
@@ -130,7 +131,9 @@ class Browser(Page):
     def remove_nonmarked(self, _row, _c=None):
         "remove non marked cards"
         cl = self.cards.get()
-        self.cards.update(i for i in cl if i[-1] in self._marked_cards)
+        self.cards.remove(
+            i for i, r in enumerate(cl) if r[-1] not in self._marked_cards
+        )
         self.nums.intersection_update(self._marked_cards)
         ncolored = len(self._colored_cards)
         for i in self.nums.symmetric_difference(
@@ -208,7 +211,7 @@ class Browser(Page):
             if c not in self.nums
         ]
         self.nums.update(r[-1] for r in ext)
-        self.cards.update(self.cards.get() + ext)
+        self.cards.insert(len(self.cards.get()), ext)
 
     def mkhtext(self, cid):
         "Make hypertext"
@@ -372,9 +375,12 @@ class Browser(Page):
         if self._cur_card not in rcards:
             rcards[self._cur_card] = "red"
         clrnms = {n: COLORNAMES[COLORS.index(v)] for n, v in rcards.items()}
-        self.cards.update(
-            (sn, n, f, clrnms.get(c, ""), (s1, s2, s3, rcards.get(c)), c)
-            for sn, n, f, d, (s1, s2, s3, s4), c in self.cards.get()
+        self.cards.replace(
+            (i, (sn, n, f, clrnms.get(c, ""), (s1, s2, s3, rcards.get(c)), c))
+            for i, (sn, n, f, d, (s1, s2, s3, s4), c) in enumerate(
+                self.cards.get()
+            )
+            if s4 != rcards.get(c) or d != clrnms.get(c, "")
         )
 
     def set_list(self, objdb):
@@ -410,11 +416,15 @@ class Browser(Page):
         self._colored_cards = colors
         self._upd_clrs()
 
+    def _order_by(self, key):
+        cl = self.cards.get()
+        self.cards.reorder(sorted(range(len(cl)), key=lambda i: key(cl[i])))
+
     def order_number(self, _row, _c=None):
-        self.cards.update(sorted(self.cards.get(), key=lambda x: x[-1]))
+        self._order_by(lambda x: x[-1])
 
     def order_name(self, _row, _c=None):
-        self.cards.update(sorted(self.cards.get(), key=lambda x: x[1]))
+        self._order_by(lambda x: x[1])
 
     def order_relevance(self, _row, _c=None):
         try:
@@ -428,24 +438,57 @@ class Browser(Page):
                 )
             )
             return
-        joined = []
+        relevance = {}
+        cards = [row[-1] for row in self.cards.get()]
+        database = self._database
 
         def progress(status):
+            status["description"] = _("Reading patterns...")
+            # the database stays in this thread, workers get the arrays
+            patterns, offsets = database.share_patterns(
+                cards,
+                xrd.x_units,
+                wave_lengths(xrd),
+                (xrd.x_data.min(), xrd.x_data.max()),
+            )
             status["description"] = _("Calculating relevance...")
-            n_items = len(self.cards.get())
-            for i, row in enumerate(self.cards.get()):
-                status["part"] = i / n_items
-                if status.get("stop"):
-                    joined.clear()
-                    break
-                cn = row[-1]
-                joined.append((mul_plot(xrd, self._database, cn), row))
+            n_items = len(cards)
+            step = max(1, -(-n_items // (scheduler().workers * 4)))
+            try:
+                results = parallel_map(
+                    status,
+                    relevances,
+                    [
+                        (
+                            xrd.share("x_data"),
+                            xrd.share("stripped"),
+                            patterns,
+                            offsets[i : i + step + 1],
+                            wave_intensities(xrd),
+                        )
+                        for i in range(0, n_items, step)
+                    ],
+                    (0.1, 1.0),
+                )
+            finally:
+                database.release_shared()
+            if results is None:
+                return
+            for cn, rel in zip(cards, (r for res in results for r in res)):
+                relevance[cn] = rel
             status["complete"] = True
 
-        self.bg_process(progress)
-        if joined:
-            joined.sort(reverse=True)
-            self.cards.update(i[1] for i in joined)
+        def order(_task):
+            if not relevance:
+                return
+            # cards added meanwhile go to the end
+            self._order_by(
+                lambda row: -relevance.get(row[-1], float("-inf"))
+            )
+
+        self.run_task(
+            progress, name=_("Order by relevance"), on_done=order
+        )
 
 
 def set_plot(plotting):
@@ -465,10 +508,9 @@ def activate(xrd):
     PARAMS["XRD"] = xrd
     PARAMS["Plot"] = xrd.UIs.get("main")
     pddb = None
-    for comp in xrd.get_container().components():
-        if comp.objtype == "opddb":
-            pddb = comp
-            break
+    for comp in xrd.get_container().components("opddb"):
+        pddb = comp
+        break
     if pddb is None:
         from .opddb import ObjDB
 
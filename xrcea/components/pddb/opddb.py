@@ -18,6 +18,8 @@
 from locale import atof
 import numpy as np
 from xrcea.core.application import APPLICATION as APP
+from xrcea.core.project import LazyComponent
+from xrcea.core.shared import owner_store
 from .pddb import Database, formula_markup, switch_number
 from .browser import PARAMS, Browser, print_error
 
@@ -68,9 +70,15 @@ class ObjDB:
 
     def get_obj(self):
         used = set()
-        for comp in self._container.components():
+        for comp in self._container.entries():
             try:
-                used.update(map(int, comp.extra_data["pddb_colors"].keys()))
+                if isinstance(comp, LazyComponent):
+                    # do not decode everything to find out used cards
+                    used.update(map(int, comp.meta.get("pddb_colors", ())))
+                else:
+                    used.update(
+                        map(int, comp.extra_data["pddb_colors"].keys())
+                    )
             except (AttributeError, KeyError, ValueError):
                 pass
         used.update(self.marked)
@@ -251,6 +259,31 @@ class ObjDB:
             return res[0]
         return res
 
+    def share_patterns(self, cids, xtype, wavel, between, key="patterns"):
+        """
+        Publish patterns of the cards in shared memory as rows of
+        positions, intensities and numbers of wavelengths.
+
+        :returns: SharedArray and offsets of the cards in it.
+        """
+        chunks = []
+        offsets = [0]
+        total = 0
+        for cid in cids:
+            dis = self.get_di(cid, xtype, tuple(wavel), between)
+            if dis and not isinstance(dis, tuple):
+                for i, (x, y, _m) in enumerate(dis):
+                    chunks.append(np.array((x, y, np.full(len(x), i))))
+                    total += len(x)
+            offsets.append(total)
+        rows = np.hstack(chunks) if chunks else np.empty((3, 0))
+        return owner_store(self).publish(key, rows), np.array(offsets)
+
+    def release_shared(self, key="patterns"):
+        """Free shared memory of the key"""
+        if getattr(self, "_shared", None) is not None:
+            self._shared.release(key)
+
     def gnuplot_lables(self, cid, xtype="q", wavel=()):
         refl = [i[2:] for i in self.reflexes(cid, True)]
         dis = self.get_di(cid, xtype, wavel)
@@ -50,10 +50,9 @@ def plot_over(pddb, xrd, cur=None):
 
 def restore_plot(xrd):
     pddb = None
-    for comp in xrd.get_container().components():
-        if comp.objtype == "opddb":
-            pddb = comp
-            break
+    for comp in xrd.get_container().components("opddb"):
+        pddb = comp
+        break
     if pddb is None:
         return
     plt = xrd.make_plot()
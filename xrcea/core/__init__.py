@@ -20,8 +20,11 @@ import locale
 import logging
 from os.path import dirname, join, isdir, pardir
 from argparse import ArgumentParser
-from .application import APPLICATION
-from .project import open_later
+from functools import partial
+from .profiler import OPTION as PROFILE_OPTION, PROFILE
+with PROFILE.phase("core modules"):
+    from .application import APPLICATION
+    from .project import open_later
 
 
 def install_gt():
@@ -47,14 +50,38 @@ def parse_args():
                         help="show debug messages")
     parser.add_argument("-c", "--console", dest="console", default=False,
                         action="store_true", help="run as command line")
+    parser.add_argument(PROFILE_OPTION, dest="profile_startup",
+                        nargs="?", const="-", metavar="FILE",
+                        help="report time of startup phases into FILE "
+                        "(JSON if it ends with .json) or stderr")
+    parser.add_argument("--export-plots", dest="export_plots",
+                        metavar="DIR",
+                        help="render plots of the project into DIR "
+                        "and exit")
+    parser.add_argument("--plot-format", dest="plot_format",
+                        default="png", choices=("png", "svg", "pdf"),
+                        help="format of exported plots")
     parser.add_argument('prjfile', help='Project file', nargs="?")
     args = parser.parse_args()
+    if args.profile_startup and args.profile_startup.endswith(".xrp"):
+        # the option took the project file, the report is not written over
+        if args.prjfile:
+            parser.error(f"{PROFILE_OPTION} can not write into a project")
+        args.prjfile = args.profile_startup
+        args.profile_startup = "-"
+    if args.export_plots and not args.prjfile:
+        parser.error("--export-plots requires the project file")
     if args.verbose:
         logging.basicConfig(level=logging.INFO)
     if args.debug:
         logging.basicConfig(level=logging.DEBUG)
+    if args.profile_startup:
+        PROFILE.output = args.profile_startup
     if args.prjfile:
         open_later(args.prjfile)
+    if args.export_plots:
+        APPLICATION.batch.append(
+            partial(_export_plots, args.export_plots, args.plot_format))
     if args.console:
         location, = [p for p, m in enumerate(APPLICATION.modules)
                      if m == ".stdio"]
@@ -63,6 +90,16 @@ def parse_args():
         locale.setlocale(locale.LC_NUMERIC, "")
 
 
+def _export_plots(directory, fmt):
+    from .project import current_project
+    from .render import export_project_plots
+
+    if current_project() is None:
+        return
+    for fname in export_project_plots(directory, fmt):
+        print(fname)
+
+
 def initialize():
     parse_args()
     APPLICATION.compman.set_active()
@@ -19,6 +19,7 @@ from importlib import import_module
 from os.path import dirname, isfile, join, normcase, realpath, splitext
 
 from .compman import CompMan
+from .profiler import PROFILE
 from .project import (
     PreventExit,
     Project,
@@ -44,17 +45,25 @@ class Application:
     def __init__(self):
         self.menu = DMenu()
         self.prj_path = None
-        self.settings = Settings()
-        self.compman = CompMan(self)
+        with PROFILE.phase("settings load"):
+            self.settings = Settings()
+        with PROFILE.phase("component discovery"):
+            self.compman = CompMan(self)
         self.runtime_data = dict()
         self.on_start = [show_project]
         self.register_treater = Project.add_treater
+        self.unregister_treater = Project.remove_treater
+        self.get_treater = Project.treater
         self.register_opener = Opener.register_opener
+        self.unregister_opener = Opener.unregister_opener
+        self.get_opener = Opener.get_opener
         self.add_object = add_object
         self.get_objects = get_objects
         self.get_name = get_name
         self.prevent_exit = PreventExit()
         self.modules = [".qt", ".stdio"]
+        # tasks run instead of an interface
+        self.batch = []
 
     @property
     def visual(self):
@@ -63,17 +72,33 @@ class Application:
 
 def start():
     global _ACTUAL_INTERFACE
-    _introduce_menu()
+    with PROFILE.phase("menu"):
+        _introduce_menu()
     APPLICATION.settings.add_default_colors({"exp_dat": "black"})
+    if APPLICATION.batch:
+        return _run_batch()
     for module in APPLICATION.modules:
         try:
-            _ACTUAL_INTERFACE = import_module(module, "xrcea.core")
+            with PROFILE.phase("interface import " + module):
+                with PROFILE.importing():
+                    _ACTUAL_INTERFACE = import_module(module, "xrcea.core")
             break
         except ImportError:
             pass
     _ACTUAL_INTERFACE.main()
 
 
+def _run_batch():
+    APPLICATION.compman.introduce()
+    PROFILE.finish()
+    for task in APPLICATION.batch:
+        task()
+    from .tasks import shutdown
+
+    shutdown()
+    APPLICATION.compman.terminate(True)
+
+
 def get_actual_interface():
     return _ACTUAL_INTERFACE
 
@@ -87,6 +112,15 @@ class Opener:
         cls._openers[ext] = how
         cls._descriptions["*" + ext] = descr
 
+    @classmethod
+    def unregister_opener(cls, ext):
+        cls._openers.pop(ext, None)
+        cls._descriptions.pop("*" + ext, None)
+
+    @classmethod
+    def get_opener(cls, ext):
+        return cls._openers.get(ext)
+
     @classmethod
     def run_dialog(cls):
         fname = APPLICATION.visual.ask_open_filename(
@@ -137,7 +171,7 @@ def _help():
 
 def _introduce_menu():
     from .idata import introduce_input
-    from .sett_dialogs import edit_components
+    from .sett_dialogs import edit_components, edit_tasks
     from .vi import gui_exit
 
     mappend = APPLICATION.menu.append_item
@@ -156,6 +190,7 @@ def _introduce_menu():
     mappend(prj_p, _("Open..."), open_project, None)
     mappend((), _opts, {}, None)
     mappend((_opts,), _("Components..."), edit_components, None, None)
+    mappend((_opts,), _("Background tasks..."), edit_tasks, None, None)
     mappend(
         (_file,), _("&Open"), Opener.run_dialog, None, None, icon_file("open")
     )
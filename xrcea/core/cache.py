@@ -0,0 +1,193 @@
+# XRCEA (C) 2026 Serhii Lysovenko
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or (at
+# your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+"""Cache of parsed input files"""
+
+import os
+from functools import wraps
+from hashlib import sha1
+from json import dumps, loads
+from os.path import getsize, isdir, join, realpath
+from shutil import rmtree
+from tempfile import mkdtemp
+
+import numpy as np
+
+from .grid import UniformGrid
+
+CACHE_VERSION = 2
+_CACHE = None
+
+
+def _pack(obj, arrays):
+    """Replace numpy arrays in obj by references to .npy files"""
+    if isinstance(obj, UniformGrid):
+        return {"__grid__": obj.to_obj()}
+    if isinstance(obj, np.ndarray):
+        name = "a%d.npy" % len(arrays)
+        arrays.append((name, obj))
+        return {"__npy__": name}
+    if isinstance(obj, dict):
+        return {k: _pack(v, arrays) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_pack(v, arrays) for v in obj]
+    return obj
+
+
+def _unpack(obj, path):
+    """Map referenced .npy files back into obj"""
+    if isinstance(obj, dict):
+        if set(obj) == {"__npy__"}:
+            return np.load(join(path, obj["__npy__"]), mmap_mode="r")
+        if set(obj) == {"__grid__"}:
+            return UniformGrid.from_obj(obj["__grid__"])
+        return {k: _unpack(v, path) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_unpack(v, path) for v in obj]
+    return obj
+
+
+class ParsedCache:
+    """
+    Stores results of file readers as memory mappable .npy files and
+    a JSON description.  Entries are keyed by the reader, path, size
+    and modification time of the file and evicted in LRU order when
+    total size exceeds the limit.
+
+    :param directory: Directory to keep the cache in.
+    :type directory: string
+    :param limit: Size limit in bytes.
+    :type limit: int
+    """
+
+    def __init__(self, directory, limit):
+        self.directory = directory
+        self.limit = limit
+
+    def key(self, fname, reader=""):
+        stat = os.stat(fname)
+        ident = "\0".join(
+            map(
+                str,
+                (
+                    CACHE_VERSION,
+                    reader,
+                    realpath(fname),
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                ),
+            )
+        )
+        return sha1(ident.encode("utf-8")).hexdigest()
+
+    def get(self, fname, reader=""):
+        """Returns cached object or None"""
+        path = join(self.directory, self.key(fname, reader))
+        try:
+            with open(join(path, "obj.json"), encoding="utf-8") as fobj:
+                obj = loads(fobj.read())
+            obj = _unpack(obj, path)
+            os.utime(join(path, "obj.json"))
+        except (OSError, ValueError):
+            return None
+        return obj
+
+    def put(self, fname, obj, reader=""):
+        """Saves obj as cached content of fname"""
+        if self.limit <= 0:
+            return
+        arrays = []
+        try:
+            text = dumps(_pack(obj, arrays))
+            key = self.key(fname, reader)
+            os.makedirs(self.directory, exist_ok=True)
+        except (TypeError, ValueError, OSError):
+            return
+        tmp = mkdtemp(".tmp", key, self.directory)
+        try:
+            for name, arr in arrays:
+                np.save(join(tmp, name), arr)
+            with open(join(tmp, "obj.json"), "w", encoding="utf-8") as fobj:
+                fobj.write(text)
+            os.replace(tmp, join(self.directory, key))
+        except OSError:
+            rmtree(tmp, True)
+            return
+        self.evict()
+
+    def entries(self):
+        """Yields (last access, size, path) of cache entries"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            path = join(self.directory, name)
+            if not isdir(path) or name.endswith(".tmp"):
+                continue
+            try:
+                atime = os.stat(join(path, "obj.json")).st_mtime
+                size = sum(getsize(join(path, i)) for i in os.listdir(path))
+            except OSError:
+                atime, size = 0.0, 0
+            yield atime, size, path
+
+    def evict(self):
+        """Removes least recently used entries exceeding the limit"""
+        entries = sorted(self.entries(), reverse=True)
+        total = 0
+        for atime, size, path in entries:
+            total += size
+            if total > self.limit:
+                rmtree(path, True)
+
+    def clear(self):
+        for atime, size, path in self.entries():
+            rmtree(path, True)
+
+
+def get_cache():
+    """Returns cache of parsed files configured in settings"""
+    global _CACHE
+    if _CACHE is None:
+        from .application import APPLICATION as APP
+
+        sett = APP.settings
+        _CACHE = ParsedCache(
+            sett.get_home("cache"), sett.get("cache_size", 256) * 2**20
+        )
+    return _CACHE
+
+
+def cached_reader(reader):
+    """Decorates a reader function fname -> parsed object so that
+    repeated reading of unchanged file returns the cached object
+    with memory mapped arrays."""
+
+    @wraps(reader)
+    def wrapper(fname):
+        cache = get_cache()
+        name = reader.__module__ + "." + reader.__qualname__
+        try:
+            obj = cache.get(fname, name)
+        except OSError:
+            return reader(fname)
+        if obj is None:
+            obj = reader(fname)
+            if obj is not None:
+                cache.put(fname, obj, name)
+        return obj
+
+    return wrapper
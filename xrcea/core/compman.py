@@ -26,13 +26,64 @@ from os.path import (
     join,
     isfile,
 )
+from threading import RLock
 from weakref import ref
 
+from .profiler import PROFILE
+
+# keys of .comp files declaring entry points of lazily loaded components
+ENTRY_KEYS = ("menu", "actions", "mactions", "plotters", "openers",
+              "objtypes", "extends")
+
+
+def _entries(desc, key):
+    """Items of `key' entry of the description separated by `;'"""
+    return [i.strip() for i in desc.get(key, "").split(";") if i.strip()]
+
+
+def _ids(desc, key):
+    return [int(i) if i.isdigit() else i for i in desc.get(key, "").split()]
+
+
+class _Deferred:
+    """Entry point of not yet imported component"""
+
+    def __init__(self, compman, desc, resolve):
+        self.compman = compman
+        self.desc = desc
+        self.resolve = resolve
+
+    def __call__(self, *args, **kwargs):
+        if self.compman.load(self.desc) is None:
+            return None
+        real = self.resolve()
+        if real is None or real is self:
+            return None
+        return real(*args, **kwargs)
+
+
+class _DeferredTreater(_Deferred):
+    """Treater of project items of not yet imported component"""
+
+    def __init__(self, compman, desc, objtype, typename):
+        from .project import Project
+
+        super().__init__(compman, desc, lambda: Project.treater(objtype))
+        self.objtype = objtype
+        self.type = typename
+
+    def __call__(self, obj):
+        real = super().__call__(obj)
+        if real is None:
+            raise KeyError(self.objtype)
+        return real
+
 
 class CompMan:
     def __init__(self, app):
         """searches and reads components descriptions files"""
         self.application = ref(app)
+        self._lock = RLock()
         pth1 = join(dirname(dirname(realpath(__file__))), "components")
         pth2 = app.settings.get_home("plugins")
         path.append(pth2)
@@ -67,6 +118,8 @@ class CompMan:
             if d_id in found_ids:
                 continue
             add_descr["keys"] = set(add_descr.get("keys", "").split())
+            add_descr["requires"] = _ids(add_descr, "requires")
+            add_descr["extends"] = _ids(add_descr, "extends")
             found_ids.add(d_id)
             descrs.append(add_descr)
         self.descriptions = sorted(descrs, key=lambda x: x["id"])
@@ -90,44 +143,164 @@ class CompMan:
             self.application().settings.set("comps_ids", id_set)
         return id_set
 
-    def introduce(self):
-        """modules loader"""
+    def introduce(self, lazy=None):
+        """modules loader
+
+        In lazy mode components declaring their entry points in .comp
+        files are imported when one of the entry points is used.
+        """
+        if lazy is None:
+            lazy = self.application().settings.get("lazy_components", True)
         any_error = False
-        for desc in self.descriptions:
-            if desc["isactive"] and "module" not in desc:
-                pth, nam = split(splitext(desc["path"])[0])
-                try:
-                    if isinstance(desc["id"], int) and desc["id"] < 1000:
-                        try:
-                            module = import_module(
-                                "." + desc["path"], "components"
-                            )
-                        except ImportError:
-                            module = import_module(
-                                "xrcea.components." + desc["path"]
-                            )
-                    else:
-                        module = import_module(desc["path"])
-                except ImportError as err:
-                    desc["isactive"] = False
-                    any_error = True
-                    print("ImportError: %s, %s" % (nam, err))
-                    continue
-                if not hasattr(module, "introduce") or module.introduce():
-                    desc["isactive"] = False
-                    any_error = True
-                    print("Error: `%s' can't be introduced" % pth)
-                    modules.pop(module.__name__)
-                    continue
-                desc["module"] = module
+        with PROFILE.phase("components"):
+            for desc in self.descriptions:
+                if desc["isactive"] and "module" not in desc:
+                    if lazy and self._defer(desc):
+                        continue
+                    any_error |= self._import(desc) is None
         if any_error:
             self.get_active()
         return any_error
 
+    def load(self, desc):
+        """Import deferred component, returns the module or None"""
+        with self._lock:
+            if "module" in desc:
+                return desc["module"]
+            if not desc.get("isactive"):
+                return None
+            for d in self.descriptions:
+                if d["id"] in desc["requires"]:
+                    self.load(d)
+            module = self._import(desc)
+            if module is None:
+                self.get_active()
+                return None
+            for d in self.descriptions:
+                if desc["id"] in d["extends"]:
+                    self.load(d)
+            return module
+
+    def _import(self, desc):
+        with PROFILE.phase("introduce " + desc["path"]):
+            return self._introduce(desc)
+
+    def _introduce(self, desc):
+        self._withdraw(desc)
+        pth, nam = split(splitext(desc["path"])[0])
+        try:
+            with PROFILE.importing():
+                module = self._import_module(desc)
+        except ImportError as err:
+            desc["isactive"] = False
+            print("ImportError: %s, %s" % (nam, err))
+            return None
+        if not hasattr(module, "introduce") or module.introduce():
+            desc["isactive"] = False
+            print("Error: `%s' can't be introduced" % pth)
+            modules.pop(module.__name__)
+            return None
+        desc["module"] = module
+        self._restore_order(desc)
+        return module
+
+    @staticmethod
+    def _import_module(desc):
+        if isinstance(desc["id"], int) and desc["id"] < 1000:
+            try:
+                return import_module("." + desc["path"], "components")
+            except ImportError:
+                return import_module("xrcea.components." + desc["path"])
+        return import_module(desc["path"])
+
+    def _defer(self, desc):
+        """Register stubs of the entry points declared in description"""
+        if "deferred" in desc:
+            return True
+        if not any(desc.get(k) for k in ENTRY_KEYS):
+            return False
+        if any("module" in d for d in self.descriptions
+               if d["id"] in desc["extends"]):
+            return False
+        from .idata import XrayData
+        from .multicurve import MultiXrCurve
+
+        app = self.application()
+        undo = desc["deferred"] = []
+        for entry in _entries(desc, "menu"):
+            mpath = tuple(_(i) for i in entry.split("/"))
+            stub = _Deferred(self, desc, lambda p=mpath: self._menu_item(p))
+            app.menu.append_item(mpath[:-1], mpath[-1], stub, None)
+            undo.append(("menu", mpath, self._menu_item(mpath, True)))
+        for key, cls in (("actions", XrayData), ("mactions", MultiXrCurve)):
+            for entry in _entries(desc, key):
+                mpath = tuple(_(i) for i in entry.split("/"))
+                cls.actions[mpath] = _Deferred(
+                    self, desc, lambda c=cls, p=mpath: c.actions.get(p))
+                undo.append(("dict", cls.actions, mpath))
+        for name in desc.get("plotters", "").split():
+            XrayData.plotters[name] = _Deferred(
+                self, desc, lambda n=name: XrayData.plotters.get(n))
+            undo.append(("dict", XrayData.plotters, name))
+        for entry in _entries(desc, "openers"):
+            ext, descr = entry.split(":", 1)
+            app.register_opener(ext, _Deferred(
+                self, desc, lambda e=ext: app.get_opener(e)), _(descr))
+            undo.append(("opener", ext))
+        for entry in _entries(desc, "objtypes"):
+            objtype, typename = entry.split(":", 1)
+            app.register_treater(
+                _DeferredTreater(self, desc, objtype, _(typename)))
+            undo.append(("treater", objtype))
+        return True
+
+    def _menu_item(self, mpath, priority=False):
+        cont = self.application().menu.get_container(mpath[:-1], {})
+        try:
+            item = cont[mpath[-1]]
+        except KeyError:
+            return None
+        return item.priority if priority else item.function
+
+    def _withdraw(self, desc):
+        """Remove stubs of deferred component"""
+        app = self.application()
+        for rec in desc.get("deferred", ()):
+            if rec[0] == "menu":
+                try:
+                    app.menu.remove_item(rec[1])
+                except KeyError:
+                    pass
+            elif rec[0] == "dict":
+                if isinstance(rec[1].get(rec[2]), _Deferred):
+                    rec[1].pop(rec[2])
+            elif rec[0] == "opener":
+                if isinstance(app.get_opener(rec[1]), _Deferred):
+                    app.unregister_opener(rec[1])
+            elif rec[0] == "treater":
+                try:
+                    treater = app.get_treater(rec[1])
+                except KeyError:
+                    continue
+                if isinstance(treater, _DeferredTreater):
+                    app.unregister_treater(rec[1])
+
+    def _restore_order(self, desc):
+        """Put menu items of introduced component in place of stubs"""
+        menu = self.application().menu
+        for rec in desc.pop("deferred", ()):
+            if rec[0] == "menu":
+                item = menu.get_container(rec[1][:-1], {}).get(rec[1][-1])
+                if item is not None and rec[2] is not None:
+                    item.priority = rec[2]
+
     def terminate(self, every=False):
         """modules unloader"""
         id_off = []
         for desc in self.descriptions:
+            if "deferred" in desc and (every or not desc["isactive"]):
+                self._withdraw(desc)
+                desc.pop("deferred")
             if "module" in desc and (every or not desc["isactive"]):
                 module = desc.pop("module")
                 if hasattr(module, "terminate"):
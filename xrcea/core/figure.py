@@ -0,0 +1,359 @@
+# XRCEA (C) 2026 Serhii Lysovenko
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or (at
+# your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+"""Draw plots on matplotlib figures"""
+
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.colors import is_color_like
+
+from .application import APPLICATION as APP
+from .vi.decimation import is_increasing, minmax_decimate, select_labels
+
+
+def _same(a, b):
+    """True if arrays a and b are the same or equal"""
+    if a is b:
+        return True
+    if a is None or b is None:
+        return False
+    return np.array_equal(a, b)
+
+
+def _y(plot):
+    return plot.get("y1", plot.get("y2"))
+
+
+def plot_keys(plots):
+    """Yields keys identifying plot entries between draws and entries"""
+    counts = {}
+    for plot in plots:
+        sig = (
+            "y2" in plot,
+            plot.get("type", "-"),
+            plot.get("color"),
+            plot.get("linestyle"),
+            plot.get("legend"),
+        )
+        counts[sig] = num = counts.get(sig, -1) + 1
+        yield sig + (num,), plot
+
+
+class PlotEntry:
+    """Artists of an item of "plots" list.
+
+    Pulses are overlays, on screen they are animated, so that they may
+    be redrawn over the saved background of the base curves.
+    """
+
+    def __init__(self, axes, plot, animated=True, decimate=True):
+        self.axes = axes
+        self.pulse = plot.get("type", "-") == "pulse"
+        self.animated = animated and self.pulse
+        self.decimate = decimate
+        self.x = self.y = self.notes = None
+        self.full = None
+        self.annotations = []
+        self._label_view = None
+        color = plot.get("color")
+        cc = APP.settings.get_color(color)
+        if cc is not None:
+            color = cc
+        if color is not None and not is_color_like(color):
+            # palette name of a component which is not loaded
+            color = None
+        self.color = color
+        extras = {}
+        ls = plot.get("linestyle")
+        if ls in ("solid", "dashed", "dashdot", "dotted"):
+            extras["linestyle"] = ls
+        try:
+            extras["label"] = plot["legend"]
+        except KeyError:
+            pass
+        if self.pulse:
+            self.artist = axes.vlines([], 0, [], color=color, **extras)
+            self.artist.set_animated(self.animated)
+        else:
+            (self.artist,) = axes.plot(
+                [], [], plot.get("type", "-"), color=color, **extras
+            )
+        self.update(plot)
+
+    def update(self, plot):
+        """Update data of the artists, returns True if data changed"""
+        x = plot["x1"]
+        y = _y(plot)
+        changed = not (_same(x, self.x) and _same(y, self.y))
+        if changed:
+            self.x = x
+            self.y = y
+            self.set_data(np.asarray(x, dtype=float), np.asarray(y))
+        notes = plot.get("annotations")
+        if changed or notes != self.notes:
+            self.notes = notes
+            self.annotate()
+            changed = True
+        return changed
+
+    def set_data(self, x, y):
+        if self.pulse:
+            segs = np.empty((len(x), 2, 2))
+            segs[:, :, 0] = x[:, np.newaxis]
+            segs[:, 0, 1] = 0.0
+            segs[:, 1, 1] = y
+            self.artist.set_segments(segs)
+        elif self.decimate and is_increasing(x):
+            self.full = (x, y)
+            self.view_changed()
+        else:
+            self.full = None
+            self.artist.set_data(x, y)
+
+    def view_changed(self):
+        """Decimate curve for visible range and width of the axes"""
+        if self.full is not None:
+            self.artist.set_data(
+                *minmax_decimate(
+                    *self.full, self.axes.get_xlim(), self.axes.bbox.width
+                )
+            )
+
+    def annotate(self):
+        self._label_view = None
+        self.layout_labels()
+
+    def layout_labels(self):
+        """Show labels which are visible and do not overlap.
+
+        Text artists are reused, the layout is recomputed only if
+        limits or size of the axes changed.
+        """
+        axes = self.axes
+        view = (axes.get_xlim(), axes.get_ylim(), tuple(axes.bbox.bounds))
+        if view == self._label_view:
+            return
+        self._label_view = view
+        shown = []
+        if self.notes:
+            num = min(len(self.x), len(self.y), len(self.notes))
+            idx = np.array(
+                [
+                    i
+                    for i in range(num)
+                    if isinstance(self.notes[i], str) and self.notes[i]
+                ],
+                dtype=int,
+            )
+            x = np.asarray(self.x, dtype=float)[:num][idx]
+            y = np.asarray(self.y, dtype=float)[:num][idx]
+            pts = axes.transData.transform(np.column_stack((x, y)))
+            fsize = rcParams["font.size"] * axes.figure.dpi / 72.0
+            # rotated by 45 degrees text spreads equally along x and y
+            sizes = fsize * (
+                1.0 + 0.43 * np.array([len(self.notes[i]) for i in idx])
+            )
+            sel = select_labels(
+                pts[:, 0], pts[:, 1], sizes, axes.bbox.extents
+            )
+            shown = [(x[i], y[i], self.notes[idx[i]]) for i in sel]
+        while len(self.annotations) < len(shown):
+            text = axes.text(0.0, 0.0, "", rotation=45, color=self.color)
+            text.set_animated(self.animated)
+            self.annotations.append(text)
+        for text, (x, y, note) in zip(self.annotations, shown):
+            text.set_position((x, y))
+            text.set_text(note)
+            text.set_visible(True)
+        for text in self.annotations[len(shown):]:
+            text.set_visible(False)
+
+    def datalim(self):
+        """Corners of whole data for autoscaling"""
+        if not self.pulse and self.full is None:
+            return None
+        if not len(self.x):
+            return None
+        x = np.asarray(self.x, dtype=float)
+        y = np.asarray(self.y, dtype=float)
+        ymin = np.nanmin(y)
+        ymax = np.nanmax(y)
+        if self.pulse:
+            ymin = min(ymin, 0.0)
+            ymax = max(ymax, 0.0)
+        return [(x.min(), ymin), (x.max(), ymax)]
+
+    def artists(self):
+        return [self.artist] + self.annotations
+
+    def remove(self):
+        for artist in self.artists():
+            artist.remove()
+
+
+class PlotFigure:
+    """
+    Draws descriptions of plots made by vi.Plot users onto matplotlib
+    figure.  Artists of plot entries are kept between draws, only
+    changed data are updated.
+
+    :param figure: The figure to draw on.
+    :type figure: matplotlib.figure.Figure
+    :param animated: Make overlays animated for blitting.
+    :type animated: bool
+    :param decimate: Decimate curves to visible pixels.
+    :type decimate: bool
+    """
+
+    def __init__(self, figure, animated=True, decimate=True):
+        self.figure = figure
+        self.animated = animated
+        self.decimate = decimate
+        self.axes1 = figure.add_subplot(111)
+        self.axes1.grid(True)
+        self.axes2 = None
+        self._layout = None
+        self._entries = {}
+
+    def setup_axes(self, dset, layout):
+        self.figure.clear()
+        self._entries.clear()
+        self._layout = layout
+        self.axes1 = self.figure.add_subplot(111)
+        self.axes1.grid(True)
+        if layout[2]:
+            self.axes2 = self.axes1.twinx()
+        else:
+            self.axes2 = None
+        if "x1label" in dset:
+            self.axes1.set_xlabel(
+                dset["x1label"], fontdict={"family": "serif"}
+            )
+        if "y1label" in dset:
+            self.axes1.set_ylabel(
+                dset["y1label"], fontdict={"family": "serif"}
+            )
+
+    def plot_axes(self):
+        return [a for a in (self.axes1, self.axes2) if a is not None]
+
+    def update_plots(self, dset):
+        """Bring artists in accordance with dset.
+
+        :returns: "full" if the whole figure has to be redrawn,
+                  "overlays" if only overlays changed or None.
+        """
+        layout = (
+            dset.get("x1label"),
+            dset.get("y1label"),
+            any("y2" in p for p in dset.get("plots", ())),
+        )
+        base_changed = layout != self._layout
+        if base_changed:
+            self.setup_axes(dset, layout)
+        plots = dict(plot_keys(dset["plots"]))
+        overlays_changed = False
+        for key in set(self._entries).difference(plots):
+            entry = self._entries.pop(key)
+            entry.remove()
+            if entry.pulse:
+                overlays_changed = True
+            else:
+                base_changed = True
+        for key, plot in plots.items():
+            entry = self._entries.get(key)
+            if entry is None:
+                axes = self.axes2 if "y2" in plot else self.axes1
+                entry = self._entries[key] = PlotEntry(
+                    axes, plot, self.animated, self.decimate
+                )
+                changed = True
+            else:
+                changed = entry.update(plot)
+            if changed:
+                if entry.pulse:
+                    overlays_changed = True
+                else:
+                    base_changed = True
+        if overlays_changed or base_changed:
+            self.update_legends()
+        if base_changed:
+            self.autoscale()
+        if self.apply_limits(plots) or base_changed:
+            # curves were decimated for limits before autoscaling
+            self.view_changed()
+            self.layout_labels()
+            return "full"
+        if overlays_changed:
+            self.layout_labels()
+            return "overlays"
+        return None
+
+    def layout_labels(self):
+        for entry in self._entries.values():
+            entry.layout_labels()
+
+    def view_changed(self, *args):
+        for entry in self._entries.values():
+            entry.view_changed()
+
+    def update_legends(self):
+        for axes in self.plot_axes():
+            if axes.get_legend() is not None:
+                axes.get_legend().remove()
+            if any(
+                key[4] is not None
+                for key, e in self._entries.items()
+                if e.axes is axes
+            ):
+                axes.legend().set_animated(self.animated)
+
+    def autoscale(self):
+        for axes in self.plot_axes():
+            axes.relim()
+            for entry in self._entries.values():
+                if entry.axes is axes:
+                    corners = entry.datalim()
+                    if corners is not None:
+                        axes.update_datalim(corners)
+            axes.autoscale_view()
+
+    def apply_limits(self, plots):
+        """Set limits given in plots, returns True if the view changed"""
+        changed = False
+        for plot in plots.values():
+            axes = self.axes2 if "y2" in plot else self.axes1
+            for lim in ("xlim", "ylim"):
+                try:
+                    val = tuple(plot[lim])
+                except KeyError:
+                    continue
+                if tuple(getattr(axes, "get_" + lim)()) != val:
+                    getattr(axes, "set_" + lim)(val)
+                    changed = True
+        return changed
+
+    def overlays(self):
+        artists = [
+            a
+            for e in self._entries.values()
+            if e.pulse
+            for a in e.artists()
+        ]
+        return artists + [
+            a.get_legend()
+            for a in self.plot_axes()
+            if a.get_legend() is not None
+        ]
@@ -0,0 +1,113 @@
+# XRCEA (C) 2026 Serhii Lysovenko
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or (at
+# your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+"""Equidistant axes"""
+
+import numpy as np
+
+
+class UniformGrid:
+    """
+    Equidistant increasing axis stored as start, step and count.
+
+    :param start: First value.
+    :type start: float
+    :param step: Positive distance between values.
+    :type step: float
+    :param count: Number of values.
+    :type count: int
+    """
+
+    __slots__ = ("start", "step", "count")
+
+    def __init__(self, start, step, count):
+        self.start = float(start)
+        self.step = float(step)
+        self.count = int(count)
+
+    @classmethod
+    def from_range(cls, start, end, count):
+        """Grid like np.linspace(start, end, count)"""
+        if count < 2:
+            # single point or empty axis has no step
+            return cls(start, 0.0, max(count, 0))
+        return cls(start, (end - start) / (count - 1.0), count)
+
+    @classmethod
+    def detect(cls, arr, rtol=1e-9):
+        """Returns grid reproducing arr within rtol * step or None"""
+        try:
+            if arr.ndim != 1 or arr.dtype.kind != "f" or len(arr) < 3:
+                return None
+        except AttributeError:
+            return None
+        self = cls.from_range(arr[0], arr[-1], len(arr))
+        if not self.step > 0.0:
+            return None
+        if np.abs(self.materialize() - arr).max() > rtol * self.step:
+            return None
+        return self
+
+    def materialize(self):
+        return self.start + np.arange(self.count) * self.step
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self.materialize()
+        if dtype is not None:
+            arr = arr.astype(dtype)
+        return arr
+
+    def __len__(self):
+        return self.count
+
+    def __eq__(self, other):
+        if not isinstance(other, UniformGrid):
+            return NotImplemented
+        return (self.start, self.step, self.count) == (
+            other.start,
+            other.step,
+            other.count,
+        )
+
+    def __repr__(self):
+        return f"UniformGrid({self.start!r}, {self.step!r}, {self.count})"
+
+    def min(self):
+        return self.start
+
+    def max(self):
+        return self.start + (self.count - 1) * self.step
+
+    def interp(self, x, fp, left=None, right=None):
+        """Same as np.interp(x, self.materialize(), fp, left, right),
+        but finds intervals by arithmetic instead of searching"""
+        if self.count < 2:
+            return np.interp(x, self.materialize(), fp, left, right)
+        fp = np.asarray(fp)
+        pos = (np.asarray(x, dtype=float) - self.start) / self.step
+        ind = np.clip(np.floor(pos).astype(int), 0, self.count - 2)
+        frac = pos - ind
+        res = fp[ind] * (1.0 - frac) + fp[ind + 1] * frac
+        res = np.where(pos < 0.0, fp[0] if left is None else left, res)
+        return np.where(
+            pos > self.count - 1, fp[-1] if right is None else right, res
+        )
+
+    def to_obj(self):
+        return {"start": self.start, "step": self.step, "count": self.count}
+
+    @classmethod
+    def from_obj(cls, obj):
+        return cls(obj["start"], obj["step"], obj["count"])
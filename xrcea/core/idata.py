@@ -15,13 +15,20 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 """Input data"""
 
+import re
+from functools import wraps
+from io import StringIO
 from json import JSONDecodeError, loads
 from os.path import basename, splitext
 from typing import Dict, Union
+from warnings import catch_warnings, simplefilter
 
 import numpy as np
 
 from .application import APPLICATION as APP
+from .cache import cached_reader
+from .grid import UniformGrid
+from .shared import owner_store
 from .vi import Plot, input_dialog
 
 
@@ -42,6 +49,41 @@ def _diff_props(xrd):
         xrd.set_description(ans)
 
 
+_DERIVED_DEPS = frozenset(
+    (
+        "x_data",
+        "y_data",
+        "x_units",
+        "lambda1",
+        "lambda2",
+        "lambda3",
+        "I2",
+        "I3",
+        "alpha1",
+        "alpha2",
+    )
+)
+
+
+def _loaded_axis(value):
+    """Loaded x axis as UniformGrid if it is equidistant"""
+    if isinstance(value, UniformGrid):
+        return value
+    value = np.asarray(value)
+    grid = UniformGrid.detect(value)
+    return value if grid is None else grid
+
+
+def _derived(calc):
+    """Read only property memoized until the data it depends on change"""
+
+    @wraps(calc)
+    def getter(self):
+        return self._memo(calc.__name__, calc)
+
+    return property(getter)
+
+
 class XrayData:
     """
     :param fname: Path to file with X-ray diffraction data.
@@ -55,6 +97,11 @@ class XrayData:
     type = _("Diffractogram")
 
     def __init__(self, obj=None):
+        self._derived = {}
+        self.derived_stats = {"hits": 0, "misses": 0}
+        self._x_grid = None
+        self._x_data = None
+        self._shared = None
         self._container = None
         self.__dict = {}
         self.extra_data = {}
@@ -81,6 +128,85 @@ class XrayData:
         elif isinstance(obj, dict):
             self.from_obj(obj)
 
+    def __setattr__(self, name, value):
+        if name in _DERIVED_DEPS:
+            self.invalidate_derived()
+        super().__setattr__(name, value)
+
+    def invalidate_derived(self):
+        """Forget memoized axes and intensities.
+
+        Called automatically when x_data, y_data, x_units, wavelengths
+        or monochromator angles are assigned, should be called
+        explicitly after in-place modification of the arrays.
+        Arrays published in shared memory are released as well.
+        """
+        try:
+            self._derived.clear()
+        except AttributeError:
+            pass
+        store = getattr(self, "_shared", None)
+        if store is not None:
+            store.clear()
+
+    @property
+    def x_data(self):
+        """Values of x axis, materialized lazily if stored as a grid"""
+        if self._x_grid is None:
+            return self._x_data
+        try:
+            return self._derived["x_data"]
+        except KeyError:
+            arr = self._derived["x_data"] = self._x_grid.materialize()
+            arr.setflags(write=False)
+            return arr
+
+    @x_data.setter
+    def x_data(self, value):
+        """Arrays are kept as they are, UniformGrid is stored as grid"""
+        if isinstance(value, UniformGrid):
+            self._x_grid = value
+            self._x_data = None
+        else:
+            self._x_grid = None
+            self._x_data = value
+
+    @property
+    def x_grid(self):
+        """UniformGrid of x axis or None if it is not equidistant"""
+        return self._x_grid
+
+    def share(self, name):
+        """
+        Publish x_data, y_data or an array of extra_data in shared memory
+        for worker processes, returns SharedArray.
+        """
+        if name in ("x_data", "y_data"):
+            array = getattr(self, name)
+        else:
+            array = self.extra_data[name]
+        return owner_store(self).publish(name, array)
+
+    def interp(self, x, fp, left=None, right=None):
+        """Interpolate fp given on x_data into x points"""
+        if self._x_grid is not None:
+            return self._x_grid.interp(x, fp, left, right)
+        return np.interp(x, self.x_data, fp, left, right)
+
+    def _memo(self, name, calc):
+        try:
+            value = self._derived[name]
+        except KeyError:
+            self.derived_stats["misses"] += 1
+            value = self._derived[name] = calc(self)
+            if isinstance(value, np.ndarray) and not any(
+                value is i for i in (self.x_data, self.y_data)
+            ):
+                value.setflags(write=False)
+        else:
+            self.derived_stats["hits"] += 1
+        return value
+
     def __eq__(self, other):
         if not isinstance(other, np.ndarray):
             return False
@@ -89,6 +215,7 @@ class XrayData:
         ).all()
 
     def set_description(self, dct, emptify=True):
+        self.invalidate_derived()
         self.__dict.clear()
         self.__dict.update(dct)
         for i in (
@@ -157,33 +284,11 @@ class XrayData:
         :param fname: Path to xrd or dat file.
         :type fname: string
         """
-        arr = []
-        odict = {}
-        fobj = open(fname, encoding="utf8")
-        with fobj:
-            for line in fobj:
-                line = line.strip()
-                if line.startswith("#"):
-                    n, p, v = (i.strip() for i in line[1:].partition(":"))
-                    if p:
-                        if n in odict:
-                            if not isinstance(odict[n], list):
-                                odict[n] = [odict[n]]
-                            odict[n].append(v)
-                        else:
-                            odict[n] = v
-                    continue
-                try:
-                    x, y = map(float, line.split()[:2])
-                    arr.append((x, y))
-                except ValueError:
-                    pass
-        if not arr:
+        parsed = read_xrd(fname)
+        if parsed is None:
             return
-        arr.sort()
-        arr = np.array(arr)
-        x = arr.transpose()[0]
-        y = arr.transpose()[1]
+        x, y, odict = parsed
+        odict = dict(odict)
         odict.setdefault("name", splitext(basename(fname))[0])
         if not {"sample", "x_units", "lambda1"}.issubset(odict):
             odict = ask_about_sample(odict)
@@ -204,7 +309,7 @@ class XrayData:
             except (TypeError, ValueError):
                 continue
             if all(i is not None for i in (x, y, dct)):
-                self.x_data = x
+                self.x_data = _loaded_axis(x)
                 self.y_data = y
                 self.set_description(dct)
                 return
@@ -212,7 +317,7 @@ class XrayData:
     def __bool__(self):
         return self.x_data is not None and self.y_data is not None
 
-    @property
+    @_derived
     def qrange(self):
         if not self:
             return None
@@ -225,7 +330,7 @@ class XrayData:
         coffee = 4.0 * np.pi / self.wavelength
         return coffee * np.sin(self.x_data * acoef)
 
-    @property
+    @_derived
     def theta(self):
         if self.x_units == "q":
             return None
@@ -235,7 +340,7 @@ class XrayData:
             acoef = np.pi / 180.0
         return np.array(self.x_data) * acoef
 
-    @property
+    @_derived
     def two_theta(self):
         acoef = 1.0
         if self.x_units == "q":
@@ -249,7 +354,7 @@ class XrayData:
     def get_y(self):
         return self.y_data
 
-    @property
+    @_derived
     def corr_intens(self):
         """correct intensity"""
         Iex = self.y_data
@@ -268,7 +373,7 @@ class XrayData:
         c2a2 = np.cos(self.alpha2 * np.pi / 90.0) ** 2
         return Iex / (c2a1 * c2a2 * np.cos(ang) ** 2 + 1.0) * (1.0 + c2a1)
 
-    @property
+    @_derived
     def wavelength(self):
         try:
             res = getattr(self, "lambda1")
@@ -393,28 +498,36 @@ class XrayData:
         """Convets X-ray data into object."""
         xrd = {"objtype": self.objtype}
         xrd.update(self.get_description())
+        if self._x_grid is not None:
+            xrd["x_grid"] = self._x_grid.to_obj()
         for i in ("x_data", "y_data"):
+            if i == "x_data" and self._x_grid is not None:
+                continue
             v = getattr(self, i, None)
             if v is not None:
-                try:
-                    xrd[i] = v.tolist()
-                except AttributeError:
+                if isinstance(v, np.ndarray):
+                    xrd[i] = v
+                else:
                     xrd[i] = list(map(float, v))
         if self.extra_data:
             e = {}
             for n, v in self.extra_data.items():
                 if not len(v):
                     continue
-                if isinstance(v, np.ndarray):
-                    e[n] = v.tolist()
-                else:
-                    e[n] = v
+                e[n] = v
             if e:
                 xrd["extras"] = e
         if self._saved_plots:
             xrd["SavedPlots"] = self._saved_plots
         return xrd
 
+    def index_meta(self):
+        """Data to be known about not decoded component of project"""
+        colors = self.extra_data.get("pddb_colors")
+        if not colors:
+            return {}
+        return {"pddb_colors": list(colors)}
+
     def from_obj(self, xrd):
         """Get X-ray data from dict"""
         assert xrd["objtype"] == self.objtype
@@ -437,11 +550,14 @@ class XrayData:
                 setattr(self, i, xrd[i])
             except KeyError:
                 pass
-        for i in ("x_data", "y_data"):
-            setattr(self, i, np.array(xrd[i]))
+        if "x_grid" in xrd:
+            self.x_data = UniformGrid.from_obj(xrd["x_grid"])
+        else:
+            self.x_data = _loaded_axis(xrd["x_data"])
+        self.y_data = np.asarray(xrd["y_data"])
         try:
             for n, v in xrd["extras"].items():
-                nda = np.array(v)
+                nda = np.asarray(v)
                 if nda.ndim > 0 and nda.dtype.kind in "if":
                     self.extra_data[n] = nda
                 else:
@@ -482,6 +598,69 @@ class XrayData:
         plt.draw(exp_data)
 
 
+_XRD_HEADER = re.compile(r"^[ \t]*#([^\n]*)$", re.MULTILINE)
+
+
+def _xrd_header(text):
+    """Collect ``#key: value`` lines, repeated keys become lists."""
+    odict = {}
+    for line in _XRD_HEADER.findall(text):
+        n, p, v = (i.strip() for i in line.partition(":"))
+        if p:
+            if n in odict:
+                if not isinstance(odict[n], list):
+                    odict[n] = [odict[n]]
+                odict[n].append(v)
+            else:
+                odict[n] = v
+    return odict
+
+
+def _xrd_points_tolerant(text):
+    """Parse points line by line skipping everything malformed."""
+    arr = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("#"):
+            continue
+        try:
+            arr.append(tuple(map(float, line.split()[:2])))
+        except ValueError:
+            pass
+    return np.array([i for i in arr if len(i) == 2]).reshape(-1, 2)
+
+
+def _xrd_points(text):
+    """Parse the numeric body of xrd file into sorted (N, 2) array.
+
+    The whole body is parsed by numpy at once, the tolerant
+    line by line parser is used only if some line is malformed.
+    """
+    try:
+        with catch_warnings():
+            simplefilter("ignore", UserWarning)
+            arr = np.loadtxt(
+                StringIO(text), comments="#", usecols=(0, 1), ndmin=2
+            )
+    except ValueError:
+        arr = _xrd_points_tolerant(text)
+    if len(arr) > 1 and (np.diff(arr[:, 0]) < 0).any():
+        arr = arr[np.lexsort((arr[:, 1], arr[:, 0]))]
+    return arr
+
+
+@cached_reader
+def read_xrd(fname):
+    """Parse xrd file into x, y and header dictionary."""
+    with open(fname, encoding="utf8") as fobj:
+        text = fobj.read()
+    odict = _xrd_header(text)
+    arr = _xrd_points(text)
+    if not len(arr):
+        return
+    return arr[:, 0].copy(), arr[:, 1].copy(), odict
+
+
 def open_xrd(fname):
     """Open X-ray data file."""
     xrd = XrayData(fname)
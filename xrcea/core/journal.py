@@ -0,0 +1,213 @@
+# XRCEA (C) 2026 Serhii Lysovenko
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or (at
+# your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+"""Autosave journal of project changes"""
+
+import os
+from json import JSONDecodeError, dumps, loads
+from threading import Lock, Thread
+from time import monotonic
+
+import numpy as np
+
+# the journal is compacted when it is larger than the minimal size and
+# this times larger than after the previous compaction
+COMPACT_GROWTH = 4
+COMPACT_MIN_SIZE = 1 << 20
+
+
+def _default(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+class Journal:
+    """
+    Append-only file of component snapshots.
+
+    Changed components are remembered, and poll() called by the thread
+    changing them takes their snapshots not earlier than interval
+    seconds after the first unwritten change, so the series of changes
+    of a component is encoded once.  Only writing of the file is done
+    by a background thread.  The file is rewritten with the last
+    snapshots only when it grows too much.
+
+    :param path: Path to the journal file.
+    :type path: string
+    :param project_id: Identifier of the project the journal belongs to.
+    :type project_id: string
+    :param interval: Delay of writing in seconds.
+    :type interval: float
+    """
+
+    def __init__(self, path, project_id, interval=30.0):
+        self.path = path
+        self.project_id = project_id
+        self.interval = interval
+        self._pending = {}
+        self._order = None
+        self._unwritten = []
+        self._since = None
+        self._generation = 0
+        self._lock = Lock()
+        self._write_lock = Lock()
+        self._compacted = 0
+        self._writer = None
+
+    def put(self, uid, component):
+        """Remember the changed component uid to write its get_obj()"""
+        with self._lock:
+            self._pending[uid] = component
+            self._changed()
+
+    def set_order(self, order):
+        """Remember uids of all the project's components in order"""
+        with self._lock:
+            self._order = list(order)
+            self._changed()
+
+    def _changed(self):
+        if self._since is None:
+            self._since = monotonic()
+
+    def poll(self):
+        """Write the changes in background if it is time to do it"""
+        if self._since is None or monotonic() - self._since < self.interval:
+            return
+        lines, generation = self._snapshot()
+        if lines:
+            self._writer = Thread(
+                target=self._write, args=(lines, generation), daemon=True
+            )
+            self._writer.start()
+
+    def flush(self):
+        """Write remembered changes at once"""
+        lines, generation = self._snapshot()
+        if lines:
+            self._write(lines, generation)
+
+    def _snapshot(self):
+        """Encoded records of the changes, failed ones are kept pending"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            order, self._order = self._order, None
+            lines, self._unwritten = self._unwritten, []
+            generation = self._generation
+            self._since = None
+        failed = {}
+        for uid, component in pending.items():
+            try:
+                lines.append(
+                    dumps(
+                        {"put": uid, "obj": component.get_obj()},
+                        default=_default,
+                    )
+                )
+            except Exception:  # pylint: disable=broad-except
+                failed[uid] = component
+        if order is not None:
+            lines.append(dumps({"order": order}))
+        if failed:
+            with self._lock:
+                for uid, component in failed.items():
+                    self._pending.setdefault(uid, component)
+                self._changed()
+        return lines, generation
+
+    def _write(self, lines, generation):
+        with self._write_lock:
+            if generation != self._generation:
+                # the changes were saved meanwhile
+                return
+            try:
+                new = not os.path.isfile(self.path)
+                with open(self.path, "a", encoding="utf-8") as fobj:
+                    if new:
+                        fobj.write(
+                            dumps({"project": self.project_id}) + "\n"
+                        )
+                    fobj.write("\n".join(lines) + "\n")
+                    fobj.flush()
+                    os.fsync(fobj.fileno())
+                    size = fobj.tell()
+            except OSError:
+                with self._lock:
+                    self._unwritten[:0] = lines
+                    self._changed()
+                return
+            if size > max(COMPACT_MIN_SIZE, self._compacted * COMPACT_GROWTH):
+                try:
+                    self._compact()
+                except OSError:
+                    # appended file is still valid
+                    pass
+
+    def _compact(self):
+        """Rewrite the file keeping the last records of each component"""
+        puts = {}
+        order = None
+        for rec in self.records():
+            if "put" in rec:
+                puts.pop(rec["put"], None)
+                puts[rec["put"]] = rec
+            elif "order" in rec:
+                order = rec
+        tmp = self.path + ".part"
+        with open(tmp, "w", encoding="utf-8") as fobj:
+            fobj.write(dumps({"project": self.project_id}) + "\n")
+            for rec in puts.values():
+                fobj.write(dumps(rec) + "\n")
+            if order is not None:
+                fobj.write(dumps(order) + "\n")
+            fobj.flush()
+            os.fsync(fobj.fileno())
+            size = fobj.tell()
+        os.replace(tmp, self.path)
+        self._compacted = size
+
+    def discard(self):
+        """Forget everything, the changes are saved elsewhere"""
+        with self._lock:
+            self._pending.clear()
+            self._order = None
+            self._unwritten = []
+            self._since = None
+            self._generation += 1
+        with self._write_lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def records(self):
+        """Read written records of the journal of the same project"""
+        try:
+            with open(self.path, encoding="utf-8") as fobj:
+                lines = fobj.readlines()
+        except OSError:
+            return []
+        res = []
+        for line in lines:
+            try:
+                res.append(loads(line))
+            except JSONDecodeError:
+                break  # the last line may be cut by crash
+        if not res or res[0].get("project") != self.project_id:
+            return []
+        return res[1:]
@@ -0,0 +1,42 @@
+# XRCEA (C) 2026 Serhii Lysovenko
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or (at
+# your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+"""Postponed import of heavy modules"""
+
+from importlib import import_module
+
+# modules which console mode must not import until they are used
+HEAVY_MODULES = ("scipy", "matplotlib", "PyQt5", "PyQt6")
+
+
+def lazy_callable(module, name):
+    """Returns function calling module.name which is imported on the
+    first call, so that importing the caller stays cheap.
+
+    :param module: Full name of the module.
+    :type module: string
+    :param name: Name of callable in the module.
+    :type name: string
+    """
+    real = []
+
+    def call(*args, **kwargs):
+        if not real:
+            real.append(getattr(import_module(module), name))
+        return real[0](*args, **kwargs)
+
+    call.__name__ = call.__qualname__ = name
+    call.__doc__ = "%s.%s imported on the first call" % (module, name)
+    return call
@@ -15,6 +15,8 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 """Multiple curves"""
 
+import numpy as np
+
 from .idata import XrayData, ask_about_sample
 from .vi import Lister
 from .vi.value import Value
@@ -42,6 +44,88 @@ def _mcurve_props(mcrv):
             xrd.set_description(ans, False)
 
 
+def _psi_key(xrd):
+    return (xrd.psi is None, xrd.psi or 0.0)
+
+
+class CurveMatrix:
+    """
+    Curves sharing x axis as one matrix of intensities (curves x
+    points).  Curves keep their metadata, their y_data become views of
+    the rows and x_data is shared.  Arrays modified in place require
+    call of changed().
+    """
+
+    def __init__(self, curves):
+        first = curves[0]
+        x_axis = first.x_grid
+        if x_axis is None:
+            x_axis = first.x_data
+        self.intensities = np.vstack([c.y_data for c in curves])
+        self.psi = np.array(
+            [np.nan if c.psi is None else c.psi for c in curves]
+        )
+        self._curves = list(curves)
+        self._rows = list(self.intensities)
+        for xrd, row in zip(curves, self._rows):
+            xrd.x_data = x_axis
+            xrd.y_data = row
+
+    @property
+    def x_data(self):
+        """Shared x axis as array"""
+        return self._curves[0].x_data
+
+    @classmethod
+    def build(cls, curves):
+        """CurveMatrix or None if the curves have different x axes"""
+        if not curves or any(c.y_data is None for c in curves):
+            return None
+        first = curves[0]
+        grid = first.x_grid
+        for xrd in curves[1:]:
+            if grid is not None:
+                if xrd.x_grid != grid:
+                    return None
+            elif xrd.x_grid is not None or not np.array_equal(
+                xrd.x_data, first.x_data
+            ):
+                return None
+        if len(set(len(c.y_data) for c in curves)) > 1:
+            return None
+        return cls(curves)
+
+    def __len__(self):
+        return len(self._curves)
+
+    def curves(self):
+        return list(self._curves)
+
+    def valid(self, curves):
+        """The matrix still backs the curves"""
+        return (
+            len(curves) == len(self._curves)
+            and all(a is b for a, b in zip(curves, self._curves))
+            and all(c.y_data is r for c, r in zip(curves, self._rows))
+        )
+
+    def stack(self, name):
+        """Matrix of y_data or of the array of extra_data"""
+        if name == "y_data":
+            return self.intensities
+        return np.vstack([c.extra_data[name] for c in self._curves])
+
+    def set_rows(self, name, matrix):
+        """Put rows of the matrix into extra_data of the curves"""
+        for xrd, row in zip(self._curves, matrix):
+            xrd.extra_data[name] = row
+
+    def changed(self):
+        """Forget derived data of the curves after in-place changes"""
+        for xrd in self._curves:
+            xrd.invalidate_derived()
+
+
 class MultiXrCurve:
     actions = {(MCUR_MENU_NAME, _("Properties...")): _mcurve_props}
     objtype = "multi_xrd"
@@ -49,6 +133,7 @@ class MultiXrCurve:
 
     def __init__(self, obj=None):
         self._curves = []
+        self._matrix = None
         self._uis = {}
         if isinstance(obj, dict):
             self.from_obj(obj)
@@ -57,9 +142,22 @@ class MultiXrCurve:
         self._curves.append(xrd)
 
     def get_curves(self):
-        self._curves.sort(key=lambda x: x.psi)
+        """Curves sorted by psi, psi of a curve may be changed any time"""
+        keys = [_psi_key(c) for c in self._curves]
+        if any(a > b for a, b in zip(keys, keys[1:])):
+            self._curves.sort(key=_psi_key)
         return self._curves
 
+    def matrix(self):
+        """
+        CurveMatrix backing the curves sorted by psi, None if the curves
+        do not share x axis.
+        """
+        curves = self.get_curves()
+        if self._matrix is None or not self._matrix.valid(curves):
+            self._matrix = CurveMatrix.build(curves)
+        return self._matrix
+
     def get_obj(self):
         """Convets X-ray data into object."""
         mxrd = {"objtype": self.objtype}
@@ -71,6 +169,7 @@ class MultiXrCurve:
         """Get Multicurve from dict"""
         assert mxrd["objtype"] == self.objtype
         self._curves = [XrayData(obj) for obj in mxrd["xrds"]]
+        self._matrix = None
         self.name = mxrd.get("name", "Undefined")
         return self
 
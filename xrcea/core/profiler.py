@@ -0,0 +1,132 @@
+# XRCEA (C) 2026 Serhii Lysovenko
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or (at
+# your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+"""Profiler of startup phases"""
+
+import builtins
+import sys
+from contextlib import contextmanager
+from json import dumps
+from time import perf_counter
+
+OPTION = "--profile-startup"
+
+
+class StartupProfile:
+    """
+    Wall-clock and import time of startup phases.
+
+    Settings and components are found while the application module is
+    imported, before arguments are parsed, so the profiler is enabled
+    by presence of the option in sys.argv.
+
+    :param enabled: Record phases.
+    :type enabled: bool
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.output = "-"
+        self.origin = perf_counter()
+        self.phases = []
+        self.total = None
+        self._level = 0
+        self._depth = 0
+        self._import_time = 0.0
+        self._import = None
+        if enabled:
+            self._import = builtins.__import__
+            builtins.__import__ = self._timed_import
+
+    def _timed_import(self, *args, **kwargs):
+        with self.importing():
+            return self._import(*args, **kwargs)
+
+    @contextmanager
+    def importing(self):
+        """Count time of the block as import time"""
+        if self._depth:
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+            return
+        self._depth = 1
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._depth = 0
+            self._import_time += perf_counter() - start
+
+    @contextmanager
+    def phase(self, name):
+        """Record wall-clock and import time of the block"""
+        if not self.enabled or self.total is not None:
+            yield
+            return
+        rec = {"phase": name, "level": self._level}
+        self.phases.append(rec)
+        self._level += 1
+        modules = len(sys.modules)
+        imported = self._import_time
+        # the phase may run inside of an import statement
+        depth, self._depth = self._depth, 0
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._depth = depth
+            rec["start"] = start - self.origin
+            rec["wall"] = perf_counter() - start
+            rec["import"] = self._import_time - imported
+            rec["modules"] = len(sys.modules) - modules
+            self._level -= 1
+
+    def report(self):
+        """Profile as JSON serializable object"""
+        return {"total": self.total, "phases": self.phases}
+
+    def text(self):
+        lines = ["%-40s %9s %9s %9s %5s" % (
+            "phase", "start, s", "wall, s", "import, s", "mods")]
+        for rec in self.phases:
+            lines.append("%-40s %9.3f %9.3f %9.3f %5d" % (
+                "  " * rec["level"] + rec["phase"], rec["start"],
+                rec["wall"], rec["import"], rec["modules"]))
+        lines.append("%-40s %9.3f" % ("total", self.total))
+        return "\n".join(lines)
+
+    def finish(self):
+        """Stop profiling and write the report"""
+        if not self.enabled or self.total is not None:
+            return
+        self.total = perf_counter() - self.origin
+        if builtins.__import__ == self._timed_import:
+            builtins.__import__ = self._import
+        if self.output == "-":
+            print(self.text(), file=sys.stderr)
+            return
+        with open(self.output, "w", encoding="utf-8") as fobj:
+            if self.output.endswith(".json"):
+                fobj.write(dumps(self.report(), indent=1))
+            else:
+                fobj.write(self.text() + "\n")
+
+
+PROFILE = StartupProfile(
+    any(i.split("=")[0] == OPTION for i in sys.argv[1:])
+)
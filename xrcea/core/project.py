@@ -15,19 +15,36 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 """Operate with project file"""
 
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
 from json import JSONEncoder, dumps, loads
 from os.path import isfile, splitext
+from threading import Lock
 from time import time
-from zipfile import ZIP_DEFLATED, ZipFile
+from uuid import uuid4
+from weakref import WeakValueDictionary
+from zipfile import (
+    ZIP64_LIMIT,
+    ZIP_DEFLATED,
+    ZIP_STORED,
+    BadZipFile,
+    ZipFile,
+    ZipInfo,
+)
 
 import numpy as np
 
+from .journal import Journal
 from .vi import (
     Lister,
     ask_open_filename,
     ask_question,
     ask_save_filename,
     input_dialog,
+    print_error,
 )
 from .vi.value import Value
 
@@ -39,66 +56,596 @@ class NumpyEncoder(JSONEncoder):
         return super().default(obj)
 
 
+# Revision 1: arrays are JSON lists inside itemN members.
+# Revision 2: arrays of at least MIN_BINARY_SIZE numbers are stored as
+# arrays/<sha1>.npy members and referenced as {"__npy__": name}.
+FORMAT_REVISION = 2
+MIN_BINARY_SIZE = 64
+
+
+def array_codec(arr):
+    """Returns ZIP_STORED for arrays which deflate shrinks insignificantly.
+
+    :param arr: The array to be saved.
+    :type arr: numpy.ndarray
+    """
+    sample = np.ascontiguousarray(arr.ravel()[:8192]).tobytes()
+    if len(zlib.compress(sample, 1)) > 0.9 * len(sample):
+        return ZIP_STORED
+    return ZIP_DEFLATED
+
+
+def _is_binary(arr):
+    return arr.dtype.kind in "biuf" and arr.size >= MIN_BINARY_SIZE
+
+
+def _array_name(arr):
+    """Name of .npy member made of the array's content hash"""
+    digest = sha1(str((arr.dtype.str, arr.shape)).encode("ascii"))
+    digest.update(arr.view(np.uint8).data)
+    return "arrays/%s.npy" % digest.hexdigest()
+
+
+# arrays components replace instead of editing them in place, only they
+# are shared between components.  Intensities and extra data, including
+# derived ones, are edited in place by components and are loaded as own
+# writable copies: numpy arrays can not copy themselves on first write.
+# Equal arrays are still stored once in the project file.
+SHARED_KEYS = frozenset(("x_data",))
+
+
+class ArrayPool:
+    """Read-only arrays shared between components of a project.
+
+    Arrays are keyed by names of .npy members, which are content
+    hashes, so equal arrays loaded by different components are the
+    same object.  Only arrays of SHARED_KEYS are shared.
+    """
+
+    def __init__(self):
+        self._arrays = WeakValueDictionary()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._arrays)
+
+    def get(self, name, load):
+        """Shared array of the name, load() is called to make it"""
+        with self._lock:
+            arr = self._arrays.get(name)
+        if arr is None:
+            arr = load()
+            arr.setflags(write=False)
+            with self._lock:
+                arr = self._arrays.setdefault(name, arr)
+        return arr
+
+    def share(self, obj, key=None):
+        """Replace big arrays of SHARED_KEYS in obj by shared equal arrays"""
+        if isinstance(obj, np.ndarray):
+            if key not in SHARED_KEYS or not _is_binary(obj):
+                return obj
+            obj = np.ascontiguousarray(obj)
+            return self.get(_array_name(obj), lambda: obj)
+        if isinstance(obj, dict):
+            return {k: self.share(v, k) for k, v in obj.items()}
+        if isinstance(obj, list):
+            return [self.share(v) for v in obj]
+        return obj
+
+
+def _extract_arrays(obj, arrays):
+    """Replace big numeric arrays in obj by names of .npy members"""
+    if isinstance(obj, np.ndarray):
+        if not _is_binary(obj):
+            return obj
+        obj = np.ascontiguousarray(obj)
+        name = _array_name(obj)
+        arrays[name] = obj
+        return {"__npy__": name}
+    if isinstance(obj, dict):
+        return {k: _extract_arrays(v, arrays) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_extract_arrays(v, arrays) for v in obj]
+    return obj
+
+
+def _read_array(zipf, name):
+    with zipf.open(name) as fobj:
+        return np.lib.format.read_array(fobj)
+
+
+def _insert_arrays(obj, zipf, pool=None, key=None):
+    """Load .npy members referenced in obj"""
+    if isinstance(obj, dict):
+        if set(obj) == {"__npy__"}:
+            name = obj["__npy__"]
+            if pool is None or key not in SHARED_KEYS:
+                return _read_array(zipf, name)
+            return pool.get(name, lambda: _read_array(zipf, name))
+        return {
+            k: _insert_arrays(v, zipf, pool, k) for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_insert_arrays(v, zipf, pool) for v in obj]
+    return obj
+
+
+def _write_array(zipf, name, arr, codec):
+    zinfo = ZipInfo(name)
+    zinfo.compress_type = codec(arr) if callable(codec) else codec
+    with zipf.open(zinfo, "w", force_zip64=arr.nbytes > 2**30) as fobj:
+        np.lib.format.write_array(fobj, arr, allow_pickle=False)
+
+
+def _copy_member(src, info, dst, name):
+    """Copy compressed member of src zip into dst zip as name"""
+    src.fp.seek(info.header_offset)
+    header = src.fp.read(30)
+    if header[:4] != b"PK\x03\x04":
+        raise BadZipFile("Bad magic number for file header")
+    fname_len, extra_len = struct.unpack("<HH", header[26:30])
+    src.fp.seek(info.header_offset + 30 + fname_len + extra_len)
+    zinfo = ZipInfo(name, info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.external_attr = info.external_attr
+    zinfo.CRC = info.CRC
+    zinfo.compress_size = info.compress_size
+    zinfo.file_size = info.file_size
+    zinfo.header_offset = dst.fp.tell()
+    zip64 = max(info.file_size, info.compress_size) > ZIP64_LIMIT
+    dst.fp.write(zinfo.FileHeader(zip64))
+    left = info.compress_size
+    while left > 0:
+        chunk = src.fp.read(min(left, 2**24))
+        if not chunk:
+            raise BadZipFile("Truncated member %s" % info.filename)
+        dst.fp.write(chunk)
+        left -= len(chunk)
+    dst.filelist.append(zinfo)
+    dst.NameToInfo[name] = zinfo
+    dst.start_dir = dst.fp.tell()
+
+
+def _arrayize(obj):
+    """Convert numeric lists of X-ray data into arrays like from_obj does"""
+    if not isinstance(obj, dict):
+        return obj
+    if obj.get("objtype") == "xrd":
+        for i in ("x_data", "y_data"):
+            if isinstance(obj.get(i), list):
+                obj[i] = np.array(obj[i])
+        extras = obj.get("extras")
+        if isinstance(extras, dict):
+            for n, v in extras.items():
+                if isinstance(v, list):
+                    nda = np.array(v) if v else None
+                    if nda is not None and nda.dtype.kind in "if":
+                        extras[n] = nda
+    for v in obj.get("xrds", ()):
+        _arrayize(v)
+    return obj
+
+
+def _decode_member(filename, member, pool=None):
+    """Decode a project item in a worker"""
+    with ZipFile(filename, "r") as zipf:
+        return _arrayize(decode_item(zipf, member, pool))
+
+
+def decode_item(zipf, member, pool=None):
+    """Decode itemN member of project's zip file into object
+
+    :param pool: ArrayPool to take equal arrays from.
+    """
+    data = zipf.read(member)
+    obj = loads(data)
+    if b'"__npy__"' in data:
+        obj = _insert_arrays(obj, zipf, pool)
+    return obj
+
+
+class _ById:
+    """Mapping of objects compared by identity.
+
+    Components define __eq__ and are not hashable, so they are keyed by
+    id.  The mapped objects are kept alive, thus their ids can not be
+    taken by new objects.
+    """
+
+    def __init__(self):
+        self._items = {}
+
+    def __contains__(self, obj):
+        return id(obj) in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, obj):
+        return self._items[id(obj)][1]
+
+    def __setitem__(self, obj, value):
+        self._items[id(obj)] = (obj, value)
+
+    def get(self, obj, default=None):
+        try:
+            return self._items[id(obj)][1]
+        except KeyError:
+            return default
+
+    def setdefault(self, obj, value):
+        return self._items.setdefault(id(obj), (obj, value))[1]
+
+    def pop(self, obj, default=None):
+        try:
+            return self._items.pop(id(obj))[1]
+        except KeyError:
+            return default
+
+    def add(self, obj):
+        self[obj] = None
+
+    def clear(self):
+        self._items.clear()
+
+
+class LoadCancelled(Exception):
+    """Loading of the project was cancelled by user"""
+
+
+class UnsupportedFormat(ValueError):
+    """The project file was written in unknown format revision"""
+
+
+def _check_format(zipf):
+    """Raise UnsupportedFormat if revision of zipf is unknown"""
+    try:
+        revision = zipf.read("format").decode("ascii").strip()
+    except KeyError:
+        return  # revision 1 files have no format member
+    if not revision.isdigit() or not 1 <= int(revision) <= FORMAT_REVISION:
+        raise UnsupportedFormat(
+            _("Format %s of the project file %s is not supported")
+            % (revision, zipf.filename)
+        )
+
+
+class LazyComponent:
+    """Project's item which is not decoded yet.
+
+    Knows only type, name and metadata of the component from the
+    project's index, the component itself is built on first display or
+    use.
+    """
+
+    def __init__(
+        self,
+        project,
+        filename,
+        member,
+        objtype,
+        name,
+        size,
+        arrays=(),
+        meta=None,
+    ):
+        self.project = project
+        self.filename = filename
+        self.member = member
+        self.objtype = objtype
+        self.name = name
+        self.size = size
+        self.arrays = list(arrays)
+        self.meta = dict(meta or {})
+
+    @property
+    def type(self):
+        return self.project.treater(self.objtype).type
+
+    def raw(self):
+        """Encoded content of the component and its arrays"""
+        with ZipFile(self.filename, "r") as zipf:
+            return zipf.read(self.member), {
+                name: zipf.read(name) for name in self.arrays
+            }
+
+    def load(self):
+        """Decoded object of the component"""
+        with ZipFile(self.filename, "r") as zipf:
+            return decode_item(zipf, self.member, self.project.arrays)
+
+    def display(self):
+        component = self.project.materialize(self)
+        if hasattr(component, "display"):
+            component.display()
+
+
 class Project:
     __TREATERS = {}
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, lazy=True, status=None):
         self.path = filename
         self.UI = None
         self._components = []
+        self._dirty = _ById()
+        self._uids = _ById()
+        self.arrays = ArrayPool()
+        self.journal = None
         self._about = {"name": "New", "id": str(int(time()))}
         self._content_modified = None
         if filename:
-            self.read(filename)
+            self.read(filename, lazy, status)
 
     @classmethod
     def add_treater(self, treater):
         assert treater.objtype not in self.__TREATERS
         self.__TREATERS[treater.objtype] = treater
 
-    def save(self, filename):
-        with ZipFile(filename, "w", compression=ZIP_DEFLATED) as zipf:
-            for i, c in enumerate(self._components):
-                zipf.writestr(
-                    "item%d" % i, dumps(c.get_obj(), cls=NumpyEncoder)
-                )
-            zipf.writestr("about", dumps(self._about))
-            self._content_modified = False
+    @classmethod
+    def remove_treater(self, objtype):
+        self.__TREATERS.pop(objtype, None)
+
+    @classmethod
+    def treater(self, objtype):
+        return self.__TREATERS[objtype]
+
+    def save(self, filename, codec=array_codec):
+        """Save project into zip file.
+
+        The project is written into a temporary file which replaces
+        the target only when it is complete.  Undecoded and unchanged
+        components and arrays already stored in the previous project
+        file are copied without recompression, only changed components
+        are encoded.
+
+        :param filename: Path to the project file.
+        :type filename: string
+        :param codec: ZIP_STORED, ZIP_DEFLATED or a function returning
+                      one of them for an array to be written as .npy.
+        """
+        # decoded components may be changed in place silently, so only
+        # the lazy ones are copied
+        stored = [
+            c if isinstance(c, LazyComponent) else None
+            for c in self._components
+        ]
+        sources = {}
+        members = {}
+        for path in [self.path] + [
+            c.filename for c in stored if c is not None
+        ]:
+            if path in sources or not path or not isfile(path):
+                continue
+            sources[path] = src = ZipFile(path, "r")
+            for info in src.infolist():
+                if info.filename.startswith("arrays/"):
+                    members.setdefault(info.filename, (src, info))
+        tmp = filename + ".part"
+        index = []
+        try:
+            with ZipFile(tmp, "w", compression=ZIP_DEFLATED) as zipf:
+                zipf.writestr("format", str(FORMAT_REVISION))
+                written = set()
+                for i, (c, lazy) in enumerate(zip(self._components, stored)):
+                    member = "item%d" % i
+                    item_arrays = {}
+                    if lazy is not None:
+                        src = sources[lazy.filename]
+                        _copy_member(
+                            src, src.getinfo(lazy.member), zipf, member
+                        )
+                        size = lazy.size
+                        item_arrays = dict.fromkeys(lazy.arrays)
+                        meta = lazy.meta
+                    else:
+                        data = dumps(
+                            _extract_arrays(c.get_obj(), item_arrays),
+                            cls=NumpyEncoder,
+                        )
+                        zipf.writestr(member, data)
+                        size = len(data)
+                        meta = _index_meta(c)
+                    for name, arr in sorted(item_arrays.items()):
+                        if name in written:
+                            continue
+                        if name in members:
+                            _copy_member(*members[name], zipf, name)
+                        else:
+                            _write_array(zipf, name, arr, codec)
+                        written.add(name)
+                    index.append(
+                        {
+                            "item": member,
+                            "objtype": c.objtype,
+                            "name": getattr(c, "name", None),
+                            "size": size,
+                            "arrays": sorted(item_arrays),
+                            "meta": meta,
+                        }
+                    )
+                zipf.writestr("index", dumps(index))
+                zipf.writestr("about", dumps(self._about))
+        except BaseException:
             try:
-                self.UI.name = self.name()
-            except AttributeError:
+                os.remove(tmp)
+            except OSError:
                 pass
+            raise
+        finally:
+            for src in sources.values():
+                src.close()
+        os.replace(tmp, filename)
+        self.path = filename
+        self._uids.clear()
+        for rec, c in zip(index, self._components):
+            self._uids[c] = rec["item"]
+            if isinstance(c, LazyComponent):
+                c.filename = filename
+                c.member = rec["item"]
+        if self.journal is not None:
+            # the journal is compacted into the saved file
+            self.journal.discard()
+            if self.journal.path != journal_path(filename):
+                self.start_journal(self.journal.interval)
+        self._dirty.clear()
+        self._content_modified = False
+        try:
+            self.UI.name = self.name()
+        except AttributeError:
+            pass
 
-    def read(self, filename):
+    def read(self, filename, lazy=True, status=None, executor=None):
+        """Read project from zip file.
+
+        :param filename: Path to the project file.
+        :type filename: string
+        :param lazy: Postpone decoding of components if file has index.
+        :type lazy: bool
+        :param status: Status dictionary of bg_process to report
+                       progress of decoding and to check cancellation.
+        :param executor: concurrent.futures executor to decode items in,
+                         worker processes of the task scheduler are used
+                         by default.
+        """
         with ZipFile(filename, "r") as zipf:
-            for i in filter(lambda x: x.startswith("item"), zipf.namelist()):
-                obj = loads(zipf.read(i))
-                try:
-                    self.add_component(self.__TREATERS[obj["objtype"]](obj))
-                except (KeyError, TypeError):
-                    pass
+            _check_format(zipf)
+            names = zipf.namelist()
+            if lazy and "index" in names:
+                for rec in loads(zipf.read("index")):
+                    if rec.get("objtype") not in self.__TREATERS:
+                        continue
+                    lazy_c = LazyComponent(
+                        self,
+                        filename,
+                        rec["item"],
+                        rec["objtype"],
+                        rec.get("name"),
+                        rec.get("size"),
+                        rec.get("arrays", ()),
+                        rec.get("meta"),
+                    )
+                    self._uids[lazy_c] = rec["item"]
+                    self._components.append(lazy_c)
+            else:
+                self._decode_items(
+                    filename,
+                    [i for i in names if i.startswith("item")],
+                    status,
+                    executor,
+                )
             self._about.update(loads(zipf.read("about")))
         self._content_modified = False
 
+    def _decode_items(self, filename, members, status, executor):
+        """Decode members in parallel and add them in original order"""
+        if executor is None:
+            # decoding of JSON holds GIL, so it is done by processes
+            from .tasks import scheduler
+
+            submit = scheduler().submit_process
+        else:
+            submit = executor.submit
+        # threads share arrays while reading, processes can not
+        threads = isinstance(executor, ThreadPoolExecutor)
+        pool = self.arrays if threads else None
+        futures = [submit(_decode_member, filename, i, pool) for i in members]
+        try:
+            if status is not None:
+                status["description"] = _("Decoding project items...")
+            for i, future in enumerate(futures):
+                if status is not None:
+                    if status.get("stop"):
+                        raise LoadCancelled(filename)
+                    status["part"] = i / len(futures)
+                obj = future.result()
+                if not threads:
+                    obj = self.arrays.share(obj)
+                try:
+                    component = self.__TREATERS[obj["objtype"]](obj)
+                except (KeyError, TypeError):
+                    continue
+                self._uids[component] = members[i]
+                self.add_component(component)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def materialize(self, component, refresh=True):
+        """Decode component if it is still lazy
+
+        :param refresh: Update list of components in UI.
+        """
+        if not isinstance(component, LazyComponent):
+            return component
+        try:
+            pos = self._components.index(component)
+        except ValueError:
+            return None
+        try:
+            obj = component.load()
+            real = self.__TREATERS[obj["objtype"]](obj)
+        except (KeyError, TypeError):
+            self._components.pop(pos)
+            if refresh and self.UI:
+                self.UI.update_components()
+            return None
+        self._components[pos] = real
+        self._uids[real] = self._uids.pop(component, None)
+        self._dirty.add(real)
+        try:
+            real.set_container(self)
+        except AttributeError:
+            pass
+        if refresh and self.UI:
+            self.UI.update_components()
+        return real
+
     def add_component(self, component):
         if component not in self._components:
             self._components.append(component)
+            self._uids.setdefault(component, uuid4().hex)
             if self.UI:
                 self.UI.update_components()
             try:
                 component.set_container(self)
             except AttributeError:
                 pass
+            self._journal_order()
             self.element_changed(component)
 
     def remove_component(self, component):
         if component in self._components:
             self._components.remove(component)
+            self._journal_order()
+            self._uids.pop(component, None)
             if self.UI:
                 self.UI.update_components()
             self.element_changed(component)
 
-    def components(self):
+    def components(self, objtype=None):
+        """Iterate components decoding them on the way.
+
+        :param objtype: Decode and yield only components of the type.
+        :type objtype: string or None
+        """
+        decoded = False
+        try:
+            for c in list(self._components):
+                if objtype is not None and c.objtype != objtype:
+                    continue
+                if isinstance(c, LazyComponent):
+                    decoded = True
+                    c = self.materialize(c, False)
+                if c is not None:
+                    yield c
+        finally:
+            # the list is refreshed once for all decoded components
+            if decoded and self.UI:
+                self.UI.update_components()
+
+    def entries(self):
+        """Iterate components and not yet decoded LazyComponents"""
         return iter(self._components)
 
     def name(self, name=None):
@@ -109,7 +656,24 @@ class Project:
     def abouts(self):
         return self._about.items()
 
+    def _owner(self, element):
+        """Top level component containing the element"""
+        if element in self._uids:
+            return element
+        for c in self._components:
+            if any(i is element for i in getattr(c, "_curves", ())):
+                return c
+        return None
+
     def element_changed(self, element):
+        self._dirty.add(element)
+        owner = self._owner(element)
+        if owner is not None:
+            self._dirty.add(owner)
+            if self.journal is not None and not isinstance(
+                owner, LazyComponent
+            ):
+                self.journal.put(self._uids[owner], owner)
         self._content_modified = True
         try:
             self.UI.modified()
@@ -119,6 +683,92 @@ class Project:
     def is_modified(self):
         return self._content_modified
 
+    def is_dirty(self, component):
+        """True if the component was changed or decoded since saving"""
+        return component in self._dirty
+
+    def _journal_order(self):
+        if self.journal is not None:
+            self.journal.set_order(
+                [self._uids[c] for c in self._components]
+            )
+
+    def start_journal(self, interval=30.0):
+        """Start writing changes into the journal next to project file"""
+        from .tasks import scheduler
+
+        self.stop_journal()
+        self.journal = Journal(
+            journal_path(self.path), self._about["id"], interval
+        )
+        # changes are collected in the thread of interface
+        scheduler().add_poller(self.journal.poll)
+
+    def stop_journal(self):
+        """Write remembered changes and stop the journal"""
+        from .tasks import scheduler
+
+        if self.journal is not None:
+            scheduler().remove_poller(self.journal.poll)
+            self.journal.flush()
+            self.journal = None
+
+    def recoverable(self):
+        """True if journal of the project keeps unsaved changes"""
+        return bool(
+            self.path
+            and Journal(journal_path(self.path), self._about["id"]).records()
+        )
+
+    def recover(self):
+        """Apply changes written into journal after the last saving"""
+        current = {self._uids[c]: c for c in self._components}
+        order = list(current)
+        objs = {}
+        for rec in Journal(
+            journal_path(self.path), self._about["id"]
+        ).records():
+            if "put" in rec:
+                objs[rec["put"]] = rec["obj"]
+            elif "order" in rec:
+                order = rec["order"]
+        components = []
+        for uid in order:
+            if uid in objs:
+                try:
+                    obj = self.arrays.share(_arrayize(objs[uid]))
+                    c = self.__TREATERS[obj["objtype"]](obj)
+                except (KeyError, TypeError):
+                    continue
+                self._uids[c] = uid
+                self._dirty.add(c)
+                try:
+                    c.set_container(self)
+                except AttributeError:
+                    pass
+            elif uid in current:
+                c = current[uid]
+            else:
+                continue
+            components.append(c)
+        self._components = components
+        self._content_modified = True
+        if self.UI:
+            self.UI.update_components()
+
+
+def _index_meta(component):
+    """Small data of the component kept in the project's index"""
+    index_meta = getattr(component, "index_meta", None)
+    if index_meta is None:
+        return {}
+    return index_meta()
+
+
+def journal_path(filename):
+    """Path to the autosave journal of the project file"""
+    return filename + ".journal"
+
 
 class vi_Project(Lister):
     def __init__(self, project):
@@ -127,7 +777,7 @@ class vi_Project(Lister):
         abouts.update([i + (None,) for i in project.abouts()])
         self.components = components = Value(list)
         components.update(
-            [(c.type, c.name, None, c) for c in project.components()]
+            [(c.type, c.name, None, c) for c in project.entries()]
         )
         styles = {}
         self.__currently_alive = None
@@ -170,8 +820,9 @@ class vi_Project(Lister):
         self.project.remove_component(component)
 
     def update_components(self):
-        self.components.update(
-            [(c.type, c.name, None, c) for c in self.project.components()]
+        self.components.sync(
+            [(c.type, c.name, None, c) for c in self.project.entries()],
+            lambda row: id(row[-1]),
         )
 
     def update(self):
@@ -226,6 +877,8 @@ def save_project_as():
             fname += ".xrp"
         _CURRENT_PROJECT.save(fname)
         _CURRENT_FILE = fname
+        if _CURRENT_PROJECT.journal is None:
+            _start_journal(_CURRENT_PROJECT)
 
 
 def save_project():
@@ -254,14 +907,70 @@ Do you wish to save it before opening new?"""
         )
     if fname is None:
         return
-    _CURRENT_PROJECT = Project(fname)
+    ui = getattr(previous, "UI", None)
+    if ui is None:
+        try:
+            _CURRENT_PROJECT = Project(fname)
+        except UnsupportedFormat as err:
+            print_error(_("Open XRCEA project"), str(err))
+            return
+    else:
+        loaded = []
+        errors = []
+
+        def load(status):
+            try:
+                loaded.append(Project(fname, status=status))
+            except LoadCancelled:
+                pass
+            except UnsupportedFormat as err:
+                errors.append(err)
+            finally:
+                status["complete"] = True
+
+        ui.bg_process(load)
+        if errors:
+            ui.print_error(str(errors[0]))
+        if not loaded:
+            return
+        _CURRENT_PROJECT = loaded[0]
     _CURRENT_FILE = fname
+    if _CURRENT_PROJECT.recoverable() and ask_question(
+        _("Recover project"),
+        _(
+            "The %s project was not saved after last changes.\n"
+            "Do you wish to recover the changes?"
+        )
+        % _CURRENT_PROJECT.name(),
+    ):
+        _CURRENT_PROJECT.recover()
+    _start_journal(_CURRENT_PROJECT)
+    if previous is not None:
+        previous.stop_journal()
     if getattr(previous, "UI", None):
         _CURRENT_PROJECT.UI = previous.UI
         _CURRENT_PROJECT.UI.project = _CURRENT_PROJECT
         _CURRENT_PROJECT.UI.update()
 
 
+def _start_journal(project):
+    from .application import APPLICATION as APP
+
+    interval = APP.settings.get("autosave_interval", 30)
+    if interval > 0:
+        project.start_journal(interval)
+        if not project.is_modified():
+            project.journal.discard()
+
+
+def current_project():
+    """The current project, the project file is opened if necessary"""
+    global _CURRENT_PROJECT
+    if _CURRENT_PROJECT is None and _CURRENT_FILE != "":
+        _CURRENT_PROJECT = Project(_CURRENT_FILE)
+    return _CURRENT_PROJECT
+
+
 def open_later(fname):
     global _CURRENT_FILE
     if isfile(fname):
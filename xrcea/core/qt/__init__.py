@@ -22,6 +22,7 @@ from .core import (
     copy_to_clipboard,
     register_dialog,
     gui_exit,
+    show_tasks,
 )
 from .dialog import (
     print_information,
@@ -39,6 +40,7 @@ __all__ = [
     "copy_to_clipboard",
     "register_dialog",
     "gui_exit",
+    "show_tasks",
     "print_information",
     "print_error",
     "ask_question",
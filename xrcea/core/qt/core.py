@@ -29,6 +29,13 @@ except ImportError:
     from PyQt5.QtGui import QIcon
     from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox
 from ..application import APPLICATION
+from ..profiler import PROFILE
+from ..tasks import (
+    FAILED,
+    process_events,
+    scheduler,
+    shutdown as shutdown_tasks,
+)
 from ..vi import Lister, Page, Plot, Spreadsheet
 from .idialog import MNO, MYES, DialogsMixin
 from .menu import SDIMenu
@@ -65,28 +72,56 @@ def _check_dialogs():
         dlg = _get_dialog()
 
 
+def _report_failed(kind, task):
+    """Show errors of background tasks, the task panel may be closed"""
+    if kind == FAILED:
+        from .dialog import print_error
+
+        print_error(task.name, str(task.error))
+
+
 def main():
-    app = QApplication(sys.argv)
-    app.setApplicationName("XRCEA")
-    app.setDesktopFileName("XRCEA")
-    app.setWindowIcon(QIcon.fromTheme("xrcea"))
+    with PROFILE.phase("Qt application"):
+        app = QApplication(sys.argv)
+        app.setApplicationName("XRCEA")
+        app.setDesktopFileName("XRCEA")
+        app.setWindowIcon(QIcon.fromTheme("xrcea"))
     APPLICATION.compman.introduce()
     for e in APPLICATION.on_start:
-        e()
+        with PROFILE.phase("on_start " + getattr(e, "__name__", "")):
+            e()
+    PROFILE.finish()
     outcode = 0
     if _WINDOWS:
         t_dialogs = QTimer()
         t_dialogs.start(250)
         t_dialogs.timeout.connect(_check_dialogs)
+        t_tasks = QTimer()
+        t_tasks.start(100)
+        t_tasks.timeout.connect(process_events)
+        scheduler().add_listener(_report_failed)
         try:
             outcode = app.exec()
         except AttributeError:
             outcode = app.exec_()
+    shutdown_tasks()
     APPLICATION.compman.terminate(True)
     APPLICATION.settings.save()
     sys.exit(outcode)
 
 
+_TASK_PANEL = []
+
+
+def show_tasks():
+    """Show panel of background tasks"""
+    from .progress import TaskPanel
+
+    if not _TASK_PANEL or not _TASK_PANEL[0].isVisible():
+        _TASK_PANEL[:] = [TaskPanel()]
+    _TASK_PANEL[0].show()
+
+
 def show_vi(vi_obj):
     if isinstance(vi_obj, Plot):
         from .plot import show_plot_window
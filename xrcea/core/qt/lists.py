@@ -112,11 +112,51 @@ class VisualListModel(QAbstractTableModel):
             self.setHeaderData(i, HORIZ, name)
         self.value = value
         value.set_updater(self.updater)
+        value.set_patcher(self.patcher)
         self.styles = styles
 
     def updater(self, _lst):
         self.layoutChanged.emit()
 
+    def patcher(self, operation, args, change):
+        """Apply the change of the value to the views incrementally"""
+        root = QModelIndex()
+        if operation == "insert":
+            self.beginInsertRows(root, *args)
+            change()
+            self.endInsertRows()
+        elif operation == "remove":
+            self.beginRemoveRows(root, *args)
+            change()
+            self.endRemoveRows()
+        elif operation == "replace":
+            change()
+            last = self.columnCount() - 1
+            first = start = args[0]
+            for row in args[1:] + [None]:
+                if row != start + 1:
+                    self.dataChanged.emit(
+                        self.index(first, 0), self.index(start, last)
+                    )
+                    first = row
+                start = row
+        elif operation == "reorder":
+            self.layoutAboutToBeChanged.emit()
+            change()
+            new_rows = {old: new for new, old in enumerate(args)}
+            persistent = self.persistentIndexList()
+            self.changePersistentIndexList(
+                persistent,
+                [
+                    self.index(new_rows[i.row()], i.column())
+                    for i in persistent
+                ],
+            )
+            self.layoutChanged.emit()
+        else:
+            change()
+            self.layoutChanged.emit()
+
     def headerData(self, section, orientation, role):
         if orientation == HORIZ and role == DISP:
             return self.colnames[section]
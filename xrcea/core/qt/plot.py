@@ -46,7 +46,8 @@ from matplotlib.backends.backend_qt5agg import (  # pylint: disable=E0611
     NavigationToolbar2QT as NavigationToolbar,
 )
 from matplotlib.figure import Figure
-from .core import qMainWindow, APPLICATION as APP
+from .core import qMainWindow
+from ..figure import PlotFigure
 
 try:
     EXPAND = QSizePolicy.Policy.Expanding
@@ -54,20 +55,27 @@ except AttributeError:
     EXPAND = QSizePolicy.Expanding
 
 
-class Canvas(FigureCanvas):
-    """Ultimately, this is a QWidget (as well as a FigureCanvasAgg, etc.)."""
+class Canvas(PlotFigure, FigureCanvas):
+    """Ultimately, this is a QWidget (as well as a FigureCanvasAgg, etc.).
+
+    Pulse overlays are blitted over the saved background when nothing
+    else changes.  Curves are decimated to the points visible in pixels
+    of the current view.
+    """
 
     def __init__(self, parent=None, width=5, height=4, dpi=100):
-        self.figure = fig = Figure(figsize=(width, height), dpi=dpi)
-        self.axes1 = self.figure.add_subplot(111)
-        self.axes1.grid(True)
-        self.axes2 = None
+        fig = Figure(figsize=(width, height), dpi=dpi)
+        PlotFigure.__init__(self, fig)
         self.axes1.set_xlabel(r"$s,\, \AA^{-1}$")
         self.axes1.set_ylabel("Intensity")
-        super().__init__(fig)
+        self._background = None
+        self._printing = False
+        FigureCanvas.__init__(self, fig)
         self.setParent(parent)
         super().setSizePolicy(EXPAND, EXPAND)
         super().updateGeometry()
+        self.mpl_connect("draw_event", self._on_draw)
+        self.mpl_connect("resize_event", self.view_changed)
 
     def get_limits(self):
         res = {}
@@ -79,75 +87,50 @@ class Canvas(FigureCanvas):
                 pass
         return res
 
+    def setup_axes(self, dset, layout):
+        super().setup_axes(dset, layout)
+        self._background = None
+        # twin axes share x, so zoom and pan change xlim of axes1
+        self.axes1.callbacks.connect("xlim_changed", self.view_changed)
+
     def draw(self, dset=None):
         if dset is None:
-            return super().draw()
-        self.figure.clear()
-        self.axes1 = self.figure.add_subplot(111)
-        self.axes1.grid(True)
-        if any("y2" in p for p in dset.get("plots", ())):
-            self.axes2 = self.axes1.twinx()
-        else:
-            self.axes2 = None
-        if "x1label" in dset:
-            self.axes1.set_xlabel(
-                dset["x1label"], fontdict={"family": "serif"}
-            )
-        if "y1label" in dset:
-            self.axes1.set_ylabel(
-                dset["y1label"], fontdict={"family": "serif"}
-            )
-        for plot in dset["plots"]:
-            ltype = plot.get("type", "-")
-            color = plot.get("color")
-            cc = APP.settings.get_color(color)
-            extras = {}
-            ls = plot.get("linestyle")
-            if ls in ("solid", "dashed", "dashdot", "dotted"):
-                extras["linestyle"] = ls
-            try:
-                extras["label"] = plot["legend"]
-            except KeyError:
-                pass
-            if cc is not None:
-                color = cc
-            if "y2" in plot:
-                a2p = self.axes2
-            else:
-                a2p = self.axes1
-            if ltype == "pulse":
-                a2p.vlines(
-                    plot["x1"],
-                    0,
-                    plot.get("y1", plot.get("y2")),
-                    color=color,
-                    **extras,
-                )
-            else:
-                a2p.plot(
-                    plot["x1"],
-                    plot.get("y1", plot.get("y2")),
-                    ltype,
-                    color=color,
-                    **extras,
-                )
-            if "legend" in plot:
-                a2p.legend()
-            if "annotations" in plot:
-                for i, note in enumerate(plot["annotations"]):
-                    try:
-                        x = plot["x1"][i]
-                        y = plot.get("y1", plot.get("y2", ()))[i]
-                    except IndexError:
-                        continue
-                    if isinstance(note, str):
-                        a2p.annotate(note, (x, y), rotation=45, color=color)
-            for lim in ("xlim", "ylim"):
-                try:
-                    getattr(a2p, "set_" + lim)(plot[lim])
-                except KeyError:
-                    pass
-        return super().draw()
+            self.layout_labels()
+            return FigureCanvas.draw(self)
+        changed = self.update_plots(dset)
+        if changed == "full":
+            return FigureCanvas.draw(self)
+        if changed == "overlays":
+            self._blit()
+
+    def _on_draw(self, event):
+        """Save background and draw overlays over it"""
+        if self._printing:
+            return
+        self._background = self.copy_from_bbox(self.figure.bbox)
+        for artist in self.overlays():
+            self.figure.draw_artist(artist)
+
+    def _blit(self):
+        if self._background is None:
+            return FigureCanvas.draw(self)
+        self.restore_region(self._background)
+        for artist in self.overlays():
+            self.figure.draw_artist(artist)
+        self.blit(self.figure.bbox)
+
+    def print_figure(self, *args, **kwargs):
+        """Save figure with overlays which are animated on screen"""
+        overlays = self.overlays()
+        for artist in overlays:
+            artist.set_animated(False)
+        self._printing = True
+        try:
+            return FigureCanvas.print_figure(self, *args, **kwargs)
+        finally:
+            self._printing = False
+            for artist in overlays:
+                artist.set_animated(True)
 
 
 class PlotWindow(qMainWindow):
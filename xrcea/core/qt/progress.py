@@ -20,19 +20,26 @@ try:
     from PyQt6.QtWidgets import (
         QDialog,
         QDialogButtonBox,
+        QHBoxLayout,
         QLabel,
         QProgressBar,
+        QPushButton,
         QVBoxLayout,
+        QWidget,
     )
 except ImportError:
     from PyQt5.QtCore import QTimer
     from PyQt5.QtWidgets import (
         QDialog,
         QDialogButtonBox,
+        QHBoxLayout,
         QLabel,
         QProgressBar,
+        QPushButton,
         QVBoxLayout,
+        QWidget,
     )
+from ..tasks import FAILED, FINISHED, CANCELLED, scheduler
 
 
 class Progress(QDialog):
@@ -90,3 +97,72 @@ class Progress(QDialog):
             self.timer.deleteLater()
         self._status["stop"] = True
         return super().reject()
+
+
+class _TaskRow(QWidget):
+    def __init__(self, task, parent):
+        super().__init__(parent)
+        self.task = task
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.label = QLabel()
+        self.progressBar = QProgressBar()
+        self.progressBar.setRange(0, 1000)
+        cancel = QPushButton(_("Cancel"))
+        cancel.clicked.connect(task.cancel)
+        layout.addWidget(self.label, 1)
+        layout.addWidget(self.progressBar, 1)
+        layout.addWidget(cancel)
+        self.setLayout(layout)
+        self.update_task()
+
+    def update_task(self):
+        task = self.task
+        text = task.name
+        if task.description:
+            text += ": " + task.description
+        if task.state == "queued":
+            text += " " + _("(queued)")
+        self.label.setText(text)
+        self.progressBar.setValue(int(task.part * 1000))
+
+
+class TaskPanel(QWidget):
+    """Non-modal list of running tasks"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(_("Tasks"))
+        self._rows = {}
+        self._layout = QVBoxLayout()
+        self._empty = QLabel(_("No running tasks"))
+        self._layout.addWidget(self._empty)
+        self._layout.addStretch(1)
+        self.setLayout(self._layout)
+        self.setMinimumWidth(400)
+        sched = scheduler()
+        sched.add_listener(self.on_event)
+        for task in sched.tasks():
+            self._add(task)
+
+    def _add(self, task):
+        row = self._rows[task.uid] = _TaskRow(task, self)
+        self._layout.insertWidget(self._layout.count() - 1, row)
+        self._empty.hide()
+
+    def on_event(self, kind, task):
+        row = self._rows.get(task.uid)
+        if kind in (FINISHED, FAILED, CANCELLED):
+            if row is not None:
+                self._rows.pop(task.uid).deleteLater()
+            if not self._rows:
+                self._empty.show()
+            return
+        if row is None:
+            self._add(task)
+        else:
+            row.update_task()
+
+    def closeEvent(self, event):
+        scheduler().remove_listener(self.on_event)
+        super().closeEvent(event)
@@ -135,6 +135,26 @@ class VisualTable(QTableView):
         self.choicer = None
         self.context_menu = None
         self.separate_items = False
+        self.verticalScrollBar().valueChanged.connect(self._visible_changed)
+        model.layoutChanged.connect(self._visible_changed)
+
+    def _visible_changed(self, *_args):
+        """Tell the value which rows are displayed"""
+        try:
+            set_visible = self.value.set_visible
+        except AttributeError:
+            return
+        first = self.rowAt(0)
+        if first < 0:
+            first = 0
+        last = self.rowAt(self.viewport().height() - 1)
+        if last < 0:
+            last = self.model.rowCount() - 1
+        set_visible(first, last + 1)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._visible_changed()
 
     def keyPressEvent(self, event):
         if event.key() == DEL:
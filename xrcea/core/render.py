@@ -0,0 +1,164 @@
+# XRCEA (C) 2026 Serhii Lysovenko
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or (at
+# your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+"""Render plots without GUI"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from .application import APPLICATION as APP
+
+FORMATS = ("png", "svg", "pdf")
+
+
+def _format(fname, fmt=None):
+    if fmt is None:
+        fmt = os.path.splitext(fname)[1][1:].lower() or "png"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    return fmt
+
+
+def resolve_colors(dset):
+    """Copy of dset with color names of the palette replaced by colors
+
+    Settings are read in the calling process, so that the copy may be
+    rendered in any other.
+    """
+    res = dict(dset)
+    res["plots"] = plots = []
+    for plot in dset.get("plots", ()):
+        color = APP.settings.get_color(plot.get("color"))
+        if color is not None:
+            plot = dict(plot, color=color)
+        plots.append(plot)
+    return res
+
+
+def render(dset, fname, fmt=None, size=(8.0, 6.0), dpi=100):
+    """
+    Draw the plot description dset into the file fname.
+
+    :param dset: Plot as it is made by vi.Plot users.
+    :type dset: dict
+    :param fname: Output file name.
+    :type fname: str
+    :param fmt: One of FORMATS, by default it is given by extension.
+    :type fmt: str
+    :param size: Figure size in inches.
+    :param dpi: Resolution of raster formats.
+    :type dpi: int
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from .figure import PlotFigure
+
+    fmt = _format(fname, fmt)
+    fig = Figure(figsize=size, dpi=dpi)
+    FigureCanvasAgg(fig)
+    # vector formats keep every point of curves
+    pfig = PlotFigure(fig, animated=False, decimate=fmt == "png")
+    pfig.update_plots(dset)
+    fig.savefig(fname, format=fmt, dpi=dpi)
+    return fname
+
+
+def _render_job(job):
+    try:
+        return render(*job), None
+    except Exception as err:  # pylint: disable=broad-except
+        return None, f"{job[1]}: {err}"
+
+
+def export_figures(jobs, workers=None):
+    """
+    Render jobs in separate processes.
+
+    :param jobs: Iterable of (dset, fname, fmt, size, dpi) tuples, the
+                 trailing items may be omitted.
+    :param workers: Number of processes, by default a process per CPU.
+    :returns: List of written files, failed jobs are reported by
+              print_error and skipped.
+    """
+    jobs = [
+        (resolve_colors(job[0]),) + tuple(job[1:]) for job in jobs
+    ]
+    if len(jobs) < 2 or workers == 1:
+        results = [_render_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(_render_job, jobs))
+    files = []
+    for fname, error in results:
+        if error is None:
+            files.append(fname)
+        else:
+            from .vi import print_error
+
+            print_error(_("Export plots"), error)
+    return files
+
+
+def xrd_plots(xrd):
+    """Yields names and plots of the XrayData object"""
+    yield "main", xrd.make_plot()
+    for name, abstr in sorted(xrd._saved_plots.items()):
+        try:
+            plot = xrd.abstraction2plot(abstr)
+        except RuntimeError:
+            continue
+        if plot is not None:
+            yield name, plot
+
+
+def _safe_name(name):
+    return re.sub(r"[^\w.-]+", "_", str(name)).strip("_") or "plot"
+
+
+def project_plot_jobs(directory, fmt="png"):
+    """Yields jobs of export_figures for all plots of the project"""
+    from .idata import XrayData
+    from .multicurve import MultiXrCurve
+
+    fmt = _format("", fmt)
+    used = set()
+    for obj in APP.get_objects():
+        if isinstance(obj, MultiXrCurve):
+            curves = [(obj.name, c) for c in obj.get_curves()]
+        elif isinstance(obj, XrayData):
+            curves = [(None, obj)]
+        else:
+            continue
+        for parent, xrd in curves:
+            base = _safe_name(xrd.name)
+            if parent is not None:
+                base = _safe_name(parent) + "-" + base
+            for name, plot in xrd_plots(xrd):
+                fname = base if name == "main" else (
+                    base + "-" + _safe_name(name))
+                num = 0
+                uniq = fname
+                while uniq in used:
+                    num += 1
+                    uniq = f"{fname}-{num}"
+                used.add(uniq)
+                yield plot, os.path.join(directory, uniq + "." + fmt), fmt
+
+
+def export_project_plots(directory, fmt="png", workers=None):
+    """Render all plots of the project into files of the directory"""
+    os.makedirs(directory, exist_ok=True)
+    return export_figures(project_plot_jobs(directory, fmt), workers)
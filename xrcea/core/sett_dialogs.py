@@ -31,3 +31,17 @@ def edit_components():
         APPLICATION.compman.terminate()
         if not APPLICATION.compman.introduce():
             APPLICATION.compman.get_active()
+
+
+def edit_tasks():
+    from .tasks import scheduler
+
+    dlgr = input_dialog(
+        _("Background tasks"),
+        _("Number of workers (0 means one per CPU)"),
+        [(_("Workers:"), APPLICATION.settings.get("task_workers", 0))],
+    )
+    if dlgr:
+        workers = max(0, dlgr[0])
+        APPLICATION.settings.set("task_workers", workers)
+        scheduler().set_workers(workers)
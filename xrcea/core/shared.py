@@ -0,0 +1,151 @@
+# XRCEA (C) 2026 Serhii Lysovenko
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or (at
+# your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+"""Arrays in shared memory for worker processes"""
+
+from collections import OrderedDict
+from multiprocessing.shared_memory import SharedMemory
+from weakref import finalize
+
+import numpy as np
+
+# segments attached by the process, oldest are closed first
+MAX_ATTACHED = 32
+# arrays published by this process by names of segments
+_OWNED = {}
+_ATTACHED = OrderedDict()
+
+
+class SharedArray:
+    """
+    Picklable handle of an array in shared memory.  Workers get the
+    array by get() without copying.
+    """
+
+    __slots__ = ("name", "shape", "dtype")
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype).str
+
+    def __getstate__(self):
+        return self.name, self.shape, self.dtype
+
+    def __setstate__(self, state):
+        self.name, self.shape, self.dtype = state
+
+    def __repr__(self):
+        return f"<SharedArray {self.name} {self.shape} {self.dtype}>"
+
+    def get(self):
+        """Read only view of the array"""
+        try:
+            return _OWNED[self.name]
+        except KeyError:
+            pass
+        try:
+            shm = _ATTACHED[self.name]
+            _ATTACHED.move_to_end(self.name)
+        except KeyError:
+            shm = _ATTACHED[self.name] = SharedMemory(self.name)
+            _forget_attached()
+        arr = np.ndarray(self.shape, self.dtype, shm.buf)
+        arr.setflags(write=False)
+        return arr
+
+
+def _forget_attached():
+    for name in list(_ATTACHED)[:-MAX_ATTACHED]:
+        try:
+            _ATTACHED[name].close()
+        except BufferError:
+            # views of the segment are still alive
+            continue
+        del _ATTACHED[name]
+
+
+def shared(obj):
+    """Array of obj if it is SharedArray, otherwise obj itself"""
+    if isinstance(obj, SharedArray):
+        return obj.get()
+    return obj
+
+
+class ArrayStore:
+    """
+    Arrays published in shared memory by keys.  An array is copied
+    once, it is published again if other array is given for the key.
+    Arrays modified in place should be released.
+    """
+
+    def __init__(self):
+        self._items = {}
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def publish(self, key, array):
+        """Copy the array to shared memory, returns SharedArray"""
+        try:
+            source, shm, handle = self._items[key]
+            if source is array:
+                return handle
+        except KeyError:
+            pass
+        self.release(key)
+        src = np.ascontiguousarray(array)
+        shm = SharedMemory(create=True, size=max(src.nbytes, 1))
+        arr = np.ndarray(src.shape, src.dtype, shm.buf)
+        arr[...] = src
+        arr.setflags(write=False)
+        handle = SharedArray(shm.name, src.shape, src.dtype)
+        _OWNED[shm.name] = arr
+        self._items[key] = (array, shm, handle)
+        return handle
+
+    def release(self, key):
+        """Free the shared memory of the key"""
+        try:
+            source, shm, handle = self._items.pop(key)
+        except KeyError:
+            return
+        del _OWNED[shm.name]
+        try:
+            shm.close()
+        except BufferError:
+            # views of the array are still alive, memory is freed with them
+            pass
+        shm.unlink()
+
+    def clear(self):
+        for key in list(self._items):
+            self.release(key)
+
+
+def owner_store(owner):
+    """
+    ArrayStore freed when the owner is collected or the application
+    exits.  The store is kept by the owner as _shared attribute.
+    """
+    store = getattr(owner, "_shared", None)
+    if store is None:
+        store = ArrayStore()
+        object.__setattr__(owner, "_shared", store)
+        finalize(owner, store.clear)
+    return store
@@ -17,6 +17,7 @@
 
 from cmd import Cmd
 from ..application import APPLICATION as APP, Opener
+from ..profiler import PROFILE
 from .dialog import (
     print_error, print_information, ask_question, ask_open_filename,
     ask_save_filename, input_dialog, Dialogs)
@@ -55,6 +56,65 @@ class Xrcmd(Cmd):
         """Open a file"""
         Opener.open_by_name(line)
 
+    def do_render(self, line):
+        """Render the last shown plot into a PNG, SVG or PDF file"""
+        from ..render import render
+
+        if not line:
+            print_error(_("Render"), _("File name is required"))
+            return
+        if _DRAWER.last_drawed is None:
+            print_error(_("Render"), _("Nothing was drawn"))
+            return
+        try:
+            print(render(_DRAWER.last_drawed, line.strip()))
+        except ValueError as err:
+            print_error(_("Render"), str(err))
+
+    def do_export_plots(self, line):
+        """Render all plots of the project: DIR [png|svg|pdf]"""
+        from ..render import export_project_plots
+
+        args = line.split()
+        if not 1 <= len(args) <= 2:
+            print_error(_("Export plots"), _("Usage: export_plots DIR [FMT]"))
+            return
+        try:
+            for fname in export_project_plots(*args):
+                print(fname)
+        except (ValueError, OSError) as err:
+            print_error(_("Export plots"), str(err))
+
+    def postcmd(self, stop, line):
+        from ..tasks import FAILED, process_events
+
+        for kind, task in process_events():
+            if kind == FAILED:
+                print_error(task.name, str(task.error))
+        return stop
+
+    def do_tasks(self, line):
+        """Show background tasks"""
+        from ..tasks import scheduler
+
+        for task in scheduler().tasks():
+            print(f"{task.uid:3} {task.state:9} {task.part:4.0%} "
+                  f"{task.name}: {task.description}")
+
+    def do_cancel(self, line):
+        """Cancel background task by its number"""
+        from ..tasks import scheduler
+
+        for task in scheduler().tasks():
+            if str(task.uid) == line.strip():
+                task.cancel()
+
+    def do_wait(self, line):
+        """Wait for all background tasks"""
+        from ..tasks import scheduler
+
+        scheduler().wait()
+
     def do_menu(self, line):
         if not line:
             print("\n".join(
@@ -78,8 +138,13 @@ class Xrcmd(Cmd):
 def main():
     xrcmd = Xrcmd()
     for e in APP.on_start:
-        e()
+        with PROFILE.phase("on_start " + getattr(e, "__name__", "")):
+            e()
+    PROFILE.finish()
     xrcmd.cmdloop()
+    from ..tasks import shutdown
+
+    shutdown()
 
 
 def show_vi(vi_obj):
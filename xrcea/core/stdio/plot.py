@@ -22,5 +22,9 @@ class Drawer:
         self._last_drawed = None
 
     def __call__(self, dset):
-        self._last_drawed = None
+        self._last_drawed = dset
         pprint(dset)
+
+    @property
+    def last_drawed(self):
+        return self._last_drawed
@@ -0,0 +1,453 @@
+# XRCEA (C) 2026 Serhii Lysovenko
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or (at
+# your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+"""Background tasks"""
+
+import builtins
+import multiprocessing
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait as wait_futures,
+)
+from concurrent.futures.process import BrokenProcessPool
+from itertools import count
+from queue import Empty, SimpleQueue
+from threading import Event, Lock
+
+# kinds of events
+QUEUED, STARTED, PROGRESS, FINISHED, FAILED, CANCELLED = (
+    "queued",
+    "started",
+    "progress",
+    "finished",
+    "failed",
+    "cancelled",
+)
+
+
+def _init_worker():
+    # components translate their strings while they are imported
+    builtins.__dict__.setdefault("_", str)
+
+
+def _mp_context():
+    # forked workers inherit threads and locks of GUI in unknown states
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class Cancelled(Exception):
+    """The task was cancelled"""
+
+
+class CancelToken:
+    """Cancellation request shared by a task and its owner"""
+
+    def __init__(self):
+        self._event = Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Raise Cancelled if the task was cancelled"""
+        if self._event.is_set():
+            raise Cancelled()
+
+
+class Status(dict):
+    """
+    Status dictionary of the task.  Functions written for bg_process
+    set "part" and "description" and check "stop", setting of the
+    items emits progress events, "stop" is the cancel token.
+    """
+
+    def __init__(self, task):
+        super().__init__(part=0.0, description="", complete=False)
+        self._task = task
+
+    def __setitem__(self, key, value):
+        if key == "stop":
+            if value:
+                self._task.token.cancel()
+            return
+        super().__setitem__(key, value)
+        if key in ("part", "description"):
+            self._task.progress()
+
+    def __getitem__(self, key):
+        if key == "stop":
+            return self._task.token.cancelled
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        if key == "stop":
+            return self._task.token.cancelled
+        return super().get(key, default)
+
+
+class Task:
+    """
+    Function running in background.
+
+    :param scheduler: The scheduler running the task.
+    :param function: Called as function(status, *args, **kwargs) in a
+                     thread or function(*args, **kwargs) in a process.
+    :param name: Text to display.
+    :param process: Run in a process.
+    :param on_done: Called as on_done(task) by Scheduler.process_events
+                    when the task finished without error.
+    """
+
+    def __init__(self, scheduler, function, args, kwargs, name="",
+                 process=False, on_done=None):
+        self.uid = next(scheduler.uids)
+        self.name = name
+        self.process = process
+        self.token = CancelToken()
+        self.status = Status(self)
+        self.future = None
+        self.state = QUEUED
+        self.error = None
+        self.on_done = on_done
+        self._scheduler = scheduler
+        self._function = function
+        self._args = args
+        self._kwargs = kwargs
+
+    def __repr__(self):
+        return f"<Task {self.uid} {self.name!r} {self.state}>"
+
+    @property
+    def part(self):
+        return self.status.get("part", 0.0)
+
+    @property
+    def description(self):
+        return self.status.get("description", "")
+
+    @property
+    def cancelled(self):
+        return self.token.cancelled
+
+    def cancel(self):
+        """Request cancellation, queued task will not run"""
+        self.token.cancel()
+        if self.future is not None:
+            self.future.cancel()
+
+    def done(self):
+        return self.state in (FINISHED, FAILED, CANCELLED)
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+    def progress(self):
+        self._scheduler.emit(PROGRESS, self)
+
+    def run(self):
+        """Body of the thread task"""
+        if self.token.cancelled:
+            raise Cancelled()
+        self._scheduler.emit(STARTED, self)
+        try:
+            return self._function(self.status, *self._args, **self._kwargs)
+        finally:
+            dict.__setitem__(self.status, "complete", True)
+
+    def _finished(self, future):
+        try:
+            future.result()
+        except (CancelledError, Cancelled):
+            self.state = CANCELLED
+        except Exception as err:  # pylint: disable=broad-except
+            self.state = FAILED
+            self.error = err
+        else:
+            self.state = FINISHED
+        dict.__setitem__(self.status, "complete", True)
+        self._scheduler.emit(self.state, self)
+
+
+def _dispatch(title, function, *args):
+    """Call the handler, its errors are reported with the title"""
+    try:
+        function(*args)
+    except Exception as err:  # pylint: disable=broad-except
+        from .vi import print_error
+
+        print_error(title or _("Background task"), str(err))
+
+
+class Scheduler:
+    """
+    Runs tasks in pools of threads and processes.  Tasks exceeding the
+    number of workers wait in queue.  Events of tasks are collected in
+    queue, interfaces take them by process_events in their threads.
+
+    :param workers: Number of threads and of processes, a worker per
+                    CPU by default.
+    """
+
+    def __init__(self, workers=None):
+        self.uids = count(1)
+        self.events = SimpleQueue()
+        self._tasks = {}
+        self._lock = Lock()
+        self._threads = None
+        self._processes = None
+        self._listeners = []
+        self._pollers = []
+        self.workers = None
+        self.set_workers(workers)
+
+    def set_workers(self, workers):
+        """Set number of workers, 0 or None means a worker per CPU"""
+        workers = workers or os.cpu_count() or 1
+        if workers == self.workers:
+            return
+        self.workers = workers
+        with self._lock:
+            pools = (self._threads, self._processes)
+            self._threads = self._processes = None
+        # running tasks are finished by old pools
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(False)
+
+    def process_pool(self):
+        """Pool of worker processes"""
+        return self._executor(True)
+
+    def _executor(self, process):
+        with self._lock:
+            if process:
+                if self._processes is None:
+                    self._processes = ProcessPoolExecutor(
+                        self.workers,
+                        mp_context=_mp_context(),
+                        initializer=_init_worker,
+                    )
+                return self._processes
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="xrcea-task"
+                )
+            return self._threads
+
+    def submit_process(self, function, *args, **kwargs):
+        """
+        Submit the call to the pool of worker processes, returns Future.
+        Broken pool, e.g. with a killed worker, is replaced by new one.
+        """
+        pool = self.process_pool()
+        try:
+            future = pool.submit(function, *args, **kwargs)
+        except BrokenProcessPool:
+            self._forget_processes(pool)
+            pool = self.process_pool()
+            future = pool.submit(function, *args, **kwargs)
+        future.add_done_callback(lambda f: self._check_broken(f, pool))
+        return future
+
+    def _check_broken(self, future, pool):
+        if not future.cancelled() and isinstance(
+            future.exception(), BrokenProcessPool
+        ):
+            self._forget_processes(pool)
+
+    def _forget_processes(self, pool):
+        """Next process tasks start new pool, the broken one is gone"""
+        with self._lock:
+            if self._processes is pool:
+                self._processes = None
+
+    def prepare(self, function, *args, name="", process=False,
+                on_done=None, **kwargs):
+        """Make the task without starting it"""
+        return Task(self, function, args, kwargs, name, process, on_done)
+
+    def start(self, task):
+        """Queue the prepared task"""
+        with self._lock:
+            self._tasks[task.uid] = task
+        self.emit(QUEUED, task)
+        if task.process:
+            task.state = STARTED
+            future = self.submit_process(
+                task._function, *task._args, **task._kwargs
+            )
+        else:
+            future = self._executor(False).submit(task.run)
+        task.future = future
+        future.add_done_callback(task._finished)
+        return task
+
+    def submit(self, function, *args, name="", process=False,
+               on_done=None, **kwargs):
+        """Queue the task, returns Task"""
+        return self.start(
+            self.prepare(
+                function,
+                *args,
+                name=name,
+                process=process,
+                on_done=on_done,
+                **kwargs,
+            )
+        )
+
+    def emit(self, kind, task):
+        if kind == STARTED:
+            task.state = STARTED
+        self.events.put((kind, task))
+
+    def add_listener(self, listener):
+        """listener(kind, task) is called by process_events"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def add_poller(self, poller):
+        """poller() is called by every process_events"""
+        self._pollers.append(poller)
+
+    def remove_poller(self, poller):
+        try:
+            self._pollers.remove(poller)
+        except ValueError:
+            pass
+
+    def process_events(self):
+        """Dispatch collected events in the calling thread"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except Empty:
+                break
+        for kind, task in events:
+            if kind in (FINISHED, FAILED, CANCELLED):
+                with self._lock:
+                    self._tasks.pop(task.uid, None)
+            for listener in list(self._listeners):
+                _dispatch(task.name, listener, kind, task)
+            if kind == FINISHED and task.on_done is not None:
+                _dispatch(task.name, task.on_done, task)
+        for poller in list(self._pollers):
+            _dispatch(None, poller)
+        return events
+
+    def wait(self, tasks=None, timeout=None):
+        """Wait for the tasks or for all the tasks and dispatch events"""
+        if tasks is None:
+            tasks = self.tasks()
+        for task in tasks:
+            if task.future is not None:
+                try:
+                    task.future.exception(timeout)
+                except CancelledError:
+                    pass
+        self.process_events()
+
+    def tasks(self):
+        """Tasks which are not finished"""
+        with self._lock:
+            return list(self._tasks.values())
+
+    def cancel_all(self):
+        for task in self.tasks():
+            task.cancel()
+
+    def shutdown(self, wait=True):
+        self.cancel_all()
+        for executor in (self._threads, self._processes):
+            if executor is not None:
+                executor.shutdown(wait)
+        self._threads = self._processes = None
+
+
+_SCHEDULER = None
+
+
+def scheduler():
+    """The scheduler of the application"""
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        from .application import APPLICATION as APP
+
+        _SCHEDULER = Scheduler(APP.settings.get("task_workers", 0))
+    return _SCHEDULER
+
+
+def parallel_map(status, function, args_list, part=(0.0, 1.0)):
+    """
+    Call function(*args) for each args of args_list in worker processes.
+    Intended to be called by a thread task which passes its status.
+    Arguments and results should be plain data, e.g. numpy arrays.
+
+    :param status: Status of the calling task, "part" is moved from
+                   part[0] to part[1] as results come.
+    :returns: List of results in order of args_list or None if the task
+              was stopped.
+    """
+    args_list = list(args_list)
+    start, stop = part
+    if len(args_list) < 2:
+        results = [function(*args) for args in args_list]
+        status["part"] = stop
+        return None if status.get("stop") else results
+    sched = scheduler()
+    futures = [sched.submit_process(function, *args) for args in args_list]
+    pending = set(futures)
+    while pending:
+        done, pending = wait_futures(pending, 0.1, FIRST_COMPLETED)
+        if status.get("stop"):
+            for future in pending:
+                future.cancel()
+            return None
+        status["part"] = start + (stop - start) * (
+            1.0 - len(pending) / len(futures)
+        )
+    return [future.result() for future in futures]
+
+
+def process_events():
+    """Dispatch events of the scheduler if it is running
+
+    :returns: List of dispatched pairs of kinds and tasks.
+    """
+    if _SCHEDULER is not None:
+        return _SCHEDULER.process_events()
+    return []
+
+
+def shutdown():
+    """Cancel tasks and stop the scheduler if it is running"""
+    if _SCHEDULER is not None:
+        _SCHEDULER.shutdown(False)
@@ -0,0 +1,125 @@
+# XRCEA (C) 2026 Serhii Lysovenko
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or (at
+# your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+"""Reduce plotted data to what can be seen on screen"""
+
+import numpy as np
+
+# curves shorter than POINTS_PER_PIXEL * width are not decimated
+POINTS_PER_PIXEL = 4
+
+
+def _first_in_bins(idx, bins):
+    """First indices of idx in each bin"""
+    if not len(idx):
+        return idx
+    ibins = bins[idx]
+    return idx[np.r_[True, ibins[1:] != ibins[:-1]]]
+
+
+def minmax_decimate(x, y, xlim, width):
+    """
+    Leave first, last, minimal and maximal points of the curve in each
+    horizontal pixel of the visible range, so that the line drawn
+    through them covers the same pixels as the whole curve.
+
+    :param x: Increasing abscissas.
+    :type x: numpy.ndarray
+    :param y: Ordinates.
+    :type y: numpy.ndarray
+    :param xlim: Visible range of x.
+    :type xlim: (float, float)
+    :param width: Width of the visible range in pixels.
+    :type width: int
+    :returns: Decimated x and y.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    xmin, xmax = sorted(xlim)
+    # one point beyond each edge keeps lines crossing the borders
+    start = max(np.searchsorted(x, xmin, "right") - 1, 0)
+    stop = min(np.searchsorted(x, xmax, "left") + 1, len(x))
+    width = max(int(width), 1)
+    if stop - start <= POINTS_PER_PIXEL * width or not xmax > xmin:
+        return x[start:stop], y[start:stop]
+    xv = x[start:stop]
+    yv = y[start:stop]
+    bins = ((xv - xmin) * (width / (xmax - xmin))).astype(int)
+    np.clip(bins, -1, width, out=bins)
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    ends = np.r_[starts[1:], len(xv)] - 1
+    bin_no = np.repeat(np.arange(len(starts)), ends - starts + 1)
+    mins = np.minimum.reduceat(yv, starts)
+    maxs = np.maximum.reduceat(yv, starts)
+    keep = np.concatenate(
+        (
+            starts,
+            ends,
+            _first_in_bins(np.flatnonzero(yv == mins[bin_no]), bin_no),
+            _first_in_bins(np.flatnonzero(yv == maxs[bin_no]), bin_no),
+        )
+    )
+    keep = np.unique(keep)
+    return xv[keep], yv[keep]
+
+
+def is_increasing(x):
+    """True if x can be decimated"""
+    x = np.asarray(x)
+    return x.ndim == 1 and len(x) > 1 and bool(np.all(x[1:] >= x[:-1]))
+
+
+def select_labels(px, py, sizes, bbox):
+    """
+    Choose labels inside of bbox which do not overlap, labels of higher
+    points are preferred.
+
+    :param px: Horizontal pixel coordinates of labels' anchors.
+    :type px: numpy.ndarray
+    :param py: Vertical pixel coordinates of labels' anchors.
+    :type py: numpy.ndarray
+    :param sizes: Sizes of labels' boxes in pixels.
+    :type sizes: float or numpy.ndarray
+    :param bbox: Visible region (x0, y0, x1, y1) in pixels.
+    :returns: Sorted indices of the labels to be shown.
+    """
+    px = np.asarray(px, dtype=float)
+    py = np.asarray(py, dtype=float)
+    sizes = np.broadcast_to(np.asarray(sizes, dtype=float), px.shape)
+    x0, y0, x1, y1 = bbox
+    visible = np.flatnonzero((px >= x0) & (px <= x1) & (py >= y0) & (py <= y1))
+    if not len(visible):
+        return visible
+    order = visible[np.argsort(-py[visible], kind="stable")]
+    # boxes may overlap only if they are in neighbouring cells
+    cell = max(sizes[visible].max(), 1.0)
+    grid = {}
+    chosen = []
+    for i in order:
+        cx = int(px[i] // cell)
+        cy = int(py[i] // cell)
+        clash = False
+        for key in ((cx + a, cy + b) for a in (-1, 0, 1) for b in (-1, 0, 1)):
+            for j in grid.get(key, ()):
+                size = max(sizes[i], sizes[j])
+                if abs(px[i] - px[j]) < size and abs(py[i] - py[j]) < size:
+                    clash = True
+                    break
+            if clash:
+                break
+        if not clash:
+            chosen.append(i)
+            grid.setdefault((cx, cy), []).append(i)
+    return np.sort(np.array(chosen, dtype=int))
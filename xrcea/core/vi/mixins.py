@@ -16,8 +16,6 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 
-from threading import Thread
-
 
 class DialogsMixin:
     """Dialogs, called as children of widget"""
@@ -58,12 +56,45 @@ class DialogsMixin:
             return
 
     def bg_process(self, function, *args, **kwargs):
-        status = {"part": 0, "description": "some text", "complete": False}
+        """Run function(status, *args, **kwargs) in background and wait
+        for it in modal dialog"""
+        from ..tasks import scheduler
+
+        sched = scheduler()
+        task = sched.prepare(function, *args, name=self.name, **kwargs)
+        status = task.status
         if "bg_process" in self.gui_functions:
-            t = Thread(target=function, args=(status,) + args, kwargs=kwargs)
-            t.daemon = True
-            status["start"] = t.start
+            status["start"] = lambda: sched.start(task)
         try:
             self.gui_functions["bg_process"](status)
         except KeyError:
             status["stop"] = True
+        if task.future is not None and status.get("complete"):
+            # the function has returned, dispatch events of the task;
+            # cancelled task may still run and is not waited for
+            sched.wait([task])
+
+    def run_task(self, function, *args, name=None, on_done=None,
+                 process=False, **kwargs):
+        """
+        Run function in background without waiting for it.
+
+        :param on_done: Called as on_done(task) in GUI thread when the
+                        task is finished.
+        :returns: The task, see xrcea.core.tasks.Task.
+        """
+        from ..application import get_actual_interface
+        from ..tasks import scheduler
+
+        task = scheduler().submit(
+            function,
+            *args,
+            name=self.name if name is None else name,
+            process=process,
+            on_done=on_done,
+            **kwargs,
+        )
+        show_tasks = getattr(get_actual_interface(), "show_tasks", None)
+        if show_tasks is not None:
+            show_tasks()
+        return task
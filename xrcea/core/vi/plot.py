@@ -16,12 +16,86 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 
-from copy import deepcopy
 from os.path import splitext
+import numpy as np
 from .menu import DMenu
 from .mixins import DialogsMixin
 
 
+def copy_plot(obj):
+    """Copy of plot's description sharing its arrays, which are replaced
+    rather than edited in place, so that unchanged data keep identity"""
+    if isinstance(obj, dict):
+        return {k: copy_plot(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [copy_plot(v) for v in obj]
+    return obj
+
+
+# rows formatted at once while exporting text
+EXPORT_CHUNK = 65536
+EXPORT_EXTENSIONS = (".dat", ".csv", ".npy", ".npz")
+
+
+def _write_rows(fpout, columns, fmt="%r", delimiter="\t"):
+    """Write columns as text rows by chunks of EXPORT_CHUNK
+
+    A chunk is formatted by single operation, which is faster than
+    formatting of separate rows by np.savetxt.  Values are written by
+    repr of floats, the shortest text which is read back exactly.
+    """
+    row = delimiter.join([fmt] * len(columns)) + "\n"
+    for start in range(0, len(columns[0]), EXPORT_CHUNK):
+        stop = start + EXPORT_CHUNK
+        chunk = np.column_stack([c[start:stop] for c in columns])
+        fpout.write((row * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def plot_series(plot):
+    """Yields plot entries with their x and y as float arrays"""
+    for plt in plot.get("plots", ()):
+        yarr = plt.get("y1")
+        if yarr is None:
+            yarr = plt.get("y2")
+        xarr = np.asarray(plt.get("x1"), dtype=float)
+        yarr = np.asarray(yarr, dtype=float)
+        num = min(len(xarr), len(yarr))
+        yield plt, xarr[:num], yarr[:num]
+
+
+def shared_grid(series):
+    """
+    Put series on the common x grid.
+
+    Curves are interpolated, pulses are placed at their positions only,
+    cells outside of a series are NaN.
+
+    :param series: Sequence of (plot entry, x, y) as from plot_series.
+    :returns: Matrix with x in the first column and y of series in the
+              rest.
+    """
+    if not series:
+        return np.empty((0, 1))
+    xs = [x for p, x, y in series]
+    if all(len(x) == len(xs[0]) and np.array_equal(x, xs[0]) for x in xs):
+        grid = xs[0]
+    else:
+        grid = np.unique(np.concatenate(xs))
+    res = np.full((len(grid), len(series) + 1), np.nan)
+    res[:, 0] = grid
+    for col, (plt, x, y) in enumerate(series, 1):
+        if x is grid:
+            res[:, col] = y
+        elif plt.get("type", "-") == "pulse":
+            res[np.searchsorted(grid, x), col] = y
+        elif len(x):
+            order = np.argsort(x, kind="stable")
+            res[:, col] = np.interp(
+                grid, x[order], y[order], left=np.nan, right=np.nan
+            )
+    return res
+
+
 class Plot(DialogsMixin):
     """Parent of plots in this APP"""
 
@@ -37,7 +111,9 @@ class Plot(DialogsMixin):
         self.menu = DMenu()
         self.plots = {}
         self._currently_showing = None
-        self.menu.append_item((_("Plot"),), _("Export DAT"), self.export_dat)
+        self.menu.append_item(
+            (_("Plot"),), _("Export data"), self.export_dat
+        )
         self.menu.append_item(
             (_("Plot"),), _("Show comment"), self.show_comment
         )
@@ -89,7 +165,7 @@ class Plot(DialogsMixin):
         self.plots[pl_name] = plt
 
     def get_plot(self, pl_name):
-        return deepcopy(self.plots.get(pl_name))
+        return copy_plot(self.plots.get(pl_name))
 
     def get_current(self):
         return self._currently_showing, self.get_plot(self._currently_showing)
@@ -125,42 +201,88 @@ class Plot(DialogsMixin):
 
     def _export_as_ssv(self, pl_name, fpout):
         plot = self.plots.get(pl_name)
-        if plot is None:
-            return
-        plts = plot.get("plots")
-        if plts is None:
+        if plot is None or plot.get("plots") is None:
             return
         for k in ("x1label", "y1label", "x1units"):
             v = plot.get(k)
             if v:
                 print(f"#{k}\t{v}", file=fpout)
         print("########## PLOTS ##########", file=fpout)
-        for plt in plts:
+        for plt, xarr, yarr in plot_series(plot):
             for k in ("type", "color"):
                 v = plt.get(k)
                 if v:
                     print(f"#{k}\t{v}", file=fpout)
-            xarr = plt.get("x1")
-            yarr = plt.get("y1")
-            if yarr is None:
-                yarr = plt.get("y2")
+            if plt.get("y1") is None:
                 print("#Second Y", file=fpout)
-            for x, y in zip(xarr, yarr):
-                print(x, y, sep="\t", file=fpout)
+            if len(xarr):
+                _write_rows(fpout, (xarr, yarr))
             print("\n", file=fpout)
 
+    def _export_as_csv(self, pl_name, fpout):
+        """Columns of all series on the shared x grid"""
+        plot = self.plots.get(pl_name)
+        if plot is None:
+            return
+        series = list(plot_series(plot))
+        names = [plot.get("x1label") or "x"]
+        for num, (plt, x, y) in enumerate(series):
+            names.append(plt.get("legend") or f"y{num}")
+        print(",".join(f'"{n}"' for n in names), file=fpout)
+        table = shared_grid(series)
+        if len(table):
+            _write_rows(fpout, table.T, delimiter=",")
+
+    def _export_as_npy(self, pl_name, fname):
+        """Matrix of all series on the shared x grid"""
+        plot = self.plots.get(pl_name)
+        if plot is not None:
+            np.save(fname, shared_grid(list(plot_series(plot))))
+
+    def _export_as_npz(self, pl_name, fname):
+        """Arrays of all series as they are"""
+        plot = self.plots.get(pl_name)
+        if plot is None:
+            return
+        arrays = {}
+        for k in ("x1label", "y1label", "x1units"):
+            if plot.get(k):
+                arrays[k] = np.array(plot[k])
+        for num, (plt, x, y) in enumerate(plot_series(plot)):
+            yname = "y1" if plt.get("y1") is not None else "y2"
+            arrays[f"x1_{num}"] = x
+            arrays[f"{yname}_{num}"] = y
+        np.savez(fname, **arrays)
+
+    def export_data(self, pl_name, fname):
+        """Write data of the plot, the format is given by extension"""
+        ext = splitext(fname)[1].lower()
+        if ext in (".npy", ".npz"):
+            getattr(self, "_export_as_" + ext[1:])(pl_name, fname)
+            return
+        exporter = (
+            self._export_as_csv if ext == ".csv" else self._export_as_ssv
+        )
+        with open(fname, "w", encoding="utf-8") as fpout:
+            exporter(pl_name, fpout)
+
     def export_dat(self):
         if not self._currently_showing:
             return
         fname = self.ask_save_filename(
-            self._currently_showing + ".dat", [("*.dat", _("DAT files"))]
+            self._currently_showing + ".dat",
+            [
+                ("*.dat", _("DAT files")),
+                ("*.csv", _("CSV files")),
+                ("*.npy", _("NumPy array")),
+                ("*.npz", _("NumPy archive")),
+            ],
         )
         if fname:
-            if splitext(fname)[1] != ".dat":
+            if splitext(fname)[1].lower() not in EXPORT_EXTENSIONS:
                 fname += ".dat"
             try:
-                with open(fname, "w", encoding="utf-8") as file:
-                    self._export_as_ssv(self._currently_showing, file)
+                self.export_data(self._currently_showing, fname)
             except OSError:
                 self.print_error(_("Unable to write %s") % fname)
                 return
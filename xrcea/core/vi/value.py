@@ -20,16 +20,135 @@ from locale import atof
 
 
 class Value:
+    # more contiguous runs of removed rows are applied as single update
+    MAX_REMOVE_RUNS = 8
+
     def __init__(self, vclass):
         self.vclass = vclass
         self.value = vclass()
         self.relevance = True
         self.updater = None
+        self.patcher = None
         self.relevator = None
 
     def set_updater(self, updater):
         self.updater = updater
 
+    def set_patcher(self, patcher):
+        """
+        Set function applying patches of list values.
+
+        The patcher is called as patcher(operation, args, change), where
+        operation is one of "insert", "remove", "replace", "reorder",
+        args are (first, last) rows of insertion or removal, sorted
+        indices of replaced rows or the new order.  The patcher has to
+        call change() which modifies the list.
+        """
+        self.patcher = patcher
+
+    def _patch(self, operation, args, change):
+        if self.patcher is None:
+            change()
+            if self.updater is not None:
+                try:
+                    self.updater(self.value)
+                except Exception:
+                    pass
+            return
+        self.patcher(operation, args, change)
+
+    def insert(self, index, rows):
+        """Insert rows into the list before index"""
+        rows = list(rows)
+        if not rows:
+            return
+        index = min(max(index, 0), len(self.value))
+
+        def change():
+            self.value[index:index] = rows
+
+        self._patch("insert", (index, index + len(rows) - 1), change)
+
+    def remove(self, indices):
+        """Remove rows with indices from the list"""
+        indices = sorted(set(indices), reverse=True)
+        removed = set(indices)
+        runs = []
+        while indices:
+            # contiguous run of indices
+            last = first = indices.pop(0)
+            while indices and indices[0] == first - 1:
+                first = indices.pop(0)
+            runs.append((first, last))
+        if len(runs) > self.MAX_REMOVE_RUNS:
+            self.update(
+                [r for i, r in enumerate(self.value) if i not in removed]
+            )
+            return
+        for first, last in runs:
+
+            def change(first=first, last=last):
+                del self.value[first : last + 1]
+
+            self._patch("remove", (first, last), change)
+
+    def replace(self, rows):
+        """Replace rows of the list, rows is a mapping index -> row"""
+        rows = dict(rows)
+        if not rows:
+            return
+
+        def change():
+            for i, row in rows.items():
+                self.value[i] = row
+
+        self._patch("replace", sorted(rows), change)
+
+    def reorder(self, order):
+        """Reorder the list, order[i] is the old index of the new i-th row"""
+        order = list(order)
+        if order == list(range(len(self.value))):
+            return
+        if sorted(order) != list(range(len(self.value))):
+            raise ValueError("order is not a permutation of the rows")
+
+        def change():
+            self.value[:] = [self.value[i] for i in order]
+
+        self._patch("reorder", order, change)
+
+    def sync(self, rows, key=None):
+        """
+        Patch the list to be equal to rows.
+
+        :param key: Function identifying the row, rows with the same key
+                    are moved and replaced rather than removed and
+                    inserted.  Keys have to be unique.  Without key
+                    only lists of equal length are patched, otherwise
+                    the whole list is updated.
+        """
+        rows = list(rows)
+        if key is None:
+            if len(rows) != len(self.value):
+                return self.update(rows)
+        else:
+            new_keys = [key(r) for r in rows]
+            wanted = set(new_keys)
+            self.remove(
+                i
+                for i, row in enumerate(self.value)
+                if key(row) not in wanted
+            )
+            have = {key(r): i for i, r in enumerate(self.value)}
+            self.insert(
+                len(self.value), (r for r in rows if key(r) not in have)
+            )
+            position = {key(r): i for i, r in enumerate(self.value)}
+            self.reorder(position[k] for k in new_keys)
+        self.replace(
+            (i, r) for i, (r, o) in enumerate(zip(rows, self.value)) if r != o
+        )
+
     def set_relevator(self, relevator):
         self.relevator = relevator
 
@@ -281,3 +400,119 @@ class Tabular:
     def on_del_pressed(self, cells):
         for cell in cells:
             self.set(*cell, None)
+
+    def set_visible(self, first, last):
+        """Rows from first to last are displayed, virtual tables may
+        keep cells of these rows only"""
+
+
+class ColumnTabular(Tabular):
+    """
+    Virtual table, the data are kept in columns and cells are made when
+    they are requested.  Made cells are kept only for visible rows.
+
+    :param colnames: Names of columns.
+    :param columns: Sequences (e.g. numpy arrays) of values or
+                    callables making cell of the row.
+    :param celltypes: Callables making cells of values of the sequence
+                      columns, None keeps the values as they are.
+    :param rows: Number of rows, length of the first sequence column
+                 by default.
+    """
+
+    # rows visible before a view reports its range
+    VISIBLE = 64
+
+    def __init__(self, colnames, columns, celltypes=None, rows=None):
+        super().__init__(colnames=list(colnames))
+        self._columns = list(columns)
+        if celltypes is None:
+            celltypes = [None] * len(self._columns)
+        self._celltypes = list(celltypes)
+        if len(self._columns) != len(self._colnames) or len(
+            self._celltypes
+        ) != len(self._columns):
+            raise RuntimeError("columns should be the same length")
+        if rows is None:
+            rows = next(
+                (len(c) for c in self._columns if not callable(c)), 0
+            )
+        self._rows = rows
+        self._visible = (0, self.VISIBLE)
+        self._cells = {}
+
+    @property
+    def rows(self):
+        return self._rows
+
+    def _make(self, row, col):
+        column = self._columns[col]
+        if callable(column):
+            cell = column(row)
+        else:
+            cell = column[row]
+            if self._celltypes[col] is not None:
+                cell = self._celltypes[col](cell)
+        try:
+            cell.row = row
+            cell.col = col
+        except AttributeError:
+            pass
+        return cell
+
+    def get(self, row, col):
+        if not (0 <= row < self._rows and 0 <= col < len(self._columns)):
+            return None
+        try:
+            return self._cells[row, col]
+        except KeyError:
+            pass
+        cell = self._make(row, col)
+        if self._visible[0] <= row < self._visible[1]:
+            self._cells[row, col] = cell
+        return cell
+
+    def set(self, row, col, data):
+        cell = self.get(row, col)
+        if isinstance(cell, TabCell):
+            cell.value = data
+            return
+        column = self._columns[col]
+        if not callable(column):
+            try:
+                column[row] = data
+            except (TypeError, ValueError):
+                return
+            self._cells.pop((row, col), None)
+
+    def set_visible(self, first, last):
+        self._visible = (first, last)
+        self._cells = {
+            k: v for k, v in self._cells.items() if first <= k[0] < last
+        }
+
+    def insert_row(self, index, row=None):
+        raise RuntimeError("rows of virtual table are fixed")
+
+    def remove_row(self, index):
+        raise RuntimeError("rows of virtual table are fixed")
+
+    def remove_rows(self, indices=None):
+        raise RuntimeError("rows of virtual table are fixed")
+
+    def insert_column(self, index, colname, coltype=None):
+        """Insert column of cells made by coltype()"""
+        self._colnames.insert(index, colname)
+        self._columns.insert(
+            index, lambda row: None if coltype is None else coltype()
+        )
+        self._celltypes.insert(index, None)
+        self._cells.clear()
+        self.refresh()
+
+    def remove_column(self, index):
+        self._colnames.pop(index)
+        self._columns.pop(index)
+        self._celltypes.pop(index)
+        self._cells.clear()
+        self.refresh()